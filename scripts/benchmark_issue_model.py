@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Compare the legacy per-issue dict model against the compact `Issue` model.
+
+Usage: python3 scripts/benchmark_issue_model.py [issue_count]
+"""
+from __future__ import annotations
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from gh_issue_workflow.stages import (
+    STAGE_BACKLOG,
+    STAGE_IN_PROGRESS,
+    STAGE_QUEUED,
+    STAGE_READY_TO_IMPLEMENT,
+    Issue,
+    pick_next_issue,
+)
+
+_STAGES = [STAGE_BACKLOG, STAGE_QUEUED, STAGE_READY_TO_IMPLEMENT, STAGE_IN_PROGRESS]
+
+
+def _api_rows(count: int) -> list[dict[str, Any]]:
+    rng = random.Random(26)
+    rows = []
+    for number in range(1, count + 1):
+        day = rng.randrange(1, 28)
+        rows.append(
+            {
+                "number": number,
+                "created_at": f"2026-02-{day:02d}T{number % 24:02d}:00:00Z",
+                "labels": [
+                    {"name": "bug"},
+                    {"name": f"area:{number % 17}"},
+                    {"name": rng.choice(_STAGES)},
+                ],
+            }
+        )
+    return rows
+
+
+def _legacy_build(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {
+            "number": row["number"],
+            "created_at": row["created_at"],
+            "labels": [lab.get("name") for lab in row["labels"]],
+        }
+        for row in rows
+    ]
+
+
+def _legacy_pick(issues: list[dict[str, Any]], authorized: set[int]) -> int | None:
+    buckets: dict[str, list[dict[str, Any]]] = {
+        STAGE_IN_PROGRESS: [],
+        STAGE_QUEUED: [],
+        STAGE_READY_TO_IMPLEMENT: [],
+    }
+    for issue in issues:
+        labels = set(issue.get("labels", []))
+        for stage, bucket in buckets.items():
+            if stage in labels and (
+                stage != STAGE_READY_TO_IMPLEMENT or int(issue["number"]) in authorized
+            ):
+                bucket.append(issue)
+                break
+    for bucket in buckets.values():
+        if bucket:
+            return int(
+                sorted(bucket, key=lambda i: str(i.get("created_at", "")))[0]["number"]
+            )
+    return None
+
+
+def _compact_build(rows: list[dict[str, Any]]) -> list[Issue]:
+    return [issue for issue in map(Issue.from_api, rows) if issue is not None]
+
+
+def _measure(build: Callable[[list[dict[str, Any]]], list[Any]], pick: Callable[[list[Any]], Any], rows: list[dict[str, Any]]) -> dict[str, float]:
+    started = time.perf_counter()
+    issues = build(rows)
+    built = time.perf_counter()
+
+    del issues
+    tracemalloc.start()
+    issues = build(rows)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pick_started = time.perf_counter()
+    for _ in range(5):
+        pick(issues)
+    picked = time.perf_counter()
+    return {
+        "build_seconds": round(built - started, 4),
+        "pick_seconds": round((picked - pick_started) / 5, 4),
+        "retained_bytes": retained,
+    }
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = _api_rows(count)
+
+    legacy = _measure(_legacy_build, lambda issues: _legacy_pick(issues, set()), rows)
+    compact = _measure(
+        _compact_build,
+        lambda issues: pick_next_issue(issues, authorized_ready_issue_numbers=set()),
+        rows,
+    )
+    print(
+        json.dumps(
+            {
+                "issues": count,
+                "legacy": legacy,
+                "compact": compact,
+                "memory_ratio": round(compact["retained_bytes"] / legacy["retained_bytes"], 3),
+                "pick_speedup": round(legacy["pick_seconds"] / max(compact["pick_seconds"], 1e-9), 2),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,987 @@
+#!/usr/bin/env python3
+"""Check every workflow engine against a straightforward reference tick.
+
+Seeded random repo states (stages, ready-label events, `@org/team` owners,
+closed security issues, code-scanning alerts) are ticked for a few rounds by
+a reference implementation and by each engine, each against its own copy of
+one in-process fake GitHub API. Per repo and round the picks, transitions and
+phase counts must match the reference, and so must the set of writes each
+engine sends. `global` only ranks picks, so it is checked against a reference
+ranking. A speed and call-count report is printed; the exit status is 1 on
+any mismatch.
+
+Usage: python3 scripts/differential_harness.py [--seed N] [--repos N]
+       [--issues N] [--alerts N] [--rounds N] [--latency-ms MS]
+
+Each request sleeps `--latency-ms` (default 2), so the speedups reflect call
+counts and concurrency rather than in-process overhead. Engines make more
+calls than the reference in places: they also read the issue events behind
+the time-in-stage metrics, which the reference does not keep.
+
+The reference is the code as it was before any optimization: it lists every
+page, sorts whole stage buckets, reads each ready issue's events, and dedupes
+alerts by `alert_url in body`. Known, intentional differences:
+
+- Alert dedupe now matches whole alert URLs, so an issue tracking
+  `.../code-scanning/23` no longer hides an untracked `.../code-scanning/2`.
+  The reference follows the new rule and counts each such alert under
+  `intentional_dedupe_differences`; the generator plants a few.
+- Issues never share a `created_at` within a repo. Ties are decided by
+  listing order, which is newest-first for full listings and oldest-first
+  for server-side queries.
+- `unresolved_owner_teams` is not compared: engines only resolve owners once
+  they reach a ready issue.
+- The change gate only sees issue `updated_at`, so every repo mutated between
+  rounds also gets an issue comment.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from urllib.parse import quote, unquote
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from gh_issue_workflow.aio import AsyncGhClient, AsyncWorkflow, run_ticks
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.gh_client import GhClient, api_args
+from gh_issue_workflow.plan import apply_plan, build_plan
+from gh_issue_workflow.stages import (
+    STAGE_BACKLOG,
+    STAGE_BLOCKED,
+    STAGE_IN_PROGRESS,
+    STAGE_IN_REVIEW,
+    STAGE_NEEDS_CLARIFICATION,
+    STAGE_QUEUED,
+    STAGE_READY_TO_IMPLEMENT,
+    pick_next_issue,
+)
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.workflow import (
+    SECURITY_LABEL,
+    alert_issue_payload,
+    desired_labels,
+    dismissal_payload,
+    extract_alert_number_from_body,
+    project_alert,
+    ready_label_actor,
+    Workflow,
+)
+
+ORG = "acme"
+BOT = "workflow-bot"
+ROUND_SECONDS = 600.0
+START = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+
+_ALL_STAGES = [
+    STAGE_BACKLOG,
+    STAGE_QUEUED,
+    STAGE_NEEDS_CLARIFICATION,
+    STAGE_READY_TO_IMPLEMENT,
+    STAGE_IN_PROGRESS,
+    STAGE_IN_REVIEW,
+    STAGE_BLOCKED,
+]
+# Stage precedence for issues with several stage labels, and pick priority.
+_PRECEDENCE = [
+    STAGE_IN_PROGRESS,
+    STAGE_QUEUED,
+    STAGE_READY_TO_IMPLEMENT,
+    STAGE_NEEDS_CLARIFICATION,
+    STAGE_IN_REVIEW,
+    STAGE_BLOCKED,
+    STAGE_BACKLOG,
+]
+_PRIORITY = [STAGE_IN_PROGRESS, STAGE_QUEUED, STAGE_READY_TO_IMPLEMENT]
+_TRANSITIONS = {
+    STAGE_QUEUED: (STAGE_NEEDS_CLARIFICATION, "moved-to-needs-clarification"),
+    STAGE_READY_TO_IMPLEMENT: (STAGE_IN_PROGRESS, "moved-to-in-progress"),
+    STAGE_IN_PROGRESS: (None, "continue-in-progress"),
+}
+_ACTORS = ["alice", "bob", "carol", "dana", "mallory", "trent"]
+_OWNER_CHOICES = [
+    ["alice"],
+    ["@acme/maintainers"],
+    ["alice", "@acme/hidden"],
+    ["trent", "@acme/core"],
+]
+_TEAMS = {
+    "acme/maintainers": ["bob", "carol"],
+    # More than one page of members.
+    "acme/core": [f"member{n}" for n in range(140)] + ["dana"],
+}
+_SEVERITIES = ["critical", "high", "medium", "low"]
+# Counts compared against the reference; skipped_existing is left out because
+# incremental alert sync only looks at changed alerts.
+_COUNTS = (
+    "cleaned_closed",
+    "security_created",
+    "security_closed_dismissed",
+    "security_closed_already_resolved",
+    "security_closed_missing_link",
+)
+_ALERT_URL_RE = re.compile(r"https?://\S+?/security/code-scanning/\d+")
+
+
+def iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def alert_url(repo: str, number: int) -> str:
+    return f"https://github.com/{repo}/security/code-scanning/{number}"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = START
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# --- fake GitHub ---------------------------------------------------------
+
+
+class ApiFailure(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class FakeRepo:
+    issues: dict[int, dict[str, Any]] = field(default_factory=dict)
+    events: dict[int, list[dict[str, Any]]] = field(default_factory=dict)
+    alerts: dict[int, dict[str, Any]] = field(default_factory=dict)
+    labels: dict[str, dict[str, str]] = field(default_factory=dict)
+    next_event: int = 1
+
+
+def _page(rows: list[Any], fields: dict[str, str]) -> list[Any]:
+    per_page = int(fields.get("per_page", 30))
+    page = int(fields.get("page", 1))
+    return rows[(page - 1) * per_page : page * per_page]
+
+
+class FakeGitHub:
+    """The REST endpoints the workflow uses, over in-memory repos.
+
+    Answers gh argument lists with `(returncode, stdout, stderr)` like the gh
+    CLI, including `--include` headers, ETags and 304s. Every request is
+    counted and every write is logged. `latency` seconds are slept per request,
+    outside the lock, so concurrent requests overlap like real API calls.
+    """
+
+    def __init__(
+        self,
+        repos: dict[str, FakeRepo],
+        teams: dict[str, list[str]],
+        clock: Clock,
+        latency: float = 0.0,
+    ) -> None:
+        self.repos = repos
+        self.teams = teams
+        self.clock = clock
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.not_modified = 0
+        self.writes: list[str] = []
+
+    def copy(self) -> FakeGitHub:
+        return FakeGitHub(copy.deepcopy(self.repos), self.teams, self.clock, self.latency)
+
+    def handle(self, args: list[str], stdin_json: dict[str, Any] | None) -> tuple[int, str, str]:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.respond(args, stdin_json)
+
+    def respond(self, args: list[str], stdin_json: dict[str, Any] | None) -> tuple[int, str, str]:
+        method, path = args[3], args[4]
+        fields = {
+            key: value
+            for flag, pair in zip(args[5:], args[6:])
+            if flag == "-f"
+            for key, _, value in [pair.partition("=")]
+        }
+        etag_header = next(
+            (arg[len("If-None-Match: ") :] for arg in args if arg.startswith("If-None-Match: ")),
+            None,
+        )
+        with self.lock:
+            self.calls += 1
+            if method != "GET":
+                body = stdin_json if stdin_json is not None else fields
+                self.writes.append(f"{method} {path} {json.dumps(body, sort_keys=True)}")
+            try:
+                payload = self._route(method, path, fields, stdin_json or {})
+            except ApiFailure as failure:
+                return 1, "", f"gh: {failure} (HTTP {failure.status})"
+            body = json.dumps(payload)
+            if "--include" not in args:
+                return 0, body, ""
+            etag = '"' + hashlib.sha1(body.encode()).hexdigest()[:16] + '"'
+            if etag_header == etag:
+                self.not_modified += 1
+                return 1, "HTTP/2.0 304 Not Modified\r\n\r\n", ""
+            return 0, f"HTTP/2.0 200 OK\r\nEtag: {etag}\r\n\r\n{body}", ""
+
+    def _route(
+        self, method: str, path: str, fields: dict[str, str], body: dict[str, Any]
+    ) -> Any:
+        parts = [unquote(part) for part in path.split("/")]
+        if parts[0] == "orgs" and parts[2:3] == ["teams"] and method == "GET":
+            members = self.teams.get(f"{parts[1]}/{parts[3]}")
+            if members is None:
+                raise ApiFailure(404, "Not Found")
+            return _page([{"login": login} for login in members], fields)
+        if parts[0] != "repos" or len(parts) < 4:
+            raise ApiFailure(404, "Not Found")
+        repo = self.repos.get(f"{parts[1]}/{parts[2]}")
+        if repo is None:
+            raise ApiFailure(404, "Not Found")
+        rest = parts[3:]
+        if rest[0] == "labels":
+            return self._labels(repo, method, rest[1:], fields)
+        if rest[0] == "issues":
+            return self._issues(repo, method, rest[1:], fields, body)
+        if rest[:2] == ["code-scanning", "alerts"]:
+            return self._alerts(repo, method, rest[2:], fields, body)
+        raise ApiFailure(404, "Not Found")
+
+    def _labels(
+        self, repo: FakeRepo, method: str, rest: list[str], fields: dict[str, str]
+    ) -> Any:
+        if not rest and method == "GET":
+            return _page([repo.labels[name] for name in sorted(repo.labels)], fields)
+        if not rest and method == "POST":
+            if fields["name"] in repo.labels:
+                raise ApiFailure(422, "Validation Failed")
+            repo.labels[fields["name"]] = dict(fields)
+            return repo.labels[fields["name"]]
+        label = repo.labels.get(rest[0]) if rest else None
+        if label is None:
+            raise ApiFailure(404, "Not Found")
+        if method == "PATCH":
+            label.update(fields)
+        return label
+
+    def _row(self, issue: dict[str, Any]) -> dict[str, Any]:
+        row = {key: value for key, value in issue.items() if key != "pull_request"}
+        row["labels"] = [{"name": name} for name in issue["labels"]]
+        if issue["pull_request"]:
+            row["pull_request"] = {"url": f"pulls/{issue['number']}"}
+        return row
+
+    def _label_event(self, repo: FakeRepo, number: int, event: str, label: str, actor: str) -> None:
+        repo.events.setdefault(number, []).append(
+            {
+                "id": repo.next_event,
+                "event": event,
+                "created_at": iso(self.clock()),
+                "label": {"name": label},
+                "actor": {"login": actor},
+            }
+        )
+        repo.next_event += 1
+
+    def set_labels(self, repo: FakeRepo, number: int, labels: list[str], actor: str) -> None:
+        issue = repo.issues[number]
+        for label in sorted(set(issue["labels"]) - set(labels)):
+            self._label_event(repo, number, "unlabeled", label, actor)
+        for label in sorted(set(labels) - set(issue["labels"])):
+            self._label_event(repo, number, "labeled", label, actor)
+        issue["labels"] = list(labels)
+        issue["updated_at"] = iso(self.clock())
+
+    def create_issue(
+        self, repo: FakeRepo, *, title: str, body: str, labels: list[str], actor: str
+    ) -> dict[str, Any]:
+        number = max([*repo.issues, 0]) + 1
+        repo.issues[number] = {
+            "number": number,
+            "title": title,
+            "body": body,
+            "state": "open",
+            "created_at": iso(self.clock() + number % 600),
+            "updated_at": iso(self.clock()),
+            "labels": [],
+            "pull_request": False,
+        }
+        self.set_labels(repo, number, labels, actor)
+        return repo.issues[number]
+
+    def _issues(
+        self,
+        repo: FakeRepo,
+        method: str,
+        rest: list[str],
+        fields: dict[str, str],
+        body: dict[str, Any],
+    ) -> Any:
+        if not rest and method == "GET":
+            state = fields.get("state", "open")
+            wanted = set(fields["labels"].split(",")) if fields.get("labels") else set()
+            rows = [
+                issue
+                for issue in repo.issues.values()
+                if (state == "all" or issue["state"] == state)
+                and wanted <= set(issue["labels"])
+            ]
+            sort = "updated_at" if fields.get("sort") == "updated" else "created_at"
+            rows.sort(
+                key=lambda issue: (issue[sort], issue["number"]),
+                reverse=fields.get("direction", "desc") == "desc",
+            )
+            return [self._row(issue) for issue in _page(rows, fields)]
+        if not rest and method == "POST":
+            return self._row(
+                self.create_issue(
+                    repo,
+                    title=str(body.get("title", "")),
+                    body=str(body.get("body", "")),
+                    labels=list(body.get("labels", [])),
+                    actor=BOT,
+                )
+            )
+        issue = repo.issues.get(int(rest[0])) if rest[0].isdigit() else None
+        if issue is None:
+            raise ApiFailure(404, "Not Found")
+        if rest[1:] == ["events"] and method == "GET":
+            return _page(repo.events.get(issue["number"], []), fields)
+        if rest[1:] == ["comments"] and method == "POST":
+            issue["updated_at"] = iso(self.clock())
+            return {"body": fields.get("body", "")}
+        if rest[1:] or method not in {"GET", "PATCH"}:
+            raise ApiFailure(404, "Not Found")
+        if method == "PATCH":
+            if "labels" in body:
+                self.set_labels(repo, issue["number"], list(body["labels"]), BOT)
+            if "state" in body:
+                issue["state"] = body["state"]
+        return self._row(issue)
+
+    def _alerts(
+        self,
+        repo: FakeRepo,
+        method: str,
+        rest: list[str],
+        fields: dict[str, str],
+        body: dict[str, Any],
+    ) -> Any:
+        if not rest and method == "GET":
+            rows = [
+                alert
+                for alert in repo.alerts.values()
+                if fields.get("state") in (None, alert["state"])
+            ]
+            sort = "updated_at" if fields.get("sort") == "updated" else "created_at"
+            rows.sort(
+                key=lambda alert: (alert[sort], alert["number"]),
+                reverse=fields.get("direction", "desc") == "desc",
+            )
+            return _page(rows, fields)
+        alert = repo.alerts.get(int(rest[0])) if rest and rest[0].isdigit() else None
+        if alert is None:
+            raise ApiFailure(404, "Not Found")
+        if method == "PATCH":
+            alert.update(body)
+            alert["updated_at"] = iso(self.clock())
+        return alert
+
+
+class HarnessGhClient(GhClient):
+    """The real sync client (memo, single-flight, invalidation) over a fake."""
+
+    # Streaming only changes memory use; the fake answers buffered.
+    api_iter = None
+
+    def __init__(self, fake: FakeGitHub) -> None:
+        super().__init__(max_retries=0)
+        self.fake = fake
+        self.sleep = lambda _: None
+
+    def _execute(
+        self, args: list[str], stdin_json: dict[str, Any] | None
+    ) -> subprocess.CompletedProcess[str]:
+        return subprocess.CompletedProcess(args, *self.fake.handle(args, stdin_json))
+
+
+class HarnessAsyncClient(AsyncGhClient):
+    def __init__(self, fake: FakeGitHub) -> None:
+        super().__init__(max_retries=0)
+        self.fake = fake
+
+    async def _execute(
+        self, args: list[str], stdin_json: dict[str, Any] | None
+    ) -> tuple[int, str, str]:
+        if self.fake.latency:
+            await asyncio.sleep(self.fake.latency)
+        return self.fake.respond(args, stdin_json)
+
+
+# --- generated states ----------------------------------------------------
+
+
+def generate(
+    rng: random.Random, *, repos: int, issues: int, alerts: int, clock: Clock
+) -> tuple[FakeGitHub, list[RepoConfig]]:
+    fake = FakeGitHub({}, _TEAMS, clock)
+    cfgs: list[RepoConfig] = []
+    spec = desired_labels()
+    for index in range(repos):
+        name = f"{ORG}/repo-{index}"
+        repo = FakeRepo()
+        fake.repos[name] = repo
+        cfgs.append(RepoConfig(name=name, owner_logins=list(rng.choice(_OWNER_CHOICES))))
+
+        # Labels: missing, partly present, or present with a stale color.
+        for label, (color, description) in spec.items():
+            roll = rng.random()
+            if roll < 0.3:
+                continue
+            stale = roll > 0.9
+            repo.labels[label] = {
+                "name": label,
+                "color": "000000" if stale else color.upper(),
+                "description": description,
+            }
+
+        # Alerts: mostly open; the body trap needs alert 2 open and 23 tracked.
+        for number in range(1, alerts + 1):
+            created = START - rng.randrange(50_000, 400_000)
+            repo.alerts[number] = {
+                "number": number,
+                "html_url": alert_url(name, number),
+                "state": rng.choices(["open", "fixed", "dismissed"], [6, 2, 1])[0],
+                "created_at": iso(created),
+                "updated_at": iso(created + rng.randrange(0, 40_000)),
+                "rule": {
+                    "id": f"rule-{number % 9}",
+                    "description": f"Rule {number % 9}",
+                    "security_severity_level": rng.choice(_SEVERITIES),
+                },
+                "most_recent_instance": {
+                    "location": {"path": f"src/m{number % 13}.py", "start_line": number}
+                },
+            }
+        trap = alerts >= 23 and rng.random() < 0.6
+        if trap:
+            repo.alerts[2]["state"] = "open"
+
+        clock_now = clock.now
+        for number, offset in enumerate(rng.sample(range(issues * 50), issues), start=1):
+            clock.now = START - 3600 - offset * 60
+            labels = []
+            stage_roll = rng.random()
+            if stage_roll < 0.8:
+                labels.append(rng.choice(_ALL_STAGES))
+            if stage_roll > 0.95:
+                labels.append(rng.choice(_ALL_STAGES))
+            if rng.random() < 0.2:
+                labels.append("bug")
+            body = ""
+            tracked = rng.random() < 0.3 and alerts
+            if tracked:
+                body = f"Tracks {alert_url(name, rng.randrange(1, alerts + 1))}"
+            if trap and number == 1:
+                body = f"Tracks {alert_url(name, 23)}"
+            if tracked or (trap and number == 1):
+                labels.append(SECURITY_LABEL)
+            elif rng.random() < 0.03:
+                labels.append(SECURITY_LABEL)
+            repo.issues[number] = {
+                "number": number,
+                "title": f"Issue {number}",
+                "body": body,
+                "state": "closed" if rng.random() < 0.25 else "open",
+                "created_at": iso(clock.now),
+                "updated_at": iso(clock.now + rng.randrange(0, 3600)),
+                "labels": [],
+                "pull_request": rng.random() < 0.05,
+            }
+            fake.set_labels(repo, number, labels, rng.choice(_ACTORS))
+            # Ready issues get relabeled by a few people; the last one counts.
+            if STAGE_READY_TO_IMPLEMENT in labels:
+                for _ in range(rng.randrange(0, 3)):
+                    without = [label for label in labels if label != STAGE_READY_TO_IMPLEMENT]
+                    fake.set_labels(repo, number, without, rng.choice(_ACTORS))
+                    fake.set_labels(repo, number, labels, rng.choice([*_ACTORS, "member7"]))
+        clock.now = clock_now
+    return fake, cfgs
+
+
+def mutate(fake: FakeGitHub, rng: random.Random) -> None:
+    """What people do between rounds; deterministic for equal states."""
+    for name in sorted(fake.repos):
+        repo = fake.repos[name]
+        if rng.random() < 0.4:
+            continue
+        open_numbers = sorted(n for n, i in repo.issues.items() if i["state"] == "open")
+        for number in rng.sample(open_numbers, min(3, len(open_numbers))):
+            issue = repo.issues[number]
+            labels = [label for label in issue["labels"] if not label.startswith("stage:")]
+            fake.set_labels(repo, number, [*labels, rng.choice(_ALL_STAGES)], rng.choice(_ACTORS))
+        if open_numbers and rng.random() < 0.5:
+            repo.issues[rng.choice(open_numbers)]["state"] = "closed"
+        if rng.random() < 0.5:
+            fake.create_issue(
+                repo,
+                title="New issue",
+                body="",
+                labels=[rng.choice(_ALL_STAGES)],
+                actor=rng.choice(_ACTORS),
+            )
+        if rng.random() < 0.5:
+            number = max([*repo.alerts, 0]) + 1
+            repo.alerts[number] = {
+                "number": number,
+                "html_url": alert_url(name, number),
+                "state": "open",
+                "created_at": iso(fake.clock()),
+                "updated_at": iso(fake.clock()),
+                "rule": {"id": "rule-new", "security_severity_level": rng.choice(_SEVERITIES)},
+            }
+        fixable = sorted(n for n, a in repo.alerts.items() if a["state"] == "open")
+        if fixable and rng.random() < 0.3:
+            alert = repo.alerts[rng.choice(fixable)]
+            alert["state"] = "fixed"
+            alert["updated_at"] = iso(fake.clock())
+        # A comment, so the change gate sees the repo change.
+        any_issue = rng.choice(sorted(repo.issues))
+        repo.issues[any_issue]["updated_at"] = iso(fake.clock())
+
+
+# --- reference -----------------------------------------------------------
+
+
+class ReferenceApi:
+    """Plain request/response access to the fake: no memo, no conditionals."""
+
+    def __init__(self, fake: FakeGitHub) -> None:
+        self.fake = fake
+
+    def call(
+        self,
+        method: str,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        body: dict[str, Any] | None = None,
+    ) -> Any:
+        code, stdout, stderr = self.fake.handle(
+            api_args("gh", method, path, fields), body
+        )
+        if code != 0:
+            raise ApiFailure(404 if "404" in stderr else 422, stderr)
+        return json.loads(stdout)
+
+    def all_pages(self, path: str, fields: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        page = 1
+        while True:
+            rows = self.call("GET", path, fields={**fields, "per_page": 100, "page": page})
+            yield from rows
+            if len(rows) < 100:
+                return
+            page += 1
+
+
+def _names(row: dict[str, Any]) -> list[str]:
+    return [label["name"] for label in row.get("labels", [])]
+
+
+def reference_stage(labels: list[str]) -> str | None:
+    return next((stage for stage in _PRECEDENCE if stage in labels), None)
+
+
+def reference_owners(api: ReferenceApi, owner_logins: list[str]) -> set[str]:
+    owners: set[str] = set()
+    for entry in owner_logins:
+        if not entry.startswith("@"):
+            owners.add(entry)
+            continue
+        org, _, slug = entry[1:].partition("/")
+        try:
+            owners.update(row["login"] for row in api.all_pages(f"orgs/{org}/teams/{slug}/members", {}))
+        except ApiFailure:
+            pass
+    return owners
+
+
+def reference_ready_authorized(api: ReferenceApi, repo: str, number: int, owners: set[str]) -> bool:
+    events = api.call("GET", f"repos/{repo}/issues/{number}/events", fields={"per_page": 100})
+    actor = None
+    for event in events:
+        if event.get("event") == "labeled" and event["label"]["name"] == STAGE_READY_TO_IMPLEMENT:
+            actor = event["actor"]["login"]
+    if actor != ready_label_actor(events):
+        raise AssertionError(f"ready_label_actor disagrees on {repo}#{number}")
+    return actor in owners
+
+
+def reference_candidates(
+    api: ReferenceApi, repo_cfg: RepoConfig
+) -> tuple[list[dict[str, Any]], dict[str, list[dict[str, Any]]]]:
+    """Open issues and the eligible ones per pickable stage, oldest first."""
+    rows = [
+        row
+        for row in api.all_pages(f"repos/{repo_cfg.name}/issues", {"state": "open"})
+        if not row.get("pull_request")
+    ]
+    buckets: dict[str, list[dict[str, Any]]] = {stage: [] for stage in _PRIORITY}
+    ready = [row for row in rows if reference_stage(_names(row)) == STAGE_READY_TO_IMPLEMENT]
+    owners = reference_owners(api, repo_cfg.owner_logins) if ready else set()
+    for row in rows:
+        stage = reference_stage(_names(row))
+        if stage not in buckets:
+            continue
+        if stage == STAGE_READY_TO_IMPLEMENT and not reference_ready_authorized(
+            api, repo_cfg.name, row["number"], owners
+        ):
+            continue
+        buckets[stage].append(row)
+    for bucket in buckets.values():
+        bucket.sort(key=lambda row: row["created_at"])
+    return rows, buckets
+
+
+def reference_tick(api: ReferenceApi, repo_cfg: RepoConfig) -> tuple[dict[str, Any], int]:
+    """One tick the straightforward way; returns the decision and dedupe differences."""
+    repo = repo_cfg.name
+    counts = dict.fromkeys(_COUNTS, 0)
+
+    current = {row["name"]: row for row in api.all_pages(f"repos/{repo}/labels", {})}
+    for name, (color, description) in sorted(desired_labels().items()):
+        existing = current.get(name)
+        if existing is None:
+            api.call(
+                "POST",
+                f"repos/{repo}/labels",
+                fields={"name": name, "color": color, "description": description},
+            )
+        elif (str(existing.get("color", "")).lower(), existing.get("description", "")) != (
+            color,
+            description,
+        ):
+            api.call(
+                "PATCH",
+                f"repos/{repo}/labels/{quote(name, safe='')}",
+                fields={"color": color, "description": description},
+            )
+
+    rows, buckets = reference_candidates(api, repo_cfg)
+    authorized = {row["number"] for row in buckets[STAGE_READY_TO_IMPLEMENT]}
+    picked = next(((stage, bucket[0]) for stage, bucket in buckets.items() if bucket), None)
+    expected = pick_next_issue(rows, authorized_ready_issue_numbers=authorized)
+    if (expected and (expected.picked_from_stage, expected.number)) != (
+        picked and (picked[0], picked[1]["number"])
+    ):
+        raise AssertionError(f"pick_next_issue disagrees with sorted buckets on {repo}")
+    action: dict[str, Any] = {"action": "no-work"}
+    if picked is not None:
+        stage, row = picked
+        new_stage, name = _TRANSITIONS[stage]
+        action = {"action": name, "issue": row["number"]}
+        if new_stage is not None:
+            kept = [label for label in _names(row) if not label.startswith("stage:")]
+            api.call(
+                "PATCH",
+                f"repos/{repo}/issues/{row['number']}",
+                body={"labels": sorted({*kept, new_stage})},
+            )
+
+    for row in list(api.all_pages(f"repos/{repo}/issues", {"state": "closed"})):
+        names = _names(row)
+        if row.get("pull_request") or not any(n.startswith("stage:") for n in names):
+            continue
+        api.call(
+            "PATCH",
+            f"repos/{repo}/issues/{row['number']}",
+            body={"labels": sorted(n for n in names if not n.startswith("stage:"))},
+        )
+        counts["cleaned_closed"] += 1
+
+    owner, repo_name = repo.split("/")
+    closed_security = api.all_pages(
+        f"repos/{repo}/issues", {"state": "closed", "labels": SECURITY_LABEL}
+    )
+    linked = []
+    for row in closed_security:
+        if row.get("pull_request"):
+            continue
+        body = row.get("body") or ""
+        number = extract_alert_number_from_body(body, owner=owner, repo_name=repo_name)
+        if not body.strip() or number is None:
+            counts["security_closed_missing_link"] += 1
+            continue
+        linked.append((row["number"], number))
+    for issue_number, number in linked:
+        try:
+            alert = api.call("GET", f"repos/{repo}/code-scanning/alerts/{number}")
+        except ApiFailure:
+            counts["security_closed_already_resolved"] += 1
+            continue
+        if alert.get("state") != "open":
+            counts["security_closed_already_resolved"] += 1
+            continue
+        api.call(
+            "PATCH",
+            f"repos/{repo}/code-scanning/alerts/{number}",
+            body=dismissal_payload(issue_number),
+        )
+        counts["security_closed_dismissed"] += 1
+
+    differences = 0
+    alerts = list(api.all_pages(f"repos/{repo}/code-scanning/alerts", {"state": "open"}))
+    if alerts:
+        bodies = [
+            row.get("body") or ""
+            for row in api.all_pages(f"repos/{repo}/issues", {"state": "all"})
+            if not row.get("pull_request")
+        ]
+        for alert in alerts:
+            url = alert["html_url"]
+            by_substring = any(url in body for body in bodies)
+            by_url = any(url in _ALERT_URL_RE.findall(body) for body in bodies)
+            if by_substring and not by_url:
+                differences += 1
+            if by_url:
+                continue
+            payload = alert_issue_payload(project_alert(alert))
+            api.call("POST", f"repos/{repo}/issues", body=payload)
+            bodies.append(payload["body"])
+            counts["security_created"] += 1
+
+    return {**action, **counts}, differences
+
+
+def reference_global(api: ReferenceApi, cfgs: list[RepoConfig], top: int) -> list[dict[str, Any]]:
+    ranked = []
+    for index, cfg in enumerate(cfgs):
+        _, buckets = reference_candidates(api, cfg)
+        for rank, stage in enumerate(_PRIORITY):
+            for row in buckets[stage]:
+                ranked.append((rank, row["created_at"], index, row["number"], stage))
+    ranked.sort()
+    return [
+        {"repo": cfgs[index].name, "pick": {"number": number, "picked_from_stage": stage}}
+        for _, _, index, number, stage in ranked[:top]
+    ]
+
+
+# --- engines -------------------------------------------------------------
+
+
+def decision(result: dict[str, Any]) -> dict[str, Any]:
+    """The part of a tick result the reference decides."""
+    if result.get("action") == "unchanged":
+        return {"action": result["last_action"], "issue": result.get("issue")}
+    picked = {key: result[key] for key in ("action", "issue") if key in result}
+    return {**picked, **{key: result[key] for key in _COUNTS}}
+
+
+def reference_decision(expected: dict[str, Any], result: dict[str, Any]) -> dict[str, Any]:
+    if result.get("action") == "unchanged":
+        return {"action": expected["action"], "issue": expected.get("issue")}
+    return expected
+
+
+TickEngine = Callable[[FakeGitHub, list[RepoConfig], Clock], Callable[[], list[dict[str, Any]]]]
+
+
+def sync_engine(**options: Any) -> TickEngine:
+    def start(fake: FakeGitHub, cfgs: list[RepoConfig], clock: Clock) -> Callable[[], list[dict[str, Any]]]:
+        workflow = Workflow(HarnessGhClient(fake), clock=clock, **options)
+        return lambda: [workflow.run_tick(cfg) for cfg in cfgs]
+
+    return start
+
+
+def plan_engine(fake: FakeGitHub, cfgs: list[RepoConfig], clock: Clock) -> Callable[[], list[dict[str, Any]]]:
+    client = HarnessGhClient(fake)
+    store = StateStore()
+
+    def tick() -> list[dict[str, Any]]:
+        plan = build_plan(client, store, cfgs)
+        applied = list(apply_plan(Workflow(client, state=store, clock=clock), plan, store=store))
+        failed = [entry for entry in applied if not entry["ok"] or entry["skipped"]]
+        if failed:
+            raise AssertionError(f"plan apply did not apply cleanly: {failed}")
+        return [entry["preview"] for entry in plan["repos"]]
+
+    return tick
+
+
+def async_engine(fake: FakeGitHub, cfgs: list[RepoConfig], clock: Clock) -> Callable[[], list[dict[str, Any]]]:
+    workflow = AsyncWorkflow(HarnessAsyncClient(fake), clock=clock)
+    return lambda: asyncio.run(run_ticks(workflow, cfgs, concurrency=8))
+
+
+ENGINES: dict[str, TickEngine] = {
+    "tick": sync_engine(),
+    "server-side": sync_engine(server_side_pick=True),
+    "change-gate": sync_engine(change_gate=True),
+    "plan": plan_engine,
+    "async": async_engine,
+}
+
+
+@dataclass
+class Usage:
+    seconds: float = 0.0
+    calls: int = 0
+    not_modified: int = 0
+
+    def add(self, fake: FakeGitHub, seconds: float, calls: int, not_modified: int) -> None:
+        self.seconds += seconds
+        self.calls += fake.calls - calls
+        self.not_modified += fake.not_modified - not_modified
+
+
+def _timed(fake: FakeGitHub, usage: Usage, run: Callable[[], Any]) -> Any:
+    calls, not_modified = fake.calls, fake.not_modified
+    started = time.perf_counter()
+    value = run()
+    usage.add(fake, time.perf_counter() - started, calls, not_modified)
+    return value
+
+
+def run_harness(
+    *,
+    seed: int,
+    repos: int,
+    issues: int,
+    alerts: int,
+    rounds: int,
+    latency_ms: float = 0.0,
+) -> dict[str, Any]:
+    """Run every engine for `rounds` rounds and return the report."""
+    clock = Clock()
+    base, cfgs = generate(
+        random.Random(seed), repos=repos, issues=issues, alerts=alerts, clock=clock
+    )
+    base.latency = latency_ms / 1000
+    reference = base.copy()
+    fakes = {name: base.copy() for name in ENGINES}
+    ticks = {name: start(fakes[name], cfgs, clock) for name, start in ENGINES.items()}
+    usage = {name: Usage() for name in ["reference", *ENGINES, "reference-global", "global"]}
+    mismatches: list[str] = []
+    differences = 0
+    top = 2 * repos
+
+    for round_index in range(rounds):
+        if round_index:
+            clock.now += ROUND_SECONDS
+            for fake in [reference, *fakes.values()]:
+                mutate(fake, random.Random(seed * 1000 + round_index))
+
+        snapshot = reference.copy()
+        expected_global = _timed(
+            snapshot, usage["reference-global"],
+            lambda: reference_global(ReferenceApi(snapshot), cfgs, top),
+        )
+        global_fake = reference.copy()
+        workflow = Workflow(HarnessGhClient(global_fake), clock=clock)
+        picks = _timed(global_fake, usage["global"], lambda: workflow.pick_next_global(cfgs, top=top))
+        if picks != expected_global:
+            mismatches.append(f"round {round_index} global: {picks} != {expected_global}")
+
+        writes_before = len(reference.writes)
+        expected = []
+        for cfg in cfgs:
+            outcome, found = _timed(
+                reference, usage["reference"], lambda: reference_tick(ReferenceApi(reference), cfg)
+            )
+            expected.append(outcome)
+            differences += found
+        expected_writes = Counter(reference.writes[writes_before:])
+
+        for name, tick in ticks.items():
+            fake = fakes[name]
+            before = len(fake.writes)
+            results = _timed(fake, usage[name], tick)
+            for cfg, want, result in zip(cfgs, expected, results):
+                if "phase_errors" in result:
+                    mismatches.append(f"round {round_index} {name} {cfg.name}: {result['phase_errors']}")
+                got, wanted = decision(result), reference_decision(want, result)
+                if got != wanted:
+                    mismatches.append(f"round {round_index} {name} {cfg.name}: {got} != {wanted}")
+            writes = Counter(fake.writes[before:])
+            if writes != expected_writes:
+                extra = sorted((writes - expected_writes).elements())[:3]
+                missing = sorted((expected_writes - writes).elements())[:3]
+                mismatches.append(
+                    f"round {round_index} {name} writes: extra {extra} missing {missing}"
+                )
+
+    base_usage = usage["reference"]
+    engines = {}
+    for name, spent in usage.items():
+        if name.startswith("reference"):
+            continue
+        baseline = usage["reference-global"] if name == "global" else base_usage
+        engines[name] = {
+            "seconds": round(spent.seconds, 3),
+            "calls": spent.calls,
+            "not_modified": spent.not_modified,
+            "speedup": round(baseline.seconds / max(spent.seconds, 1e-9), 2),
+            "call_reduction": round(1 - spent.calls / max(baseline.calls, 1), 3),
+        }
+    return {
+        "seed": seed,
+        "repos": repos,
+        "issues_per_repo": issues,
+        "alerts_per_repo": alerts,
+        "rounds": rounds,
+        "latency_ms": latency_ms,
+        "reference": {"seconds": round(base_usage.seconds, 3), "calls": base_usage.calls},
+        "reference_global": {
+            "seconds": round(usage["reference-global"].seconds, 3),
+            "calls": usage["reference-global"].calls,
+        },
+        "engines": engines,
+        "intentional_dedupe_differences": differences,
+        "mismatches": mismatches,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=48)
+    parser.add_argument("--repos", type=int, default=12)
+    parser.add_argument("--issues", type=int, default=400)
+    parser.add_argument("--alerts", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--latency-ms", type=float, default=2.0, help="simulated API latency per request"
+    )
+    args = parser.parse_args()
+    report = run_harness(
+        seed=args.seed,
+        repos=args.repos,
+        issues=args.issues,
+        alerts=args.alerts,
+        rounds=args.rounds,
+        latency_ms=args.latency_ms,
+    )
+    print(json.dumps(report, indent=2))
+    return 1 if report["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,630 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Collection, Iterable
+from urllib.parse import quote
+
+from gh_issue_workflow.board import cache_open_issues, record_authorized_ready
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.credentials import CredentialPool
+from gh_issue_workflow.gh_client import (
+    DEFAULT_TIMEOUT_SECONDS,
+    ConditionalResponse,
+    GhApiError,
+    GhTransientError,
+    RequestKey,
+    api_args,
+    backoff_delay,
+    is_transient_failure,
+    parse_include_output,
+    request_key,
+    request_target,
+    should_retry,
+)
+from gh_issue_workflow.metrics import FlowMetrics
+from gh_issue_workflow.resilience import CircuitBreaker
+from gh_issue_workflow.stages import Issue, PickedIssue, Stage, pick_next_issue
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.teams import (
+    TEAM_MEMBERS_NAMESPACE,
+    TEAM_MEMBERSHIP_TTL_SECONDS,
+    TEAM_PAGE_SIZE,
+    parse_team_ref,
+    team_logins,
+    team_members_path,
+    team_page_entry,
+    team_refresh_due,
+)
+from gh_issue_workflow.workflow import (
+    LABEL_CONVERGENCE_TTL_SECONDS,
+    LABELS_NAMESPACE,
+    MAX_LIST_PAGES,
+    PENDING_ALERT_ISSUES_NAMESPACE,
+    SECURITY_LABEL,
+    TICK_PHASES,
+    TRACKED_ALERT_URL_RE,
+    alert_issue_payload,
+    closed_issue_stage_labels,
+    collect_open_issues,
+    desired_labels,
+    diff_labels,
+    dismissal_payload,
+    existing_label_spec,
+    extract_alert_number_from_body,
+    finish_tick_result,
+    is_not_found,
+    is_validation_failure,
+    label_defaults,
+    label_fingerprint,
+    new_tick_result,
+    phase_error_message,
+    project_alert,
+    ready_label_actor,
+    record_phase_result,
+    status_labels,
+    tracked_alert_urls,
+    transition_for,
+    with_unresolved_teams,
+)
+
+DEFAULT_ASYNC_CONCURRENCY = 32
+
+
+class AsyncGhClient:
+    """asyncio counterpart of `GhClient`; every gh call is an asyncio subprocess.
+
+    Retries, per-attempt timeouts, dry-run and credential pooling behave as
+    in the sync client. Identical concurrent GETs share one subprocess.
+    """
+
+    def __init__(
+        self,
+        *,
+        dry_run: bool = False,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        timeout_seconds: float | None = DEFAULT_TIMEOUT_SECONDS,
+        credentials: CredentialPool | None = None,
+        gh_bin: str = "gh",
+    ) -> None:
+        self.dry_run = dry_run
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self.credentials = credentials
+        self.gh_bin = gh_bin
+        self.sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+        self._in_flight: dict[RequestKey, asyncio.Future[Any]] = {}
+
+    async def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        args = api_args(self.gh_bin, method, path, fields)
+        if method.upper() != "GET":
+            return await self._run_json(args)
+
+        key = request_key(path, fields)
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            return await asyncio.shield(flight)
+        flight = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._run_json(args)
+        except BaseException as error:
+            flight.set_exception(error)
+            flight.exception()  # followers re-raise it; don't log it as unretrieved
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    async def api_conditional(
+        self,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        etag: str | None = None,
+    ) -> ConditionalResponse:
+        """GET with `If-None-Match`, as `GhClient.api_conditional`."""
+        args = [*api_args(self.gh_bin, "GET", path, fields), "--include"]
+        if etag:
+            args.extend(["-H", f"If-None-Match: {etag}"])
+        for attempt in range(self.max_retries + 1):
+            code, stdout, stderr = await self._execute(args, None)
+            status, headers, body = parse_include_output(stdout)
+            if status == 304:
+                return ConditionalResponse(status=304, etag=etag, payload=None)
+            if code == 0:
+                body = body.strip()
+                return ConditionalResponse(
+                    status=status,
+                    etag=headers.get("etag"),
+                    payload=json.loads(body) if body else {},
+                )
+            if should_retry("GET", stderr) and attempt < self.max_retries:
+                await self.sleep(backoff_delay(self.backoff_seconds, attempt))
+                continue
+            raise GhApiError(stderr.strip() or f"command failed: {' '.join(args)}")
+        raise GhApiError("unreachable")
+
+    async def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
+        return await self._run_json(
+            [self.gh_bin, "api", "--method", "PATCH", path], stdin_json=body
+        )
+
+    async def api_post_json(self, path: str, body: dict[str, Any]) -> Any:
+        return await self._run_json(
+            [self.gh_bin, "api", "--method", "POST", path], stdin_json=body
+        )
+
+    async def _execute(
+        self, args: list[str], stdin_json: dict[str, Any] | None
+    ) -> tuple[int, str, str]:
+        env = None
+        credential = None
+        run_args = args
+        if self.credentials is not None:
+            credential = self.credentials.select(request_target(args))
+            env = {**os.environ, "GH_TOKEN": credential.token}
+            if "--include" not in args:
+                run_args = [*args, "--include"]
+
+        proc = await asyncio.create_subprocess_exec(
+            *run_args,
+            stdin=asyncio.subprocess.PIPE if stdin_json else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+        )
+        payload = json.dumps(stdin_json).encode() if stdin_json else None
+        try:
+            out, err = await asyncio.wait_for(
+                proc.communicate(payload), timeout=self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return -9, "", f"gh api timed out after {self.timeout_seconds}s"
+
+        stdout, stderr = out.decode(), err.decode()
+        if credential is not None and self.credentials is not None:
+            _, headers, body = parse_include_output(stdout)
+            self.credentials.record(credential.name, headers)
+            if run_args is not args:
+                stdout = body
+        return proc.returncode if proc.returncode is not None else -1, stdout, stderr
+
+    async def _run_json(
+        self, args: list[str], *, stdin_json: dict[str, Any] | None = None
+    ) -> Any:
+        if self.dry_run and any(flag in args for flag in ["POST", "PATCH", "PUT", "DELETE"]):
+            return {"dry_run": True, "args": args, "body": stdin_json}
+
+        method = args[3] if len(args) > 3 else "GET"
+        for attempt in range(self.max_retries + 1):
+            code, stdout, stderr = await self._execute(args, stdin_json)
+            if code == 0:
+                out = stdout.strip()
+                return json.loads(out) if out else {}
+            if should_retry(method, stderr) and attempt < self.max_retries:
+                await self.sleep(backoff_delay(self.backoff_seconds, attempt))
+                continue
+            message = stderr.strip() or stdout.strip() or f"command failed: {' '.join(args)}"
+            if is_transient_failure(stderr):
+                raise GhTransientError(message)
+            raise GhApiError(message)
+        raise GhApiError("unreachable")
+
+
+class AsyncWorkflow:
+    """asyncio counterpart of `Workflow` for embedding in an event loop.
+
+    Every decision (label diffs, picking, transitions, alert issues) comes
+    from the same pure helpers as the sync workflow; only the I/O differs.
+    Picking always lists open issues, authorization checks run concurrently,
+    and the alert sync lists all open alerts (no incremental cursor).
+    """
+
+    def __init__(
+        self,
+        client: AsyncGhClient,
+        *,
+        state: StateStore | None = None,
+        breaker: CircuitBreaker | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.client = client
+        self.state = state if state is not None else StateStore()
+        self.clock = clock
+        self.label_ttl_seconds = LABEL_CONVERGENCE_TTL_SECONDS
+        self.team_ttl_seconds = TEAM_MEMBERSHIP_TTL_SECONDS
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.metrics = FlowMetrics(self.state, clock=clock)
+
+    async def _list(
+        self, path: str, fields: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Dict rows of a GET list endpoint, following full pages like the sync engine."""
+        per_page = int((fields or {}).get("per_page", 30))
+        rows: list[dict[str, Any]] = []
+        for page in range(1, MAX_LIST_PAGES + 1):
+            page_fields = fields if page == 1 else {**(fields or {}), "page": page}
+            payload = await self.client.api("GET", path, fields=page_fields)
+            if not isinstance(payload, list):
+                break
+            rows.extend(row for row in payload if isinstance(row, dict))
+            if len(payload) < per_page:
+                break
+        return rows
+
+    async def _create_label(self, repo: str, name: str, color: str, description: str) -> None:
+        """Same 422 `already_exists` handling as `Workflow._create_label`."""
+        try:
+            await self.client.api(
+                "POST",
+                f"repos/{repo}/labels",
+                fields={"name": name, "color": color, "description": description},
+            )
+        except GhApiError as error:
+            if not is_validation_failure(error):
+                raise
+            try:
+                await self.client.api("GET", f"repos/{repo}/labels/{quote(name, safe='')}")
+            except GhApiError as lookup_error:
+                if is_not_found(lookup_error):
+                    raise error from None
+                raise
+
+    async def _update_label(self, repo: str, name: str, color: str, description: str) -> None:
+        await self.client.api(
+            "PATCH",
+            f"repos/{repo}/labels/{quote(name, safe='')}",
+            fields={"color": color, "description": description},
+        )
+
+    def _labels_converged(self, repo: str, fingerprint: str) -> bool:
+        converged = self.state.get(LABELS_NAMESPACE, repo)
+        return (
+            isinstance(converged, dict)
+            and converged.get("fingerprint") == fingerprint
+            and self.clock() - float(converged.get("converged_at", 0))
+            < self.label_ttl_seconds
+        )
+
+    async def reconcile_labels(self, repo: str, *, force: bool = False) -> dict[str, int]:
+        spec = desired_labels()
+        fingerprint = label_fingerprint(spec)
+        if not force and self._labels_converged(repo, fingerprint):
+            return {"created": 0, "updated": 0, "skipped": 1}
+
+        current = existing_label_spec(
+            await self._list(f"repos/{repo}/labels", {"per_page": 100})
+        )
+        create, update = diff_labels(spec, current)
+        await asyncio.gather(
+            *(self._create_label(repo, *label) for label in create),
+            *(self._update_label(repo, *label) for label in update),
+        )
+        self.state.put(
+            LABELS_NAMESPACE,
+            repo,
+            {"fingerprint": fingerprint, "converged_at": self.clock()},
+        )
+        return {"created": len(create), "updated": len(update), "skipped": 0}
+
+    async def list_open_issues(self, repo: str) -> list[Issue]:
+        issues, pages = collect_open_issues(
+            await self._list(f"repos/{repo}/issues", {"state": "open", "per_page": 100})
+        )
+        cache_open_issues(self.state, repo, pages, now=self.clock())
+        return issues
+
+    async def _team_members(self, org: str, slug: str) -> frozenset[str]:
+        """Same membership cache as `teams.team_members`, fetched asynchronously."""
+        key = f"{org}/{slug}"
+        now = self.clock()
+        cached = self.state.get(TEAM_MEMBERS_NAMESPACE, key)
+        if team_refresh_due(cached, now=now, ttl_seconds=self.team_ttl_seconds):
+            cached_pages: list[dict[str, Any]] = (cached or {}).get("pages", [])
+            pages: list[dict[str, Any]] = []
+            for page in range(1, MAX_LIST_PAGES + 1):
+                previous = cached_pages[page - 1] if page <= len(cached_pages) else None
+                response = await self.client.api_conditional(
+                    team_members_path(org, slug),
+                    fields={"per_page": TEAM_PAGE_SIZE, "page": page},
+                    etag=previous.get("etag") if previous else None,
+                )
+                entry = team_page_entry(previous, response)
+                pages.append(entry)
+                if int(entry.get("count", 0)) < TEAM_PAGE_SIZE:
+                    break
+            cached = {"fetched_at": now, "pages": pages}
+            self.state.put(TEAM_MEMBERS_NAMESPACE, key, cached)
+        return team_logins(cached)
+
+    async def authorized_logins(
+        self, repo_cfg: RepoConfig, *, unresolved: dict[str, str] | None = None
+    ) -> frozenset[str]:
+        """Owner logins with `@org/team` entries expanded, as in `Workflow`."""
+        logins: set[str] = set()
+        for entry in repo_cfg.owner_logins:
+            team = parse_team_ref(entry)
+            if team is None:
+                logins.add(entry)
+                continue
+            try:
+                logins |= await self._team_members(*team)
+            except GhApiError as error:
+                if unresolved is not None:
+                    unresolved[entry] = str(error)
+        return frozenset(logins)
+
+    async def _observe_events(self, repo: str, issue_number: int) -> Any:
+        events = await self.client.api(
+            "GET", f"repos/{repo}/issues/{issue_number}/events", fields={"per_page": 100}
+        )
+        self.metrics.observe(repo, issue_number, events)
+        return events
+
+    async def is_ready_authorized(
+        self, repo: str, issue_number: int, owner_logins: Collection[str]
+    ) -> bool:
+        actor = ready_label_actor(await self._observe_events(repo, issue_number))
+        return actor is not None and actor in owner_logins
+
+    async def _pick_issue(
+        self, repo_cfg: RepoConfig, *, unresolved: dict[str, str] | None = None
+    ) -> tuple[PickedIssue, Issue] | None:
+        repo = repo_cfg.name
+        issues = await self.list_open_issues(repo)
+        self.metrics.retain(repo, (i.number for i in issues))
+        ready = [i.number for i in issues if i.stage is Stage.READY_TO_IMPLEMENT]
+        changed = self.metrics.stage_changed(
+            repo, (i for i in issues if i.stage is not Stage.READY_TO_IMPLEMENT)
+        )
+        await asyncio.gather(*(self._observe_events(repo, n) for n in changed))
+        owners = (
+            await self.authorized_logins(repo_cfg, unresolved=unresolved)
+            if ready
+            else frozenset()
+        )
+        verdicts = await asyncio.gather(
+            *(self.is_ready_authorized(repo, n, owners) for n in ready)
+        )
+        authorized_ready = {n for n, ok in zip(ready, verdicts) if ok}
+        record_authorized_ready(self.state, repo, authorized_ready)
+        pick = pick_next_issue(issues, authorized_ready_issue_numbers=authorized_ready)
+        if pick is None:
+            return None
+        return pick, next(i for i in issues if i.number == pick.number)
+
+    async def pick_next(self, repo_cfg: RepoConfig) -> dict[str, Any] | None:
+        picked = await self._pick_issue(repo_cfg)
+        if picked is None:
+            return None
+        return asdict(picked[0])
+
+    async def set_status(
+        self,
+        repo: str,
+        issue_number: int,
+        new_status: str | None,
+        *,
+        current_labels: Iterable[str] | None = None,
+    ) -> None:
+        if current_labels is None:
+            issue = await self.client.api("GET", f"repos/{repo}/issues/{issue_number}")
+            existing = [label["name"] for label in issue.get("labels", [])]
+        else:
+            existing = list(current_labels)
+        await self.client.api_patch_json(
+            f"repos/{repo}/issues/{issue_number}",
+            {"labels": status_labels(existing, new_status)},
+        )
+
+    async def post_comment(self, repo: str, issue_number: int, body: str) -> None:
+        await self.client.api(
+            "POST", f"repos/{repo}/issues/{issue_number}/comments", fields={"body": body}
+        )
+
+    async def cleanup_closed_issue_stage_labels(self, repo: str) -> int:
+        rows = await self._list(f"repos/{repo}/issues", {"state": "closed", "per_page": 100})
+        cleaned = 0
+        for row in rows:
+            labels = closed_issue_stage_labels(row)
+            if labels is None:
+                continue
+            await self.set_status(repo, int(row["number"]), None, current_labels=labels)
+            cleaned += 1
+        return cleaned
+
+    async def _transition(self, repo_cfg: RepoConfig) -> dict[str, Any]:
+        unresolved: dict[str, str] = {}
+        picked = await self._pick_issue(repo_cfg, unresolved=unresolved)
+        if picked is None:
+            return with_unresolved_teams({"action": "no-work"}, unresolved)
+        pick, issue = picked
+        new_status, action = transition_for(pick)
+        if new_status is not None:
+            await self.set_status(
+                repo_cfg.name, pick.number, new_status, current_labels=issue.labels
+            )
+        return with_unresolved_teams(action, unresolved)
+
+    async def sync_closed_security_issues(self, repo: str) -> dict[str, int]:
+        owner, repo_name = repo.split("/", 1)
+        rows = await self._list(
+            f"repos/{repo}/issues",
+            {"state": "closed", "labels": SECURITY_LABEL, "per_page": 100},
+        )
+        counts = {"dismissed": 0, "already_resolved": 0, "missing_link": 0}
+        for row in rows:
+            if row.get("pull_request"):
+                continue
+            body = row.get("body")
+            alert_number = (
+                extract_alert_number_from_body(body, owner=owner, repo_name=repo_name)
+                if isinstance(body, str) and body.strip()
+                else None
+            )
+            if alert_number is None:
+                counts["missing_link"] += 1
+                continue
+
+            alert_path = f"repos/{repo}/code-scanning/alerts/{alert_number}"
+            try:
+                alert = await self.client.api("GET", alert_path)
+            except GhApiError as error:
+                if is_not_found(error):
+                    counts["already_resolved"] += 1
+                    continue
+                raise
+            if str(alert.get("state") or "").strip().lower() != "open":
+                counts["already_resolved"] += 1
+                continue
+            await self.client.api_patch_json(
+                alert_path, dismissal_payload(int(row.get("number", 0)))
+            )
+            counts["dismissed"] += 1
+        return counts
+
+    async def _recent_alert_issue_exists(self, repo: str, alert_url: str) -> bool:
+        recent = await self.client.api(
+            "GET",
+            f"repos/{repo}/issues",
+            fields={"state": "all", "sort": "created", "direction": "desc", "per_page": 30},
+        )
+        return any(
+            isinstance(row, dict)
+            and alert_url in TRACKED_ALERT_URL_RE.findall(str(row.get("body") or ""))
+            for row in (recent if isinstance(recent, list) else [])
+        )
+
+    async def create_alert_issue(
+        self, repo: str, payload: dict[str, Any], alert_url: str
+    ) -> None:
+        """Same duplicate guard as `Workflow.create_alert_issue`."""
+        try:
+            await self.client.api_post_json(f"repos/{repo}/issues", payload)
+        except GhTransientError:
+            if alert_url and await self._recent_alert_issue_exists(repo, alert_url):
+                return
+            if alert_url:
+                pending = self.state.get(PENDING_ALERT_ISSUES_NAMESPACE, repo) or []
+                self.state.put(
+                    PENDING_ALERT_ISSUES_NAMESPACE, repo, sorted({*pending, alert_url})
+                )
+            raise
+
+    async def sync_code_scanning_alerts(self, repo: str) -> dict[str, int]:
+        alerts = [
+            project_alert(row)
+            for row in await self._list(
+                f"repos/{repo}/code-scanning/alerts", {"state": "open", "per_page": 100}
+            )
+        ]
+        created = 0
+        skipped_existing = 0
+        if not alerts:
+            return {"created": created, "skipped_existing": skipped_existing}
+
+        tracked_rows, label_rows = await asyncio.gather(
+            self._list(f"repos/{repo}/issues", {"state": "all", "per_page": 100}),
+            self._list(f"repos/{repo}/labels", {"per_page": 100}),
+        )
+        tracked = tracked_alert_urls(tracked_rows)
+        pending = set(self.state.get(PENDING_ALERT_ISSUES_NAMESPACE, repo) or [])
+        existing_labels = set(existing_label_spec(label_rows))
+
+        for alert in alerts:
+            alert_url = str(alert.get("html_url") or "").strip()
+            if alert_url and (
+                alert_url in tracked
+                or (
+                    alert_url in pending
+                    and await self._recent_alert_issue_exists(repo, alert_url)
+                )
+            ):
+                skipped_existing += 1
+                continue
+            payload = alert_issue_payload(alert)
+            for label in payload["labels"]:
+                if label not in existing_labels:
+                    await self._create_label(repo, label, *label_defaults(label))
+                    existing_labels.add(label)
+            await self.create_alert_issue(repo, payload, alert_url)
+            if alert_url:
+                tracked.add(alert_url)
+            created += 1
+        if pending:
+            self.state.delete(PENDING_ALERT_ISSUES_NAMESPACE, repo)
+        return {"created": created, "skipped_existing": skipped_existing}
+
+    async def run_tick(
+        self, repo_cfg: RepoConfig, *, deadline: float | None = None
+    ) -> dict[str, Any]:
+        """Async `Workflow.run_tick`: same phases, order and result shape."""
+        repo = repo_cfg.name
+        result = new_tick_result(repo)
+        skipped: dict[str, str] = {}
+        errors: dict[str, str] = {}
+        action: dict[str, Any] = {"action": "skipped"}
+
+        runners: dict[str, Callable[[], Awaitable[Any]]] = {
+            "labels": lambda: self.reconcile_labels(repo),
+            "pick": lambda: self._transition(repo_cfg),
+            "cleanup_closed": lambda: self.cleanup_closed_issue_stage_labels(repo),
+            "security_closed": lambda: self.sync_closed_security_issues(repo),
+            "security_alerts": lambda: self.sync_code_scanning_alerts(repo),
+        }
+        for phase in TICK_PHASES:
+            key = f"{repo}:{phase}"
+            if not self.breaker.allow(key):
+                skipped[phase] = "circuit-open"
+                continue
+            if deadline is not None and self.clock() >= deadline:
+                skipped[phase] = "deadline"
+                continue
+            try:
+                value = await runners[phase]()
+            except Exception as error:
+                self.breaker.record_failure(key)
+                errors[phase] = phase_error_message(error)
+                continue
+            self.breaker.record_success(key)
+            if phase == "pick":
+                action = value
+            else:
+                record_phase_result(result, phase, value)
+
+        self.metrics.flush(repo)
+        return finish_tick_result(
+            result,
+            action,
+            skipped=skipped,
+            errors=errors,
+            flow=self.metrics.snapshot(repo),
+        )
+
+
+async def run_ticks(
+    workflow: AsyncWorkflow,
+    repos: Iterable[RepoConfig],
+    *,
+    concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+    deadline: float | None = None,
+) -> list[dict[str, Any]]:
+    """Tick many repos on one event loop, at most `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def tick(repo: RepoConfig) -> dict[str, Any]:
+        async with semaphore:
+            return await workflow.run_tick(repo, deadline=deadline)
+
+    return list(await asyncio.gather(*(tick(repo) for repo in repos)))
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from gh_issue_workflow.gh_client import GhClient
+from gh_issue_workflow.stages import (
+    KNOWN_STAGE_LABELS,
+    Issue,
+    Stage,
+    pick_next_issue,
+    stage_from_labels,
+)
+from gh_issue_workflow.state import StateStore, per_key_namespace
+
+OPEN_ISSUES_NAMESPACE = per_key_namespace("open_issues")
+_PAGE_SIZE = 100
+
+# Report columns in workflow order rather than set order.
+BOARD_STAGES: tuple[str, ...] = tuple(
+    stage.value for stage in Stage if stage.value in KNOWN_STAGE_LABELS
+)
+
+
+def _encode(issue: Issue) -> list[Any]:
+    # Only the stage label is kept: the board and picking never need the rest.
+    return [issue.number, issue.created_ts, issue.stage.value if issue.stage else None]
+
+
+def _decode(row: list[Any]) -> Issue:
+    number, created_ts, stage = row
+    labels = (stage,) if stage else ()
+    return Issue(
+        number=int(number),
+        created_ts=int(created_ts),
+        labels=labels,
+        stage=stage_from_labels(labels),
+    )
+
+
+def cache_open_issues(
+    store: StateStore,
+    repo: str,
+    pages: list[tuple[int, list[Issue]]],
+    *,
+    now: float,
+) -> None:
+    """Store a full open-issue listing as `(raw_row_count, issues)` pages.
+
+    A page whose issues are unchanged keeps its previous ETag so a later
+    `--refresh` can still revalidate it with a 304.
+    """
+    previous = store.get(OPEN_ISSUES_NAMESPACE, repo) or {}
+    previous_pages: list[dict[str, Any]] = previous.get("pages", [])
+    entries: list[dict[str, Any]] = []
+    for index, (count, issues) in enumerate(pages):
+        encoded = [_encode(issue) for issue in issues]
+        old = previous_pages[index] if index < len(previous_pages) else None
+        etag = old.get("etag") if old is not None and old.get("issues") == encoded else None
+        entries.append({"etag": etag, "count": count, "issues": encoded})
+
+    ready = {
+        issue.number
+        for _, issues in pages
+        for issue in issues
+        if issue.stage is Stage.READY_TO_IMPLEMENT
+    }
+    store.put(
+        OPEN_ISSUES_NAMESPACE,
+        repo,
+        {
+            "fetched_at": now,
+            "pages": entries,
+            "authorized_ready": sorted(
+                ready.intersection(previous.get("authorized_ready", []))
+            ),
+        },
+    )
+
+
+def record_authorized_ready(store: StateStore, repo: str, numbers: Iterable[int]) -> None:
+    """Remember which ready issues passed the owner check at the last pick."""
+    cached = store.get(OPEN_ISSUES_NAMESPACE, repo)
+    if cached is None:
+        return
+    authorized = sorted(numbers)
+    if cached.get("authorized_ready") != authorized:
+        store.put(OPEN_ISSUES_NAMESPACE, repo, {**cached, "authorized_ready": authorized})
+
+
+def refresh_open_issues(
+    client: GhClient, store: StateStore, repo: str, *, now: float
+) -> dict[str, Any]:
+    """Revalidate every cached page of the open-issue listing with its ETag.
+
+    Unchanged pages come back as 304 and reuse the cached rows; ready-stage
+    authorization is carried over from the last tick, never re-checked.
+    """
+    cached = store.get(OPEN_ISSUES_NAMESPACE, repo) or {}
+    cached_pages: list[dict[str, Any]] = cached.get("pages", [])
+    owner, repo_name = repo.split("/", 1)
+
+    pages: list[dict[str, Any]] = []
+    page = 1
+    while True:
+        previous = cached_pages[page - 1] if page <= len(cached_pages) else None
+        response = client.api_conditional(
+            f"repos/{owner}/{repo_name}/issues",
+            fields={"state": "open", "per_page": _PAGE_SIZE, "page": page},
+            etag=previous.get("etag") if previous else None,
+        )
+        if response.not_modified and previous is not None:
+            entry = previous
+        else:
+            rows = response.payload if isinstance(response.payload, list) else []
+            entry = {
+                "etag": response.etag,
+                "count": len(rows),
+                "issues": [
+                    _encode(issue)
+                    for issue in (Issue.from_api(r) for r in rows if isinstance(r, dict))
+                    if issue is not None
+                ],
+            }
+        pages.append(entry)
+        if int(entry.get("count", 0)) < _PAGE_SIZE:
+            break
+        page += 1
+
+    ready = {
+        row[0]
+        for entry in pages
+        for row in entry["issues"]
+        if row[2] == Stage.READY_TO_IMPLEMENT.value
+    }
+    refreshed = {
+        "fetched_at": now,
+        "pages": pages,
+        "authorized_ready": sorted(ready.intersection(cached.get("authorized_ready", []))),
+    }
+    store.put(OPEN_ISSUES_NAMESPACE, repo, refreshed)
+    return refreshed
+
+
+def cached_open_issues(store: StateStore, repo: str) -> list[Issue] | None:
+    cached = store.get(OPEN_ISSUES_NAMESPACE, repo)
+    if cached is None:
+        return None
+    return [_decode(row) for page in cached["pages"] for row in page["issues"]]
+
+
+def _iso(ts: int | float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def repo_board(store: StateStore, repo: str) -> dict[str, Any] | None:
+    """Stage counts, oldest issue per stage and the next pick for one repo."""
+    cached = store.get(OPEN_ISSUES_NAMESPACE, repo)
+    if cached is None:
+        return None
+    issues = cached_open_issues(store, repo) or []
+
+    counts = dict.fromkeys(BOARD_STAGES, 0)
+    oldest: dict[str, Issue] = {}
+    for issue in issues:
+        if issue.stage is None:
+            continue
+        label = issue.stage.value
+        counts[label] += 1
+        current = oldest.get(label)
+        if current is None or issue.created_ts < current.created_ts:
+            oldest[label] = issue
+
+    pick = pick_next_issue(
+        issues, authorized_ready_issue_numbers=set(cached.get("authorized_ready", []))
+    )
+    return {
+        "repo": repo,
+        "fetched_at": _iso(float(cached["fetched_at"])),
+        "counts": counts,
+        "oldest": {
+            label: {"number": issue.number, "created_at": _iso(issue.created_ts)}
+            for label, issue in sorted(
+                oldest.items(), key=lambda item: BOARD_STAGES.index(item[0])
+            )
+        },
+        "next_pick": asdict(pick) if pick is not None else None,
+    }
+
+
+def build_board(store: StateStore, repos: Iterable[str]) -> dict[str, Any]:
+    """Per-repo boards plus aggregate stage counts, read from the local cache only."""
+    boards: list[dict[str, Any]] = []
+    missing: list[str] = []
+    totals = dict.fromkeys(BOARD_STAGES, 0)
+    for repo in repos:
+        board = repo_board(store, repo)
+        if board is None:
+            missing.append(repo)
+            continue
+        boards.append(board)
+        for label, count in board["counts"].items():
+            totals[label] += count
+    return {"repos": boards, "totals": totals, "missing": missing}
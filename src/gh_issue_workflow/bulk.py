@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+from gh_issue_workflow.stages import KNOWN_STAGE_LABELS
+from gh_issue_workflow.workflow import Workflow
+
+# GitHub's secondary limit for content-creating requests is 80/min; stay below.
+DEFAULT_WRITES_PER_MINUTE = 60.0
+DEFAULT_CONCURRENCY = 4
+
+
+@dataclass(frozen=True)
+class BulkOperation:
+    line: int
+    repo: str
+    issue: int
+    value: str
+
+
+class WriteThrottle:
+    """Thread-safe pacing: hands out write slots at most `per_minute` per minute."""
+
+    def __init__(
+        self,
+        per_minute: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = self.clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            self.sleep(slot - now)
+
+
+def _invalid(kind: str, line: int, reason: str) -> dict[str, Any]:
+    return {"event": kind, "line": line, "ok": False, "error": f"invalid operation: {reason}"}
+
+
+def parse_operations(
+    lines: Iterable[str], *, kind: str
+) -> tuple[list[BulkOperation], list[dict[str, Any]]]:
+    """Parse NDJSON lines: {repo, issue, status} or {repo, issue, body} for comments.
+
+    Invalid lines are returned as ready-made failure results.
+    """
+    value_key = "status" if kind == "set-status" else "body"
+    ops: list[BulkOperation] = []
+    errors: list[dict[str, Any]] = []
+    for number, raw in enumerate(lines, start=1):
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+            repo = row["repo"]
+            issue = row["issue"]
+            value = row[value_key]
+            if not isinstance(repo, str) or "/" not in repo:
+                raise ValueError(f"invalid repo: {repo!r}")
+            if not isinstance(issue, int) or isinstance(issue, bool):
+                raise ValueError(f"invalid issue: {issue!r}")
+            if not isinstance(value, str):
+                raise ValueError(f"invalid {value_key}: {value!r}")
+            if kind == "set-status" and value not in KNOWN_STAGE_LABELS:
+                raise ValueError(f"Unknown stage label: {value}")
+        except KeyError as error:
+            errors.append(_invalid(kind, number, f"missing field {error}"))
+            continue
+        except (ValueError, TypeError) as error:
+            errors.append(_invalid(kind, number, str(error)))
+            continue
+        ops.append(BulkOperation(line=number, repo=repo, issue=issue, value=value))
+    return ops, errors
+
+
+def run_bulk(
+    workflow: Workflow,
+    ops: list[BulkOperation],
+    *,
+    kind: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    throttle: WriteThrottle | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Apply operations grouped by repo and yield one result per operation.
+
+    Repos run concurrently (bounded by `concurrency`); operations within a
+    repo run in input order. Failures are reported and never stop the batch.
+    """
+    by_repo: dict[str, list[BulkOperation]] = {}
+    for op in ops:
+        by_repo.setdefault(op.repo, []).append(op)
+
+    results: queue.Queue[dict[str, Any] | None] = queue.Queue()
+
+    def apply_one(op: BulkOperation) -> dict[str, Any]:
+        base: dict[str, Any] = {
+            "event": kind,
+            "line": op.line,
+            "repo": op.repo,
+            "issue": op.issue,
+        }
+        if kind == "set-status":
+            base["status"] = op.value
+        try:
+            if throttle is not None:
+                throttle.wait()
+            if kind == "set-status":
+                workflow.set_status(op.repo, op.issue, op.value)
+            else:
+                workflow.post_comment(op.repo, op.issue, op.value)
+        except Exception as error:
+            return {**base, "ok": False, "error": str(error) or type(error).__name__}
+        return {**base, "ok": True}
+
+    def run_repo(repo_ops: list[BulkOperation]) -> None:
+        for op in repo_ops:
+            results.put(apply_one(op))
+
+    def run_all() -> None:
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+                for repo_ops in by_repo.values():
+                    pool.submit(run_repo, repo_ops)
+        finally:
+            results.put(None)
+
+    runner = threading.Thread(target=run_all, daemon=True)
+    runner.start()
+    while True:
+        result = results.get()
+        if result is None:
+            break
+        yield result
+    runner.join()
@@ -1,37 +1,294 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import socket
+import sys
+import tempfile
+import time
 from pathlib import Path
+from typing import Any
 
-from gh_issue_workflow.config import load_config
-from gh_issue_workflow.gh_client import GhClient
+from gh_issue_workflow.board import build_board, refresh_open_issues
+from gh_issue_workflow.bulk import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_WRITES_PER_MINUTE,
+    WriteThrottle,
+    parse_operations,
+    run_bulk,
+)
+from gh_issue_workflow.config import RepoConfig, load_config
+from gh_issue_workflow.credentials import CredentialPool
+from gh_issue_workflow.discovery import discover_repos
+from gh_issue_workflow.gh_client import DEFAULT_TIMEOUT_SECONDS, GhClient
+from gh_issue_workflow.plan import apply_plan, build_plan
+from gh_issue_workflow.resilience import CircuitBreaker
+from gh_issue_workflow.sharding import (
+    DEFAULT_HEARTBEAT_TTL_SECONDS,
+    DEFAULT_LEASE_SECONDS,
+    LeaseStore,
+    iter_leased_repos,
+    worker_state_dir,
+)
 from gh_issue_workflow.stages import KNOWN_STAGE_LABELS
+from gh_issue_workflow.state import StateOverlay, StateStore
+from gh_issue_workflow.ticklock import (
+    DEFAULT_STALE_LOCK_SECONDS,
+    TickLock,
+    prioritize_unfinished,
+    record_pending,
+    tick_finished,
+)
 from gh_issue_workflow.workflow import Workflow
 
 
+# Leave headroom inside the 10-minute cron window (see autopilot.build_cron_job).
+DEFAULT_TICK_DEADLINE_SECONDS = 540.0
+
+
+def _add_bulk_arguments(parser: argparse.ArgumentParser, line_format: str) -> None:
+    parser.add_argument(
+        "--from-file",
+        help=f"Read NDJSON operations ({line_format} per line); '-' for stdin",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Repos processed in parallel in --from-file mode",
+    )
+    parser.add_argument(
+        "--writes-per-minute",
+        type=float,
+        default=DEFAULT_WRITES_PER_MINUTE,
+        help="Write pacing across all repos in --from-file mode",
+    )
+
+
+def _run_bulk_command(args: argparse.Namespace, workflow: Workflow) -> int:
+    if args.from_file == "-":
+        lines = sys.stdin.readlines()
+    else:
+        lines = Path(args.from_file).read_text(encoding="utf-8").splitlines()
+
+    ops, failures = parse_operations(lines, kind=args.cmd)
+    for failure in failures:
+        print(json.dumps(failure), flush=True)
+
+    failed = bool(failures)
+    for result in run_bulk(
+        workflow,
+        ops,
+        kind=args.cmd,
+        concurrency=args.concurrency,
+        throttle=WriteThrottle(args.writes_per_minute),
+    ):
+        failed = failed or not result["ok"]
+        print(json.dumps(result), flush=True)
+    return 1 if failed else 0
+
+
+def _tick_lock_path(args: argparse.Namespace) -> Path:
+    if args.lock_file is not None:
+        return args.lock_file
+    if args.state_dir is not None:
+        return args.state_dir / "tick.lock"
+    digest = hashlib.sha256(str(args.config.resolve()).encode()).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / f"gh-issue-workflow-{digest}.lock"
+
+
+def _run_tick_command(
+    args: argparse.Namespace,
+    client: GhClient,
+    workflow: Workflow,
+    state: StateStore,
+    repos: list[RepoConfig],
+) -> int:
+    tick_deadline = time.time() + args.deadline_seconds
+    # Repos the previous run did not finish go first; the pending list is
+    # kept current so a killed run leaves an accurate one behind.
+    repos = prioritize_unfinished(state, repos)
+    pending = [repo.name for repo in repos]
+    unfinished: list[str] = []
+    record_pending(state, pending)
+
+    def run_repo_tick(repo: RepoConfig) -> dict[str, Any]:
+        deadline = tick_deadline
+        if args.repo_budget_seconds is not None:
+            deadline = min(deadline, time.time() + args.repo_budget_seconds)
+        with client.tick_scope():
+            result = workflow.run_tick(repo, deadline=deadline)
+        pending.remove(repo.name)
+        if not tick_finished(result):
+            unfinished.append(repo.name)
+        record_pending(state, unfinished + pending)
+        return result
+
+    if args.shard_store is None:
+        for repo in repos:
+            print(json.dumps({"event": "tick", **run_repo_tick(repo)}))
+    else:
+        store = LeaseStore(args.shard_store)
+        try:
+            for repo in iter_leased_repos(
+                store,
+                args.worker_id,
+                repos,
+                lease_seconds=args.lease_seconds,
+                heartbeat_ttl_seconds=args.heartbeat_ttl_seconds,
+            ):
+                result = run_repo_tick(repo)
+                print(json.dumps({"event": "tick", "worker": args.worker_id, **result}))
+        finally:
+            store.close()
+    # Repos this worker never reached (other shards' repos) are not ours to retry.
+    record_pending(state, unfinished)
+    return 0
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Multi-repo GitHub issue stage workflow")
     parser.add_argument("--config", type=Path, required=True, help="JSON/YAML config path")
     parser.add_argument("--dry-run", action="store_true", help="Simulate writes")
+    parser.add_argument(
+        "--timeout-seconds",
+        type=float,
+        default=DEFAULT_TIMEOUT_SECONDS,
+        help="Per-attempt timeout for each gh call",
+    )
+    parser.add_argument(
+        "--hedge-reads",
+        action="store_true",
+        help="Fire a second identical GET when the first exceeds the recent p95 latency",
+    )
+    parser.add_argument(
+        "--state-dir",
+        type=Path,
+        help="Directory for persisted caches (org inventory, ...); memory-only if unset",
+    )
+    parser.add_argument(
+        "--server-side-pick",
+        action="store_true",
+        help="Pick via per-stage oldest-first API queries instead of listing all open issues",
+    )
 
     sub = parser.add_subparsers(dest="cmd", required=True)
 
-    sub.add_parser("tick", help="Process one deterministic tick across repos")
+    tick = sub.add_parser("tick", help="Process one deterministic tick across repos")
+    tick.add_argument(
+        "--deadline-seconds",
+        type=float,
+        default=DEFAULT_TICK_DEADLINE_SECONDS,
+        help="Overall time budget for the tick; phases that would overrun are skipped",
+    )
+    tick.add_argument(
+        "--repo-budget-seconds",
+        type=float,
+        help="Per-repo time budget (capped by the overall deadline)",
+    )
+    tick.add_argument(
+        "--shard-store",
+        type=Path,
+        help="SQLite lease store shared by sharded workers (enables sharded mode)",
+    )
+    tick.add_argument(
+        "--worker-id",
+        default=socket.gethostname(),
+        help="Stable worker identity for sharded mode (default: hostname)",
+    )
+    tick.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help="Per-repo lease duration in sharded mode",
+    )
+    tick.add_argument(
+        "--heartbeat-ttl-seconds",
+        type=float,
+        default=DEFAULT_HEARTBEAT_TTL_SECONDS,
+        help="Drop workers from the ring after this long without a heartbeat "
+        "(about 1.5x the cron interval)",
+    )
+    tick.add_argument(
+        "--change-gate",
+        action="store_true",
+        help="Skip repos whose issues did not change since their last complete tick",
+    )
+    tick.add_argument(
+        "--lock-file",
+        type=Path,
+        help="Tick lock preventing overlapping runs (default: <state-dir>/tick.lock, "
+        "per worker in sharded mode)",
+    )
+    tick.add_argument(
+        "--stale-lock-seconds",
+        type=float,
+        default=DEFAULT_STALE_LOCK_SECONDS,
+        help="Age after which another run's lock is taken over",
+    )
     sub.add_parser("ensure-labels", help="Ensure stage labels exist in all repos")
     sub.add_parser("cleanup-closed", help="Remove stage:* labels from closed issues")
 
     set_status = sub.add_parser("set-status", help="Set a stage on one issue")
-    set_status.add_argument("--repo", required=True)
-    set_status.add_argument("--issue", type=int, required=True)
-    set_status.add_argument("--status", required=True, choices=sorted(KNOWN_STAGE_LABELS))
+    set_status.add_argument("--repo")
+    set_status.add_argument("--issue", type=int)
+    set_status.add_argument("--status", choices=sorted(KNOWN_STAGE_LABELS))
+    _add_bulk_arguments(set_status, '{"repo": ..., "issue": ..., "status": ...}')
 
     comment = sub.add_parser("comment", help="Post comment to one issue")
-    comment.add_argument("--repo", required=True)
-    comment.add_argument("--issue", type=int, required=True)
-    comment.add_argument("--body", required=True)
+    comment.add_argument("--repo")
+    comment.add_argument("--issue", type=int)
+    comment.add_argument("--body")
+    _add_bulk_arguments(comment, '{"repo": ..., "issue": ..., "body": ...}')
+
+    pick_next = sub.add_parser("pick-next", help="Show next actionable issue per repo")
+    pick_next.add_argument(
+        "--global",
+        dest="global_pick",
+        action="store_true",
+        help="Rank the most urgent issues across all repos instead",
+    )
+    pick_next.add_argument(
+        "--top",
+        type=int,
+        default=1,
+        help="Number of issues to return in --global mode",
+    )
+
+    board = sub.add_parser(
+        "board", help="Stage counts, oldest issues and next picks from local state"
+    )
+    board.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate cached open-issue pages with conditional requests first",
+    )
+    sub.add_parser("metrics", help="Time-in-stage flow metrics from local state")
 
-    sub.add_parser("pick-next", help="Show next actionable issue per repo")
+    plan = sub.add_parser("plan", help="Record the writes a tick would make as a plan")
+    plan.add_argument("--out", default="-", help="Plan file to write; '-' for stdout")
+    plan.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Repos planned in parallel",
+    )
+
+    apply = sub.add_parser("apply", help="Execute a plan written by 'plan'")
+    apply.add_argument("--plan", required=True, help="Plan file; '-' for stdin")
+    apply.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Repos applied in parallel",
+    )
+    apply.add_argument(
+        "--writes-per-minute",
+        type=float,
+        default=DEFAULT_WRITES_PER_MINUTE,
+        help="Write pacing across all repos",
+    )
 
     return parser
 
@@ -40,26 +297,44 @@ def main() -> int:
     parser = _build_parser()
     args = parser.parse_args()
 
-    cfg = load_config(args.config)
-    workflow = Workflow(GhClient(dry_run=args.dry_run))
-
-    if args.cmd == "ensure-labels":
-        for repo in cfg.repos:
-            workflow.ensure_stage_labels(repo.name)
-            print(json.dumps({"event": "ensure-labels", "repo": repo.name}))
-        return 0
+    if getattr(args, "shard_store", None) is not None and args.state_dir is not None:
+        args.state_dir = worker_state_dir(args.state_dir, args.worker_id)
 
-    if args.cmd == "cleanup-closed":
-        for repo in cfg.repos:
-            cleaned = workflow.cleanup_closed_issue_stage_labels(repo.name)
-            print(json.dumps({"event": "cleanup-closed", "repo": repo.name, "cleaned": cleaned}))
-        return 0
+    cfg = load_config(args.config)
+    try:
+        pool = CredentialPool.from_config(cfg.credentials) if cfg.credentials else None
+    except ValueError as error:
+        parser.error(str(error))
+    client = GhClient(
+        dry_run=args.dry_run,
+        timeout_seconds=args.timeout_seconds,
+        hedge_reads=args.hedge_reads,
+        credentials=pool,
+    )
+    # A dry run faked its writes, so it must not persist convergence, cursors,
+    # gate ETags or breaker state either.
+    state = StateStore(args.state_dir)
+    if args.dry_run:
+        state = StateOverlay(state)
+    workflow = Workflow(
+        client,
+        server_side_pick=args.server_side_pick,
+        change_gate=getattr(args, "change_gate", False),
+        state=state,
+        breaker=CircuitBreaker(store=state),
+    )
 
-    if args.cmd == "pick-next":
-        for repo in cfg.repos:
-            pick = workflow.pick_next(repo)
-            print(json.dumps({"event": "pick-next", "repo": repo.name, "pick": pick}))
-        return 0
+    if args.cmd in {"set-status", "comment"}:
+        if args.from_file is not None:
+            return _run_bulk_command(args, workflow)
+        value_arg = "status" if args.cmd == "set-status" else "body"
+        missing = [
+            f"--{name}"
+            for name in ("repo", "issue", value_arg)
+            if getattr(args, name) is None
+        ]
+        if missing:
+            parser.error(f"{args.cmd} requires {', '.join(missing)} or --from-file")
 
     if args.cmd == "set-status":
         workflow.set_status(args.repo, args.issue, args.status)
@@ -71,9 +346,113 @@ def main() -> int:
         print(json.dumps({"event": "comment", "repo": args.repo, "issue": args.issue}))
         return 0
 
+    if args.cmd == "board":
+        repos = (
+            discover_repos(cfg, client, state, offline=not args.refresh)
+            if cfg.orgs
+            else cfg.repos
+        )
+        if args.refresh:
+            for repo in repos:
+                refresh_open_issues(client, state, repo.name, now=time.time())
+        report = build_board(state, [repo.name for repo in repos])
+        for repo_board in report["repos"]:
+            print(json.dumps({"event": "board", **repo_board}))
+        print(
+            json.dumps(
+                {
+                    "event": "board-totals",
+                    "totals": report["totals"],
+                    "missing": report["missing"],
+                }
+            )
+        )
+        return 0
+
+    if args.cmd == "metrics":
+        repos = discover_repos(cfg, client, state, offline=True) if cfg.orgs else cfg.repos
+        for repo in repos:
+            flow = workflow.metrics.snapshot(repo.name)
+            print(json.dumps({"event": "metrics", "repo": repo.name, "flow": flow}))
+        return 0
+
+    if args.cmd == "apply":
+        if args.plan == "-":
+            plan_data = json.load(sys.stdin)
+        else:
+            plan_data = json.loads(Path(args.plan).read_text(encoding="utf-8"))
+        failed = False
+        for result in apply_plan(
+            workflow,
+            plan_data,
+            store=state,
+            concurrency=args.concurrency,
+            throttle=WriteThrottle(args.writes_per_minute),
+        ):
+            failed = failed or not result["ok"]
+            print(json.dumps(result), flush=True)
+        return 1 if failed else 0
+
     if args.cmd == "tick":
-        for repo in cfg.repos:
-            print(json.dumps({"event": "tick", **workflow.run_tick(repo)}))
+        lock = TickLock(_tick_lock_path(args), stale_seconds=args.stale_lock_seconds)
+        holder = lock.acquire()
+        if holder is not None:
+            print(
+                json.dumps(
+                    {"event": "skipped-overlap", "lock": str(lock.path), "holder": holder}
+                )
+            )
+            return 0
+        try:
+            repos = discover_repos(cfg, client, state) if cfg.orgs else cfg.repos
+            return _run_tick_command(args, client, workflow, state, repos)
+        finally:
+            lock.release()
+
+    repos = discover_repos(cfg, client, state) if cfg.orgs else cfg.repos
+
+    if args.cmd == "plan":
+        plan_data = build_plan(
+            client,
+            state,
+            repos,
+            concurrency=args.concurrency,
+            server_side_pick=args.server_side_pick,
+        )
+        encoded = json.dumps(plan_data, indent=2)
+        if args.out == "-":
+            print(encoded)
+        else:
+            Path(args.out).write_text(encoded + "\n", encoding="utf-8")
+            writes = sum(len(entry["writes"]) for entry in plan_data["repos"])
+            print(
+                json.dumps(
+                    {"event": "plan", "out": args.out, "repos": len(repos), "writes": writes}
+                )
+            )
+        return 0
+
+    if args.cmd == "ensure-labels":
+        for repo in repos:
+            result = workflow.ensure_stage_labels(repo.name, force=True)
+            print(json.dumps({"event": "ensure-labels", "repo": repo.name, **result}))
+        return 0
+
+    if args.cmd == "cleanup-closed":
+        for repo in repos:
+            cleaned = workflow.cleanup_closed_issue_stage_labels(repo.name)
+            print(json.dumps({"event": "cleanup-closed", "repo": repo.name, "cleaned": cleaned}))
+        return 0
+
+    if args.cmd == "pick-next":
+        if args.global_pick:
+            picks = workflow.pick_next_global(repos, top=args.top)
+            for rank, entry in enumerate(picks, start=1):
+                print(json.dumps({"event": "pick-next", "rank": rank, **entry}))
+            return 0
+        for repo in repos:
+            pick = workflow.pick_next(repo)
+            print(json.dumps({"event": "pick-next", "repo": repo.name, "pick": pick}))
         return 0
 
     parser.error("unknown command")
@@ -6,6 +6,8 @@ from pathlib import Path
 
 import yaml
 
+DEFAULT_INVENTORY_REFRESH_SECONDS = 3600.0
+
 
 @dataclass(frozen=True)
 class RepoConfig:
@@ -13,9 +15,37 @@ class RepoConfig:
     owner_logins: list[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class OrgConfig:
+    """Target every repo of an org whose name matches include/exclude globs."""
+
+    name: str
+    include: list[str] = field(default_factory=lambda: ["*"])
+    exclude: list[str] = field(default_factory=list)
+    owner_logins: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class CredentialConfig:
+    """One API credential; the token itself is read from `token_env`.
+
+    Credentials scoped by `repos` globs or `orgs` serve matching repos;
+    unscoped ones (or `pooled: true`) serve every other repo.
+    """
+
+    name: str
+    token_env: str
+    repos: list[str] = field(default_factory=list)
+    orgs: list[str] = field(default_factory=list)
+    pooled: bool = False
+
+
 @dataclass(frozen=True)
 class AppConfig:
     repos: list[RepoConfig]
+    orgs: list[OrgConfig] = field(default_factory=list)
+    inventory_refresh_seconds: float = DEFAULT_INVENTORY_REFRESH_SECONDS
+    credentials: list[CredentialConfig] = field(default_factory=list)
 
 
 def load_config(path: Path) -> AppConfig:
@@ -34,4 +64,36 @@ def load_config(path: Path) -> AppConfig:
             )
         )
 
-    return AppConfig(repos=repos)
+    orgs = []
+    for org in payload.get("orgs", []):
+        orgs.append(
+            OrgConfig(
+                name=str(org["name"]),
+                include=[str(v) for v in org.get("include", ["*"])],
+                exclude=[str(v) for v in org.get("exclude", [])],
+                owner_logins=[str(v) for v in org.get("owner_logins", [])],
+            )
+        )
+
+    credentials = []
+    for cred in payload.get("credentials", []):
+        scoped_repos = [str(v) for v in cred.get("repos", [])]
+        scoped_orgs = [str(v) for v in cred.get("orgs", [])]
+        credentials.append(
+            CredentialConfig(
+                name=str(cred["name"]),
+                token_env=str(cred["token_env"]),
+                repos=scoped_repos,
+                orgs=scoped_orgs,
+                pooled=bool(cred.get("pooled", not (scoped_repos or scoped_orgs))),
+            )
+        )
+
+    return AppConfig(
+        repos=repos,
+        orgs=orgs,
+        credentials=credentials,
+        inventory_refresh_seconds=float(
+            payload.get("inventory_refresh_seconds", DEFAULT_INVENTORY_REFRESH_SECONDS)
+        ),
+    )
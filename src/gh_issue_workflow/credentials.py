@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Callable, Mapping
+
+from gh_issue_workflow.config import CredentialConfig
+
+# GitHub's primary limit for PATs and most app installation tokens.
+DEFAULT_HOURLY_LIMIT = 5000
+
+
+@dataclass(frozen=True)
+class Credential:
+    name: str
+    token: str
+    repos: tuple[str, ...] = ()
+    orgs: tuple[str, ...] = ()
+    pooled: bool = True
+
+    def serves(self, repo: str) -> bool:
+        owner = repo.split("/", 1)[0]
+        if owner in self.orgs:
+            return True
+        return "/" in repo and any(fnmatchcase(repo, pattern) for pattern in self.repos)
+
+
+@dataclass
+class _Budget:
+    limit: int = DEFAULT_HOURLY_LIMIT
+    remaining: int = DEFAULT_HOURLY_LIMIT
+    reset_at: float = 0.0
+
+
+class CredentialPool:
+    """Routes each request to the eligible credential with the most budget left.
+
+    Budgets start at the default hourly limit, are decremented optimistically
+    on every pick and corrected from `X-RateLimit-*` response headers.
+    """
+
+    def __init__(
+        self,
+        credentials: list[Credential],
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not credentials:
+            raise ValueError("credential pool needs at least one credential")
+        self.credentials = credentials
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._budgets = {cred.name: _Budget() for cred in credentials}
+
+    @classmethod
+    def from_config(
+        cls,
+        configs: list[CredentialConfig],
+        *,
+        environ: Mapping[str, str] = os.environ,
+    ) -> CredentialPool:
+        credentials = []
+        for cfg in configs:
+            token = environ.get(cfg.token_env)
+            if not token:
+                raise ValueError(
+                    f"credential {cfg.name!r}: ${cfg.token_env} is not set"
+                )
+            credentials.append(
+                Credential(
+                    name=cfg.name,
+                    token=token,
+                    repos=tuple(cfg.repos),
+                    orgs=tuple(cfg.orgs),
+                    pooled=cfg.pooled,
+                )
+            )
+        return cls(credentials)
+
+    def _eligible(self, repo: str | None) -> list[Credential]:
+        if repo is not None:
+            scoped = [cred for cred in self.credentials if cred.serves(repo)]
+            if scoped:
+                return scoped
+        pooled = [cred for cred in self.credentials if cred.pooled]
+        return pooled or self.credentials
+
+    def _remaining(self, name: str, now: float) -> int:
+        budget = self._budgets[name]
+        if budget.reset_at and now >= budget.reset_at:
+            budget.remaining = budget.limit
+            budget.reset_at = 0.0
+        return budget.remaining
+
+    def select(self, repo: str | None) -> Credential:
+        """Pick the eligible credential with the most remaining budget.
+
+        `repo` is "owner/name", a bare org/owner for org-level calls, or None.
+        """
+        with self._lock:
+            now = self.clock()
+            best = max(
+                self._eligible(repo),
+                key=lambda cred: self._remaining(cred.name, now),
+            )
+            self._budgets[best.name].remaining -= 1
+            return best
+
+    def record(self, name: str, headers: Mapping[str, str]) -> None:
+        """Update a credential's budget from lower-cased response headers."""
+        try:
+            remaining = int(headers["x-ratelimit-remaining"])
+        except (KeyError, ValueError):
+            return
+        with self._lock:
+            budget = self._budgets[name]
+            budget.remaining = remaining
+            if headers.get("x-ratelimit-limit", "").isdigit():
+                budget.limit = int(headers["x-ratelimit-limit"])
+            if headers.get("x-ratelimit-reset", "").isdigit():
+                budget.reset_at = float(headers["x-ratelimit-reset"])
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            now = self.clock()
+            return {name: self._remaining(name, now) for name in self._budgets}
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from fnmatch import fnmatchcase
+from typing import Any, Callable
+
+from gh_issue_workflow.config import AppConfig, OrgConfig, RepoConfig
+from gh_issue_workflow.gh_client import GhClient
+from gh_issue_workflow.state import StateStore
+
+INVENTORY_NAMESPACE = "org_inventory"
+_PAGE_SIZE = 100
+
+
+def _project_repo(row: dict[str, Any]) -> dict[str, Any] | None:
+    name = row.get("full_name")
+    if not isinstance(name, str):
+        return None
+    return {
+        "name": name,
+        "archived": bool(row.get("archived")),
+        "has_issues": bool(row.get("has_issues", True)),
+    }
+
+
+def refresh_org_inventory(
+    client: GhClient, store: StateStore, org: str, *, now: float
+) -> dict[str, Any]:
+    """Revalidate every cached page of `orgs/{org}/repos` with its ETag.
+
+    Unchanged pages come back as 304 and reuse the cached rows, so a
+    refresh of an idle org costs no primary rate limit.
+    """
+    cached = store.get(INVENTORY_NAMESPACE, org) or {}
+    cached_pages: list[dict[str, Any]] = cached.get("pages", [])
+
+    pages: list[dict[str, Any]] = []
+    page = 1
+    while True:
+        previous = cached_pages[page - 1] if page <= len(cached_pages) else None
+        response = client.api_conditional(
+            f"orgs/{org}/repos",
+            fields={"type": "all", "per_page": _PAGE_SIZE, "page": page},
+            etag=previous.get("etag") if previous else None,
+        )
+        if response.not_modified and previous is not None:
+            entry = previous
+        else:
+            rows = response.payload if isinstance(response.payload, list) else []
+            entry = {
+                "etag": response.etag,
+                "count": len(rows),
+                "repos": [
+                    repo
+                    for repo in (_project_repo(r) for r in rows if isinstance(r, dict))
+                    if repo is not None
+                ],
+            }
+        pages.append(entry)
+        if int(entry.get("count", 0)) < _PAGE_SIZE:
+            break
+        page += 1
+
+    inventory = {"fetched_at": now, "pages": pages}
+    store.put(INVENTORY_NAMESPACE, org, inventory)
+    return inventory
+
+
+def _matches(org: OrgConfig, full_name: str) -> bool:
+    short_name = full_name.split("/", 1)[-1]
+    if not any(fnmatchcase(short_name, pattern) for pattern in org.include):
+        return False
+    return not any(fnmatchcase(short_name, pattern) for pattern in org.exclude)
+
+
+def discover_repos(
+    cfg: AppConfig,
+    client: GhClient,
+    store: StateStore,
+    *,
+    clock: Callable[[], float] = time.time,
+    offline: bool = False,
+) -> list[RepoConfig]:
+    """Return explicit repos plus org repos from the cached inventory.
+
+    The inventory is only revalidated once `inventory_refresh_seconds` have
+    passed; with `offline=True` it is never fetched and orgs without a cached
+    inventory contribute nothing. Archived and issue-disabled repos are
+    skipped using the listing itself. Explicit `repos:` entries win over org
+    defaults.
+    """
+    repos = list(cfg.repos)
+    seen = {repo.name for repo in repos}
+    now = clock()
+
+    for org in cfg.orgs:
+        inventory = store.get(INVENTORY_NAMESPACE, org.name)
+        if offline:
+            if inventory is None:
+                continue
+        elif (
+            inventory is None
+            or now - float(inventory.get("fetched_at", 0)) >= cfg.inventory_refresh_seconds
+        ):
+            inventory = refresh_org_inventory(client, store, org.name, now=now)
+
+        for page in inventory["pages"]:
+            for repo in page["repos"]:
+                name = repo["name"]
+                if repo["archived"] or not repo["has_issues"] or name in seen:
+                    continue
+                if not _matches(org, name):
+                    continue
+                seen.add(name)
+                repos.append(RepoConfig(name=name, owner_logins=list(org.owner_logins)))
+
+    return repos
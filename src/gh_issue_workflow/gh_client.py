@@ -1,59 +1,687 @@
 from __future__ import annotations
 
 import json
+import os
+import queue
+import random
+import re
 import subprocess
+import tempfile
+import threading
 import time
-from typing import Any
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Collection, Iterable, Iterator
+
+from gh_issue_workflow.credentials import Credential, CredentialPool
+
+_STREAM_CHUNK_CHARS = 64 * 1024
+_ISSUE_LIST_PATH_RE = re.compile(r"^repos/[^/]+/[^/]+/issues$")
+_ISSUE_PATH_RE = re.compile(r"^(repos/[^/]+/[^/]+/issues)/(\d+)$")
+_TRANSIENT_RE = re.compile(
+    r"http 5\d\d|\b50[0-4]\b|timed out|timeout|connection (?:reset|refused)"
+    r"|unexpected eof|\beof\b|tls handshake|temporary failure|could not resolve host"
+)
+DEFAULT_TIMEOUT_SECONDS = 60.0
+_LATENCY_SAMPLES = 200
+_MIN_HEDGE_SAMPLES = 20
+_JSON_WHITESPACE = " \t\r\n"
 
 
 class GhApiError(RuntimeError):
     """Raised when gh api fails permanently."""
 
 
+class GhTransientError(GhApiError):
+    """A non-idempotent request failed transiently; it may or may not have landed."""
+
+
+def is_transient_failure(stderr: str) -> bool:
+    """True for 5xx responses, timeouts and connection-level errors."""
+    return _TRANSIENT_RE.search(stderr.lower()) is not None
+
+
+def api_args(
+    gh_bin: str, method: str, path: str, fields: dict[str, Any] | None
+) -> list[str]:
+    args = [gh_bin, "api", "--method", method.upper(), path]
+    if fields:
+        for key, value in fields.items():
+            args.extend(["-f", f"{key}={value}"])
+    return args
+
+
+def should_retry(method: str, stderr: str) -> bool:
+    """Rate limits always; 5xx/timeouts/connection errors unless it was a POST."""
+    lowered = stderr.lower()
+    if "rate limit" in lowered or "secondary rate limit" in lowered:
+        return True
+    # A POST that failed transiently may still have been applied.
+    return method != "POST" and is_transient_failure(stderr)
+
+
+def backoff_delay(backoff_seconds: float, attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, backoff_seconds * (2**attempt))
+
+
+def request_target(args: list[str]) -> str | None:
+    """Return "owner/repo" or the org/user a gh api call is scoped to."""
+    parts = args[4].split("/") if len(args) > 4 else []
+    if len(parts) >= 3 and parts[0] == "repos":
+        return f"{parts[1]}/{parts[2]}"
+    if len(parts) >= 2 and parts[0] in {"orgs", "users"}:
+        return parts[1]
+    return None
+
+
+def iter_json_array_items(chunks: Iterable[str]) -> Iterator[Any]:
+    """Incrementally decode JSON array elements from a stream of text chunks.
+
+    Accepts one top-level array or several concatenated ones (as printed by
+    `gh api --paginate`). Only the element being decoded is buffered.
+    Top-level values that are not arrays are skipped.
+    """
+    decoder = json.JSONDecoder()
+    source = iter(chunks)
+    buf = ""
+    pos = 0
+    eof = False
+    in_array = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        for chunk in source:
+            if chunk:
+                buf = buf[pos:] + chunk
+                pos = 0
+                return True
+        eof = True
+        return False
+
+    while True:
+        while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            if eof or not fill():
+                if in_array:
+                    raise ValueError("truncated JSON array in stream")
+                return
+            continue
+
+        char = buf[pos]
+        if in_array and char == ",":
+            pos += 1
+            continue
+        if in_array and char == "]":
+            in_array = False
+            pos += 1
+            continue
+        if not in_array and char == "[":
+            in_array = True
+            pos += 1
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof or not fill():
+                raise
+            continue
+        # A scalar ending exactly at the buffer edge may continue in the
+        # next chunk; decode again once more data (or EOF) is known.
+        if end == len(buf) and not eof and fill():
+            continue
+        pos = end
+        if in_array:
+            yield value
+
+
+@dataclass(frozen=True)
+class ConditionalResponse:
+    """Result of a conditional GET; `payload` is None when not modified."""
+
+    status: int
+    etag: str | None
+    payload: Any
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+def parse_include_output(output: str) -> tuple[int, dict[str, str], str]:
+    """Split `gh api --include` output into status, lower-cased headers, body."""
+    normalized = output.replace("\r\n", "\n")
+    head, _, body = normalized.partition("\n\n")
+    lines = head.split("\n")
+    parts = lines[0].split()
+    status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        key, sep, value = line.partition(":")
+        if sep:
+            headers[key.strip().lower()] = value.strip()
+    return status, headers, body
+
+
+def strip_include_head(
+    chunks: Iterable[str], on_headers: Callable[[dict[str, str]], None]
+) -> Iterator[str]:
+    """Pass streamed `gh api --include` output on without its status/header block.
+
+    The parsed headers go to `on_headers` before the first body chunk.
+    """
+    chunks = iter(chunks)
+    head = ""
+    for chunk in chunks:
+        head += chunk
+        if "\n\n" in head.replace("\r\n", "\n"):
+            break
+    _, headers, body = parse_include_output(head)
+    on_headers(headers)
+    if body:
+        yield body
+    yield from chunks
+
+
+RequestKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def request_key(path: str, fields: dict[str, Any] | None) -> RequestKey:
+    """Identity of a GET: its path and its fields in a canonical order."""
+    return path, tuple(sorted((key, str(value)) for key, value in (fields or {}).items()))
+
+
+def listed_issue_reads(key: RequestKey, result: Any) -> Iterator[tuple[RequestKey, Any]]:
+    """The single-issue GETs an issue listing already answers, one per row."""
+    if _ISSUE_LIST_PATH_RE.match(key[0]) and isinstance(result, list):
+        for row in result:
+            if isinstance(row, dict) and isinstance(row.get("number"), int):
+                yield request_key(f"{key[0]}/{row['number']}", None), row
+
+
+def _paths_related(a: str, b: str) -> bool:
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+def _listing_affected(
+    key: RequestKey, result: Any, number: int, labels: Collection[str]
+) -> bool:
+    """Whether setting issue `number`'s labels can change this issue listing.
+
+    Not when the issue is absent from the rows and cannot have joined them:
+    the listing is neither ordered nor filtered by update time, and none of
+    its filter labels is among the new labels (state does not change).
+    """
+    fields = dict(key[1])
+    if not isinstance(result, list) or fields.get("sort") == "updated" or "since" in fields:
+        return True
+    if any(isinstance(row, dict) and row.get("number") == number for row in result):
+        return True
+    wanted = fields.get("labels")
+    return bool(wanted) and not set(wanted.split(",")).isdisjoint(labels)
+
+
+class _Flight:
+    """One in-progress GET that concurrent identical callers wait on."""
+
+    def __init__(self) -> None:
+        # Set when a related write lands mid-request; the result may be stale.
+        self.stale = False
+        # Writes whose effect depends on the result: each returns True if the
+        # result is affected (and then neither memoized nor reused).
+        self.checks: list[Callable[[Any], bool]] = []
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
 class GhClient:
-    def __init__(self, *, dry_run: bool = False, max_retries: int = 3, backoff_seconds: float = 1.0) -> None:
+    def __init__(
+        self,
+        *,
+        dry_run: bool = False,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        timeout_seconds: float | None = DEFAULT_TIMEOUT_SECONDS,
+        hedge_reads: bool = False,
+        credentials: CredentialPool | None = None,
+        gh_bin: str = "gh",
+    ) -> None:
         self.dry_run = dry_run
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self.hedge_reads = hedge_reads
+        self.credentials = credentials
+        self.gh_bin = gh_bin
+        self.sleep: Callable[[float], None] = time.sleep
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+        self._in_flight: dict[RequestKey, _Flight] = {}
+        self._memo: dict[RequestKey, Any] | None = None
+        self._scope_depth = 0
+
+    @contextmanager
+    def tick_scope(self) -> Iterator[None]:
+        """Memoize GET results until the scope exits (one tick).
+
+        Results are shared between callers and must be treated as read-only.
+        """
+        with self._lock:
+            if self._scope_depth == 0:
+                self._memo = {}
+            self._scope_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._scope_depth -= 1
+                if self._scope_depth == 0:
+                    self._memo = None
+
+    def _invalidate(self, path: str, *, labels: Collection[str] | None = None) -> None:
+        """Drop memoized reads of `path`, its sub-resources and its parents.
+
+        Related GETs still in flight are marked stale: they are not memoized
+        and later callers do not join them. When the write only set an issue's
+        `labels`, listings of that repo's issues are kept unless the issue is
+        (or could now be) among their rows.
+        """
+        issue = _ISSUE_PATH_RE.match(path) if labels is not None else None
+        listing = issue.group(1) if issue is not None else None
+        number = int(issue.group(2)) if issue is not None else 0
+        new_labels = frozenset(labels or ())
+        with self._lock:
+            for key, flight in self._in_flight.items():
+                if key[0] == listing:
+                    flight.checks.append(
+                        partial(_listing_affected, key, number=number, labels=new_labels)
+                    )
+                elif _paths_related(key[0], path):
+                    flight.stale = True
+            if self._memo:
+                stale = [
+                    key
+                    for key, result in self._memo.items()
+                    if (
+                        _listing_affected(key, result, number, new_labels)
+                        if key[0] == listing
+                        else _paths_related(key[0], path)
+                    )
+                ]
+                for key in stale:
+                    del self._memo[key]
+
+    def _remember(self, key: RequestKey, result: Any) -> None:
+        """Memoize a GET; issue listings also seed each issue's own GET."""
+        assert self._memo is not None
+        self._memo[key] = result
+        self._memo.update(listed_issue_reads(key, result))
+
+    def _get(
+        self,
+        path: str,
+        fields: dict[str, Any] | None,
+        fetch: Callable[[], Any] | None = None,
+    ) -> Any:
+        """Single-flight GET: identical concurrent requests share one gh call.
+
+        `fetch` replaces the plain gh call for the leader (see `api_projected`).
+        """
+        key = request_key(path, fields)
+        with self._lock:
+            if self._memo is not None and key in self._memo:
+                return self._memo[key]
+            flight = self._in_flight.get(key)
+            if flight is not None and flight.stale:
+                flight = None
+            leader = flight is None
+            if flight is None:
+                flight = _Flight()
+                self._in_flight[key] = flight
+            joined_after_write = not leader and bool(flight.checks)
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if joined_after_write and any(check(flight.result) for check in flight.checks):
+                return self._get(path, fields, fetch)
+            return flight.result
+
+        try:
+            if fetch is not None:
+                flight.result = fetch()
+            else:
+                flight.result = self._run_json(self._api_args("GET", path, fields))
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+                if (
+                    flight.error is None
+                    and self._memo is not None
+                    and not flight.stale
+                    and not any(check(flight.result) for check in flight.checks)
+                ):
+                    self._remember(key, flight.result)
+            flight.done.set()
+        return flight.result
+
+    def _api_args(
+        self, method: str, path: str, fields: dict[str, Any] | None
+    ) -> list[str]:
+        return api_args(self.gh_bin, method, path, fields)
 
     def api(self, method: str, path: str, *, fields: dict[str, Any] | None = None) -> Any:
-        args = ["gh", "api", "--method", method.upper(), path]
-        if fields:
-            for key, value in fields.items():
-                args.extend(["-f", f"{key}={value}"])
+        if method.upper() == "GET":
+            return self._get(path, fields)
+        try:
+            return self._run_json(self._api_args(method, path, fields))
+        finally:
+            self._invalidate(path)
+
+    def api_conditional(
+        self,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        etag: str | None = None,
+    ) -> ConditionalResponse:
+        """GET with `If-None-Match`; a 304 does not count against the rate limit."""
+        args = self._api_args("GET", path, fields)
+        args.append("--include")
+        if etag:
+            args.extend(["-H", f"If-None-Match: {etag}"])
 
-        return self._run_json(args)
+        proc = self._run_process(args)
+        status, headers, body = parse_include_output(proc.stdout)
+        if status == 304:
+            return ConditionalResponse(status=304, etag=etag, payload=None)
+        if proc.returncode != 0:
+            raise GhApiError(
+                proc.stderr.strip() or f"command failed: {' '.join(args)}"
+            )
+        body = body.strip()
+        return ConditionalResponse(
+            status=status,
+            etag=headers.get("etag"),
+            payload=json.loads(body) if body else {},
+        )
 
     def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
-        args = ["gh", "api", "--method", "PATCH", path]
-        return self._run_json(args, stdin_json=body)
+        args = [self.gh_bin, "api", "--method", "PATCH", path]
+        labels = body.get("labels") if set(body) == {"labels"} else None
+        try:
+            return self._run_json(args, stdin_json=body)
+        finally:
+            self._invalidate(
+                path,
+                labels=[str(label) for label in labels] if isinstance(labels, list) else None,
+            )
 
     def api_post_json(self, path: str, body: dict[str, Any]) -> Any:
-        args = ["gh", "api", "--method", "POST", path]
-        return self._run_json(args, stdin_json=body)
+        args = [self.gh_bin, "api", "--method", "POST", path]
+        try:
+            return self._run_json(args, stdin_json=body)
+        finally:
+            self._invalidate(path)
 
-    def _run_json(self, args: list[str], *, stdin_json: dict[str, Any] | None = None) -> Any:
-        if self.dry_run and any(flag in args for flag in ["POST", "PATCH", "PUT", "DELETE"]):
-            return {"dry_run": True, "args": args, "body": stdin_json}
+    def api_projected(
+        self,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        project: Callable[[Any], Any],
+    ) -> Any:
+        """GET a list endpoint like `api`, keeping only `project(row)` per row.
+
+        Rows are streamed through `api_iter` and projected one at a time, so
+        raw rows are never held; the memo stores the projected list, and any
+        caller of `api` for the same read within the tick gets it too.
+        """
+        api_iter = getattr(self, "api_iter", None)
+
+        def fetch() -> Any:
+            if api_iter is None:
+                payload = self._run_json(self._api_args("GET", path, fields))
+                return [project(row) for row in payload] if isinstance(payload, list) else payload
+            return [project(row) for row in api_iter("GET", path, fields=fields)]
+
+        return self._get(path, fields, fetch)
+
+    def api_iter(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Iterator[Any]:
+        """Stream the elements of a JSON array response as they are decoded.
+
+        Retries on rate limits only while nothing has been yielded yet.
+        """
+        args = self._api_args(method, path, fields)
 
         for attempt in range(self.max_retries + 1):
+            with tempfile.TemporaryFile(mode="w+") as stderr_file:
+                run_args, env, credential = self._credential_args(args)
+                proc = subprocess.Popen(
+                    run_args,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file,
+                    text=True,
+                    env=env,
+                )
+                assert proc.stdout is not None
+                watchdog = None
+                if self.timeout_seconds is not None:
+                    watchdog = threading.Timer(self.timeout_seconds, proc.kill)
+                    watchdog.start()
+                yielded = False
+                try:
+                    chunks: Iterable[str] = iter(
+                        lambda: proc.stdout.read(_STREAM_CHUNK_CHARS), ""
+                    )
+                    if credential is not None and self.credentials is not None:
+                        chunks = strip_include_head(
+                            chunks,
+                            partial(self.credentials.record, credential.name),
+                        )
+                    for item in iter_json_array_items(chunks):
+                        yielded = True
+                        yield item
+                except ValueError:
+                    if proc.wait() == 0:
+                        raise
+                finally:
+                    timed_out = watchdog is not None and not watchdog.is_alive()
+                    if watchdog is not None:
+                        watchdog.cancel()
+                    proc.stdout.close()
+                    if proc.poll() is None:
+                        proc.kill()
+                    proc.wait()
+
+                if proc.returncode == 0 and not timed_out:
+                    return
+
+                stderr_file.seek(0)
+                stderr = stderr_file.read()
+                if timed_out:
+                    stderr = f"gh api timed out after {self.timeout_seconds}s\n{stderr}"
+                retry = self._should_retry("GET", stderr) and not yielded
+                if retry and attempt < self.max_retries:
+                    self.sleep(self._backoff_delay(attempt))
+                    continue
+
+                raise GhApiError(stderr.strip() or f"command failed: {' '.join(args)}")
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return backoff_delay(self.backoff_seconds, attempt)
+
+    _should_retry = staticmethod(should_retry)
+    _request_target = staticmethod(request_target)
+
+    def _credential_args(
+        self, args: list[str]
+    ) -> tuple[list[str], dict[str, str] | None, Credential | None]:
+        """Arguments and environment for running `args` under the pool.
+
+        With a credential pool, `--include` is added so the response's
+        rate-limit headers can be fed back by `_record_headers`.
+        """
+        if self.credentials is None:
+            return args, None, None
+        credential = self.credentials.select(self._request_target(args))
+        run_args = args if "--include" in args else [*args, "--include"]
+        return run_args, {**os.environ, "GH_TOKEN": credential.token}, credential
+
+    def _record_headers(
+        self,
+        args: list[str],
+        run_args: list[str],
+        proc: subprocess.CompletedProcess[str],
+        credential: Credential | None,
+    ) -> subprocess.CompletedProcess[str]:
+        """Feed a finished call's headers to the pool; strip any head we added."""
+        if credential is None or self.credentials is None:
+            return proc
+        _, headers, body = parse_include_output(proc.stdout)
+        self.credentials.record(credential.name, headers)
+        if run_args is args:
+            return proc
+        return subprocess.CompletedProcess(args, proc.returncode, body, proc.stderr)
+
+    def _execute(
+        self, args: list[str], stdin_json: dict[str, Any] | None
+    ) -> subprocess.CompletedProcess[str]:
+        """Run one gh attempt, converting a per-attempt timeout into a failure.
+
+        With a credential pool the call runs under the selected token and
+        its rate-limit headers are fed back into the pool.
+        """
+        run_args, env, credential = self._credential_args(args)
+        try:
             proc = subprocess.run(
-                args,
+                run_args,
                 input=json.dumps(stdin_json) if stdin_json else None,
                 text=True,
                 capture_output=True,
                 check=False,
+                timeout=self.timeout_seconds,
+                env=env,
             )
+        except subprocess.TimeoutExpired:
+            return subprocess.CompletedProcess(
+                args, -9, "", f"gh api timed out after {self.timeout_seconds}s"
+            )
+        return self._record_headers(args, run_args, proc, credential)
+
+    def _hedge_after(self) -> float | None:
+        """p95 of recent successful GET latencies, once enough samples exist."""
+        if len(self._latencies) < _MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def _execute_hedged(
+        self, args: list[str], hedge_after: float
+    ) -> subprocess.CompletedProcess[str]:
+        """Start a second identical GET if the first exceeds `hedge_after`.
+
+        The first attempt to finish wins; the other process is killed and
+        reaped. Each attempt selects its own credential like `_execute`.
+        """
+        results: queue.Queue[subprocess.CompletedProcess[str]] = queue.Queue()
+        procs: list[subprocess.Popen[str]] = []
+        procs_lock = threading.Lock()
+        settled = threading.Event()
+
+        def attempt() -> None:
+            run_args, env, credential = self._credential_args(args)
+            with procs_lock:
+                if settled.is_set():
+                    return
+                proc = subprocess.Popen(
+                    run_args,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    env=env,
+                )
+                procs.append(proc)
+            try:
+                out, err = proc.communicate(timeout=self.timeout_seconds)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                out, _ = proc.communicate()
+                err = f"gh api timed out after {self.timeout_seconds}s"
+            completed = subprocess.CompletedProcess(run_args, proc.returncode, out, err)
+            if not settled.is_set():
+                completed = self._record_headers(args, run_args, completed, credential)
+            results.put(completed)
+
+        threading.Thread(target=attempt, daemon=True).start()
+        try:
+            try:
+                return results.get(timeout=hedge_after)
+            except queue.Empty:
+                threading.Thread(target=attempt, daemon=True).start()
+                return results.get()
+        finally:
+            with procs_lock:
+                settled.set()
+                losers = list(procs)
+            for proc in losers:
+                if proc.poll() is None:
+                    proc.kill()
+                proc.wait()
+
+    def _run_process(
+        self, args: list[str], *, stdin_json: dict[str, Any] | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        """Run gh with per-attempt timeouts and jittered retries.
+
+        Rate limits are always retried; 5xx, timeouts and connection errors
+        are retried unless the request is a POST. Returns the last process.
+        """
+        method = args[3] if len(args) > 3 else "GET"
+        for attempt in range(self.max_retries + 1):
+            hedge_after = None
+            if self.hedge_reads and method == "GET" and stdin_json is None:
+                hedge_after = self._hedge_after()
+            started = time.monotonic()
+            if hedge_after is not None:
+                proc = self._execute_hedged(args, hedge_after)
+            else:
+                proc = self._execute(args, stdin_json)
             if proc.returncode == 0:
-                out = proc.stdout.strip()
-                return json.loads(out) if out else {}
+                if method == "GET":
+                    self._latencies.append(time.monotonic() - started)
+                return proc
 
-            stderr = proc.stderr.lower()
-            rate_limited = "rate limit" in stderr or "secondary rate limit" in stderr
-            if rate_limited and attempt < self.max_retries:
-                time.sleep(self.backoff_seconds * (2**attempt))
+            if self._should_retry(method, proc.stderr) and attempt < self.max_retries:
+                self.sleep(self._backoff_delay(attempt))
                 continue
-
-            raise GhApiError(proc.stderr.strip() or proc.stdout.strip() or f"command failed: {' '.join(args)}")
+            return proc
 
         raise GhApiError("unreachable")
+
+    def _run_json(self, args: list[str], *, stdin_json: dict[str, Any] | None = None) -> Any:
+        if self.dry_run and any(flag in args for flag in ["POST", "PATCH", "PUT", "DELETE"]):
+            return {"dry_run": True, "args": args, "body": stdin_json}
+
+        proc = self._run_process(args, stdin_json=stdin_json)
+        if proc.returncode == 0:
+            out = proc.stdout.strip()
+            return json.loads(out) if out else {}
+
+        message = proc.stderr.strip() or proc.stdout.strip() or f"command failed: {' '.join(args)}"
+        if is_transient_failure(proc.stderr):
+            raise GhTransientError(message)
+        raise GhApiError(message)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from gh_issue_workflow.stages import KNOWN_STAGE_LABELS, Issue, parse_timestamp
+from gh_issue_workflow.state import StateStore, per_key_namespace
+
+FLOW_METRICS_NAMESPACE = per_key_namespace("flow_metrics")
+
+# Histogram buckets grow by 2**(1/4) (~19%), so percentiles are accurate to
+# within one bucket while a stage never holds more than ~130 of them.
+_BUCKETS_PER_DOUBLING = 4
+
+# Issues whose events are refetched per listing because their stage moved; the
+# rest wait for the next tick, so a first run on a big repo stays cheap.
+STAGE_CHANGE_FETCHES_PER_TICK = 20
+
+
+def _bucket(seconds: float) -> int:
+    if seconds < 1:
+        return 0
+    return int(math.log2(seconds) * _BUCKETS_PER_DOUBLING) + 1
+
+
+def _bucket_value(bucket: int) -> float:
+    if bucket == 0:
+        return 0.0
+    return 2 ** ((bucket - 0.5) / _BUCKETS_PER_DOUBLING)
+
+
+class _RepoFlow:
+    """Per-repo fold state: open stage intervals plus per-stage aggregates."""
+
+    def __init__(self, saved: dict[str, Any] | None) -> None:
+        saved = saved or {}
+        # issue number -> {"last_event_id": int, "open": {label: entered_ts}}
+        self.issues: dict[str, dict[str, Any]] = saved.get("issues", {})
+        # label -> {"count", "sum", "buckets": {bucket: n}}
+        self.stages: dict[str, dict[str, Any]] = saved.get("stages", {})
+        self.in_stage: dict[str, int] = {}
+        self.heaps: dict[str, list[tuple[float, int]]] = {}
+        for number, issue in self.issues.items():
+            for label, entered in issue["open"].items():
+                self.in_stage[label] = self.in_stage.get(label, 0) + 1
+                self.heaps.setdefault(label, []).append((entered, int(number)))
+        for heap in self.heaps.values():
+            heapq.heapify(heap)
+        self.dirty = False
+
+    def enter(self, number: str, label: str, ts: float) -> None:
+        open_intervals = self.issues[number]["open"]
+        if label in open_intervals:
+            return
+        open_intervals[label] = ts
+        self.in_stage[label] = self.in_stage.get(label, 0) + 1
+        heap = self.heaps.setdefault(label, [])
+        heapq.heappush(heap, (ts, int(number)))
+        if len(heap) > 2 * self.in_stage[label] + 16:
+            self._compact(label)
+
+    def _compact(self, label: str) -> None:
+        heap = [
+            (issue["open"][label], int(number))
+            for number, issue in self.issues.items()
+            if label in issue["open"]
+        ]
+        heapq.heapify(heap)
+        self.heaps[label] = heap
+
+    def leave(self, number: str, label: str, ts: float, *, completed: bool = True) -> None:
+        entered = self.issues[number]["open"].pop(label, None)
+        if entered is None:
+            return
+        self.in_stage[label] -= 1
+        if not completed:
+            return
+        seconds = max(0.0, ts - entered)
+        stats = self.stages.setdefault(label, {"count": 0, "sum": 0.0, "buckets": {}})
+        stats["count"] += 1
+        stats["sum"] += seconds
+        key = str(_bucket(seconds))
+        stats["buckets"][key] = stats["buckets"].get(key, 0) + 1
+
+    def oldest(self, label: str) -> tuple[float, int] | None:
+        """Oldest current occupant; stale heap entries are dropped lazily."""
+        heap = self.heaps.get(label, [])
+        while heap:
+            entered, number = heap[0]
+            issue = self.issues.get(str(number))
+            if issue is not None and issue["open"].get(label) == entered:
+                return entered, number
+            heapq.heappop(heap)
+        return None
+
+    def to_json(self) -> dict[str, Any]:
+        return {"issues": self.issues, "stages": self.stages}
+
+
+def _percentile(stats: dict[str, Any], fraction: float) -> float:
+    rank = max(1, math.ceil(stats["count"] * fraction))
+    seen = 0
+    for bucket in sorted(stats["buckets"], key=int):
+        seen += stats["buckets"][bucket]
+        if seen >= rank:
+            return round(_bucket_value(int(bucket)), 1)
+    return 0.0
+
+
+class FlowMetrics:
+    """Time-in-stage metrics folded incrementally from issue label events.
+
+    `observe` consumes an issue's events (fetched for the ready authorization
+    check, or because `stage_changed` reported the issue) and only folds
+    events newer than the last one seen for that issue. Completed intervals feed per-stage count/sum/histogram
+    aggregates; open intervals feed an `oldest` lookup backed by a lazily
+    pruned heap. State is persisted per repo on `flush`.
+    """
+
+    def __init__(
+        self,
+        store: StateStore | None = None,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store if store is not None else StateStore()
+        self.clock = clock
+        self._repos: dict[str, _RepoFlow] = {}
+        self._lock = threading.Lock()
+
+    def _repo(self, repo: str) -> _RepoFlow:
+        flow = self._repos.get(repo)
+        if flow is None:
+            flow = self._repos[repo] = _RepoFlow(
+                self.store.get(FLOW_METRICS_NAMESPACE, repo)
+            )
+        return flow
+
+    def observe(self, repo: str, issue_number: int, events: Iterable[Any]) -> None:
+        with self._lock:
+            flow = self._repo(repo)
+            key = str(issue_number)
+            issue = flow.issues.setdefault(key, {"last_event_id": 0, "open": {}})
+            last_id = int(issue["last_event_id"])
+            for event in events:
+                if not isinstance(event, dict):
+                    continue
+                event_id = event.get("id")
+                created_at = event.get("created_at")
+                kind = event.get("event")
+                if not isinstance(event_id, int) or event_id <= last_id:
+                    continue
+                if not isinstance(created_at, str) or kind not in {"labeled", "unlabeled"}:
+                    continue
+                label = (event.get("label") or {}).get("name")
+                if label not in KNOWN_STAGE_LABELS:
+                    continue
+                ts = float(parse_timestamp(created_at))
+                if kind == "labeled":
+                    flow.enter(key, label, ts)
+                else:
+                    flow.leave(key, label, ts)
+                issue["last_event_id"] = last_id = event_id
+                flow.dirty = True
+            if not issue["open"] and not issue["last_event_id"]:
+                del flow.issues[key]
+
+    def stage_changed(
+        self,
+        repo: str,
+        issues: Iterable[Issue],
+        *,
+        limit: int = STAGE_CHANGE_FETCHES_PER_TICK,
+    ) -> list[int]:
+        """Listed issues whose stage labels differ from the intervals being timed.
+
+        Folding their events closes the old stage's interval and opens the new
+        one; without it only stages seen through the ready check are measured.
+        """
+        with self._lock:
+            flow = self._repo(repo)
+            changed: list[int] = []
+            for issue in issues:
+                listed = {label for label in issue.labels if label in KNOWN_STAGE_LABELS}
+                timed = flow.issues.get(str(issue.number), {}).get("open", {})
+                if listed != set(timed):
+                    changed.append(issue.number)
+                    if len(changed) >= limit:
+                        break
+            return changed
+
+    def retain(self, repo: str, open_numbers: Iterable[int]) -> None:
+        """Drop issues that are no longer open; their open intervals are discarded."""
+        with self._lock:
+            flow = self._repo(repo)
+            keep = {str(number) for number in open_numbers}
+            for key in [key for key in flow.issues if key not in keep]:
+                for label in list(flow.issues[key]["open"]):
+                    flow.leave(key, label, 0.0, completed=False)
+                del flow.issues[key]
+                flow.dirty = True
+
+    def flush(self, repo: str) -> None:
+        with self._lock:
+            flow = self._repos.get(repo)
+            if flow is not None and flow.dirty:
+                self.store.put(FLOW_METRICS_NAMESPACE, repo, flow.to_json())
+                flow.dirty = False
+
+    def snapshot(self, repo: str) -> dict[str, dict[str, Any]]:
+        """Per-stage aggregates; only stages with any data are included."""
+        with self._lock:
+            flow = self._repo(repo)
+            now = self.clock()
+            out: dict[str, dict[str, Any]] = {}
+            for label in sorted(set(flow.stages) | set(flow.heaps)):
+                stats = flow.stages.get(label)
+                entry: dict[str, Any] = {"in_stage": flow.in_stage.get(label, 0)}
+                if stats and stats["count"]:
+                    entry["completed"] = stats["count"]
+                    entry["mean_seconds"] = round(stats["sum"] / stats["count"], 1)
+                    entry["p50_seconds"] = _percentile(stats, 0.5)
+                    entry["p90_seconds"] = _percentile(stats, 0.9)
+                oldest = flow.oldest(label)
+                if oldest is not None:
+                    entry["oldest_issue"] = oldest[1]
+                    entry["oldest_seconds"] = round(max(0.0, now - oldest[0]), 1)
+                if len(entry) > 1 or entry["in_stage"]:
+                    out[label] = entry
+            return out
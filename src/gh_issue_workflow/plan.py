@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
+from gh_issue_workflow.bulk import DEFAULT_CONCURRENCY, WriteThrottle
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.gh_client import (
+    GhClient,
+    RequestKey,
+    listed_issue_reads,
+    request_key,
+)
+from gh_issue_workflow.resilience import CircuitBreaker
+from gh_issue_workflow.stages import stage_from_labels
+from gh_issue_workflow.state import StateOverlay, StateStore, commit_changes
+from gh_issue_workflow.workflow import TRACKED_ALERT_URL_RE, Workflow, status_labels
+
+# Version 2 records label transitions; older plans replayed raw label lists.
+PLAN_VERSION = 2
+
+_ISSUE_CREATE_RE = re.compile(r"^repos/[^/]+/[^/]+/issues$")
+_ISSUE_RE = re.compile(r"^repos/[^/]+/[^/]+/issues/\d+$")
+_ALERT_RE = re.compile(r"^repos/[^/]+/[^/]+/code-scanning/alerts/\d+$")
+
+
+def _label_names(labels: Iterable[Any]) -> list[str]:
+    names = [label.get("name") if isinstance(label, dict) else label for label in labels]
+    return [name for name in names if isinstance(name, str)]
+
+
+def _stage(labels: Iterable[Any]) -> str | None:
+    stage = stage_from_labels(_label_names(labels))
+    return stage.value if stage is not None else None
+
+
+@dataclass(frozen=True)
+class PlannedWrite:
+    """One mutating API call, replayable by `apply_plan`.
+
+    `fields` are form fields (`gh api -f`), `body` a JSON request body.
+    Issue label PATCHes carry their stage `transition` ({"from", "to"});
+    apply recomputes the labels from the issue as it is then.
+    """
+
+    kind: str
+    method: str
+    path: str
+    fields: dict[str, Any] | None = None
+    body: dict[str, Any] | None = None
+    alert_url: str | None = None
+    transition: dict[str, str | None] | None = None
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> PlannedWrite:
+        return cls(
+            kind=str(data["kind"]),
+            method=str(data["method"]),
+            path=str(data["path"]),
+            fields=data.get("fields"),
+            body=data.get("body"),
+            alert_url=data.get("alert_url"),
+            transition=data.get("transition"),
+        )
+
+
+def _write_kind(method: str, path: str) -> str:
+    parts = path.split("/")
+    if "labels" in parts:
+        return "label"
+    if "code-scanning" in parts or _ISSUE_CREATE_RE.match(path):
+        return "alert"
+    if parts[-1] == "comments":
+        return "comment"
+    return "issue"
+
+
+class RecordingClient:
+    """Client wrapper that performs reads and records writes instead.
+
+    Optional features (`api_iter`, `api_conditional`, ...) are forwarded to
+    the wrapped client, so the workflow behaves exactly as in a live tick.
+    `tick_scope` memoizes into the recorder rather than the shared client, so
+    each repo's reads are dropped as soon as that repo is planned. Alerts
+    read back with their recorded PATCHes applied, so an alert linked from
+    two closed issues is dismissed once, as in a live tick.
+    """
+
+    def __init__(self, client: GhClient) -> None:
+        self.client = client
+        self.writes: list[PlannedWrite] = []
+        self._lock = threading.Lock()
+        self._memo: dict[RequestKey, Any] | None = None
+        self._scope_depth = 0
+        self._patched_alerts: dict[str, dict[str, Any]] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    @contextmanager
+    def tick_scope(self) -> Iterator[None]:
+        with self._lock:
+            if self._scope_depth == 0:
+                self._memo = {}
+            self._scope_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._scope_depth -= 1
+                if self._scope_depth == 0:
+                    self._memo = None
+
+    def _get(
+        self,
+        path: str,
+        fields: dict[str, Any] | None,
+        project: Callable[[Any], Any] | None = None,
+    ) -> Any:
+        key = request_key(path, fields)
+        with self._lock:
+            patched = self._patched_alerts.get(path) if not fields else None
+            if self._memo is not None and key in self._memo:
+                result = self._memo[key]
+                return {**result, **patched} if patched is not None else result
+        result = self.client.api("GET", path, fields=fields)
+        if patched is not None and isinstance(result, dict):
+            return {**result, **patched}
+        if project is not None and isinstance(result, list):
+            result = [project(row) for row in result]
+        with self._lock:
+            if self._memo is not None:
+                self._memo[key] = result
+                self._memo.update(listed_issue_reads(key, result))
+        return result
+
+    def _record(
+        self,
+        method: str,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        body: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        alert_url = None
+        if method == "POST" and _ISSUE_CREATE_RE.match(path) and body is not None:
+            found = TRACKED_ALERT_URL_RE.search(str(body.get("body") or ""))
+            alert_url = found.group(0) if found else None
+        transition = None
+        if method == "PATCH" and _ISSUE_RE.match(path) and body and "labels" in body:
+            # Listings seed the issue GET, so this is normally not a request.
+            issue = self._get(path, None)
+            transition = {
+                "from": _stage(issue.get("labels", []) if isinstance(issue, dict) else []),
+                "to": _stage(body["labels"]),
+            }
+        if method == "PATCH" and _ALERT_RE.match(path) and body:
+            with self._lock:
+                self._patched_alerts[path] = {**self._patched_alerts.get(path, {}), **body}
+        self.writes.append(
+            PlannedWrite(
+                kind=_write_kind(method, path),
+                method=method,
+                path=path,
+                fields=dict(fields) if fields else None,
+                body=body,
+                alert_url=alert_url,
+                transition=transition,
+            )
+        )
+        return {}
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if method == "GET":
+            return self._get(path, fields)
+        return self._record(method, path, fields=fields)
+
+    def api_projected(
+        self,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        project: Callable[[Any], Any],
+    ) -> Any:
+        return self._get(path, fields, project)
+
+    def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
+        return self._record("PATCH", path, body=body)
+
+    def api_post_json(self, path: str, body: dict[str, Any]) -> Any:
+        return self._record("POST", path, body=body)
+
+
+def merge_writes(writes: Iterable[PlannedWrite]) -> list[PlannedWrite]:
+    """Drop duplicate creates/comments and fold repeated PATCHes of one resource.
+
+    A later PATCH to the same path is merged over the earlier one (label
+    PATCHes replace the whole list, so the last one wins) and takes the
+    later position, keeping every write after its prerequisites.
+    """
+    merged: list[PlannedWrite | None] = []
+    seen: set[str] = set()
+    last_patch: dict[str, int] = {}
+    for write in writes:
+        if write.method != "PATCH":
+            key = repr((write.method, write.path, write.fields, write.body))
+            if key in seen:
+                continue
+            seen.add(key)
+        elif write.path in last_patch:
+            previous = merged[last_patch[write.path]]
+            merged[last_patch[write.path]] = None
+            if previous is not None:
+                transition = write.transition
+                if previous.transition is not None and transition is not None:
+                    transition = {"from": previous.transition["from"], "to": transition["to"]}
+                write = PlannedWrite(
+                    kind=write.kind,
+                    method="PATCH",
+                    path=write.path,
+                    fields={**(previous.fields or {}), **(write.fields or {})} or None,
+                    body={**(previous.body or {}), **(write.body or {})} or None,
+                    transition=transition,
+                )
+        if write.method == "PATCH":
+            last_patch[write.path] = len(merged)
+        merged.append(write)
+    return [write for write in merged if write is not None]
+
+
+@dataclass
+class RepoPlan:
+    repo: str
+    preview: dict[str, Any]
+    writes: list[PlannedWrite] = field(default_factory=list)
+    state: list[dict[str, Any]] = field(default_factory=list)
+
+
+def plan_repo(
+    client: GhClient,
+    store: StateStore,
+    repo_cfg: RepoConfig,
+    *,
+    server_side_pick: bool = False,
+    deadline: float | None = None,
+) -> RepoPlan:
+    """Run one tick against a recording client and a buffered state view.
+
+    Nothing is written to GitHub or to `store`; the writes and the state
+    changes the tick would have made are returned instead.
+    """
+    recorder = RecordingClient(client)
+    overlay = StateOverlay(store)
+    workflow = Workflow(
+        recorder,  # type: ignore[arg-type]
+        server_side_pick=server_side_pick,
+        state=overlay,
+        breaker=CircuitBreaker(store=overlay),
+    )
+    preview = workflow.run_tick(repo_cfg, deadline=deadline)
+    return RepoPlan(
+        repo=repo_cfg.name,
+        preview=preview,
+        writes=merge_writes(recorder.writes),
+        state=overlay.changes(),
+    )
+
+
+def build_plan(
+    client: GhClient,
+    store: StateStore,
+    repos: Iterable[RepoConfig],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    server_side_pick: bool = False,
+    deadline: float | None = None,
+) -> dict[str, Any]:
+    """Plan every repo concurrently and return a JSON-serializable plan."""
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        plans = list(
+            pool.map(
+                lambda repo: plan_repo(
+                    client,
+                    store,
+                    repo,
+                    server_side_pick=server_side_pick,
+                    deadline=deadline,
+                ),
+                list(repos),
+            )
+        )
+    return {
+        "version": PLAN_VERSION,
+        "created_at": time.time(),
+        "repos": [
+            {
+                "repo": plan.repo,
+                "preview": plan.preview,
+                "writes": [asdict(write) for write in plan.writes],
+                "state": plan.state,
+            }
+            for plan in plans
+        ],
+    }
+
+
+def _apply_write(workflow: Workflow, repo: str, write: PlannedWrite) -> bool:
+    """Perform one write; False when its transition no longer applies."""
+    client = workflow.client
+    if write.transition is not None and write.body is not None:
+        issue = client.api("GET", write.path)
+        labels = _label_names(issue.get("labels", []) if isinstance(issue, dict) else [])
+        if _stage(labels) != write.transition["from"]:
+            return False
+        client.api_patch_json(
+            write.path,
+            {**write.body, "labels": status_labels(labels, write.transition["to"])},
+        )
+    elif write.method == "POST" and write.alert_url and write.body is not None:
+        # Same idempotency guard as a live tick: never duplicate alert issues.
+        workflow.create_alert_issue(repo, write.body, write.alert_url)
+    elif write.body is not None and write.method == "PATCH":
+        client.api_patch_json(write.path, write.body)
+    elif write.body is not None and write.method == "POST":
+        client.api_post_json(write.path, write.body)
+    else:
+        client.api(write.method, write.path, fields=write.fields)
+    return True
+
+
+def apply_plan(
+    workflow: Workflow,
+    plan: dict[str, Any],
+    *,
+    store: StateStore,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    throttle: WriteThrottle | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Execute a plan and yield one result per repo.
+
+    Repos run concurrently; writes within a repo keep plan order and are
+    paced by `throttle`. A stage transition is skipped (counted under
+    `skipped`) when the issue has left the stage it was planned from. A
+    repo's recorded state changes are committed only after all of its writes
+    succeeded, so a failed repo is simply planned again on the next run.
+    """
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"unsupported plan version: {plan.get('version')!r}")
+
+    def apply_repo(entry: dict[str, Any]) -> dict[str, Any]:
+        repo = str(entry["repo"])
+        writes = merge_writes(PlannedWrite.from_json(w) for w in entry.get("writes", []))
+        applied = 0
+        skipped = 0
+        try:
+            for write in writes:
+                if throttle is not None:
+                    throttle.wait()
+                if _apply_write(workflow, repo, write):
+                    applied += 1
+                else:
+                    skipped += 1
+        except Exception as error:
+            return {
+                "event": "apply",
+                "repo": repo,
+                "ok": False,
+                "applied": applied,
+                "skipped": skipped,
+                "planned": len(writes),
+                "error": str(error) or type(error).__name__,
+            }
+        return {
+            "event": "apply",
+            "repo": repo,
+            "ok": True,
+            "applied": applied,
+            "skipped": skipped,
+            "planned": len(writes),
+        }
+
+    entries = list(plan.get("repos", []))
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        # State is committed from this thread only; StateStore is not thread-safe.
+        for entry, result in zip(entries, pool.map(apply_repo, entries)):
+            if result["ok"]:
+                commit_changes(store, entry.get("state", []))
+            yield result
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from gh_issue_workflow.state import StateStore
+
+CIRCUITS_NAMESPACE = "circuits"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN_SECONDS = 900.0
+
+
+@dataclass
+class _BreakerState:
+    failures: int = 0
+    opened_at: float | None = None
+
+
+class CircuitBreaker:
+    """Per-key circuit breaker (key = repo + tick phase).
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    `allow` refuses calls for `cooldown_seconds`; then one trial call is let
+    through (half-open). A success closes the circuit and forgets the key,
+    so only currently failing keys are kept. With a `store`, state survives
+    across cron-launched processes (timestamps then use wall-clock time).
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.time,
+        store: StateStore | None = None,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self.store = store
+        self._states: dict[str, _BreakerState] = {}
+
+    def _load(self, key: str) -> _BreakerState | None:
+        state = self._states.get(key)
+        if state is None and self.store is not None:
+            saved = self.store.get(CIRCUITS_NAMESPACE, key)
+            if isinstance(saved, dict):
+                state = _BreakerState(
+                    failures=int(saved.get("failures", 0)),
+                    opened_at=saved.get("opened_at"),
+                )
+                self._states[key] = state
+        return state
+
+    def _save(self, key: str, state: _BreakerState | None) -> None:
+        if self.store is None:
+            return
+        if state is None:
+            self.store.delete(CIRCUITS_NAMESPACE, key)
+        else:
+            self.store.put(
+                CIRCUITS_NAMESPACE,
+                key,
+                {"failures": state.failures, "opened_at": state.opened_at},
+            )
+
+    def allow(self, key: str) -> bool:
+        state = self._load(key)
+        if state is None or state.opened_at is None:
+            return True
+        if self.clock() - state.opened_at >= self.cooldown_seconds:
+            # Half-open: allow a trial; a failure re-opens immediately.
+            state.opened_at = None
+            state.failures = self.failure_threshold - 1
+            self._save(key, state)
+            return True
+        return False
+
+    def record_success(self, key: str) -> None:
+        if self._load(key) is not None:
+            del self._states[key]
+            self._save(key, None)
+
+    def record_failure(self, key: str) -> None:
+        state = self._load(key)
+        if state is None:
+            state = self._states[key] = _BreakerState()
+        state.failures += 1
+        if state.failures >= self.failure_threshold:
+            state.opened_at = self.clock()
+        self._save(key, state)
+
+    def is_open(self, key: str) -> bool:
+        """True while `key` is refusing calls; unlike `allow`, never half-opens."""
+        state = self._load(key)
+        return (
+            state is not None
+            and state.opened_at is not None
+            and self.clock() - state.opened_at < self.cooldown_seconds
+        )
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from urllib.parse import quote
+
+from gh_issue_workflow.config import RepoConfig
+
+DEFAULT_LEASE_SECONDS = 900.0
+# 1.5 cron intervals (10 minutes): running workers heartbeat between repos, so
+# a worker that misses one scheduled run drops out of the ring.
+DEFAULT_HEARTBEAT_TTL_SECONDS = 900.0
+
+
+def _hash(value: str) -> int:
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HashRing:
+    """Consistent hash ring; adding/removing a worker only moves its own share."""
+
+    def __init__(self, nodes: Iterable[str], *, replicas: int = 64) -> None:
+        points = sorted(
+            (_hash(f"{node}#{replica}"), node)
+            for node in set(nodes)
+            for replica in range(replicas)
+        )
+        self._keys = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def owner(self, key: str) -> str | None:
+        if not self._keys:
+            return None
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._nodes[index]
+
+
+class LeaseStore:
+    """SQLite-backed worker registry and time-bounded repo leases.
+
+    The database may live on shared storage; every mutation runs inside a
+    `BEGIN IMMEDIATE` transaction so two workers can never hold one repo.
+    """
+
+    def __init__(self, path: Path, *, clock: Callable[[], float] = time.time) -> None:
+        self.clock = clock
+        self._conn = sqlite3.connect(str(path), timeout=30.0, isolation_level=None)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS workers ("
+            " worker_id TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS leases ("
+            " repo TEXT PRIMARY KEY, worker_id TEXT NOT NULL, expires_at REAL NOT NULL);"
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def heartbeat(self, worker_id: str) -> None:
+        self._conn.execute(
+            "INSERT INTO workers (worker_id, heartbeat_at) VALUES (?, ?)"
+            " ON CONFLICT(worker_id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+            (worker_id, self.clock()),
+        )
+
+    def live_workers(self, ttl_seconds: float) -> list[str]:
+        rows = self._conn.execute(
+            "SELECT worker_id FROM workers WHERE heartbeat_at >= ? ORDER BY worker_id",
+            (self.clock() - ttl_seconds,),
+        )
+        return [str(row[0]) for row in rows]
+
+    def try_acquire(self, repo: str, worker_id: str, ttl_seconds: float) -> bool:
+        now = self.clock()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                "SELECT worker_id, expires_at FROM leases WHERE repo = ?", (repo,)
+            ).fetchone()
+            if row is not None and row[0] != worker_id and float(row[1]) > now:
+                self._conn.execute("ROLLBACK")
+                return False
+            self._conn.execute(
+                "INSERT INTO leases (repo, worker_id, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(repo) DO UPDATE SET"
+                " worker_id = excluded.worker_id, expires_at = excluded.expires_at",
+                (repo, worker_id, now + ttl_seconds),
+            )
+            self._conn.execute("COMMIT")
+            return True
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def release(self, repo: str, worker_id: str) -> None:
+        self._conn.execute(
+            "DELETE FROM leases WHERE repo = ? AND worker_id = ?", (repo, worker_id)
+        )
+
+
+def worker_state_dir(state_dir: Path, worker_id: str) -> Path:
+    """Per-worker subdirectory of a `--state-dir` that sharded workers share.
+
+    Each worker keeps its own tick lock and state files there, so workers
+    neither wait on one another's lock nor overwrite one another's state.
+    """
+    return state_dir / "workers" / quote(worker_id, safe="")
+
+
+def owned_repos(
+    store: LeaseStore,
+    worker_id: str,
+    repos: Iterable[RepoConfig],
+    *,
+    heartbeat_ttl_seconds: float = DEFAULT_HEARTBEAT_TTL_SECONDS,
+) -> list[RepoConfig]:
+    """Heartbeat, then return the repos the ring assigns to `worker_id`.
+
+    The ring is rebuilt from live heartbeats on every call, so shares
+    rebalance automatically as workers join or stop heartbeating.
+    """
+    store.heartbeat(worker_id)
+    ring = HashRing(store.live_workers(heartbeat_ttl_seconds))
+    return [repo for repo in repos if ring.owner(repo.name) == worker_id]
+
+
+def iter_leased_repos(
+    store: LeaseStore,
+    worker_id: str,
+    repos: Iterable[RepoConfig],
+    *,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    heartbeat_ttl_seconds: float = DEFAULT_HEARTBEAT_TTL_SECONDS,
+) -> Iterator[RepoConfig]:
+    """Yield this worker's repos one at a time while holding each repo's lease.
+
+    Repos still leased by another worker (e.g. right after a rebalance) are
+    skipped; a crashed worker's leases simply expire after `lease_seconds`.
+    The worker heartbeats before each repo, so a long run stays on the ring.
+    """
+    for index, repo in enumerate(
+        owned_repos(store, worker_id, repos, heartbeat_ttl_seconds=heartbeat_ttl_seconds)
+    ):
+        if index:
+            store.heartbeat(worker_id)
+        if not store.try_acquire(repo.name, worker_id, lease_seconds):
+            continue
+        try:
+            yield repo
+        finally:
+            store.release(repo.name, worker_id)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import Iterable
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterable, Mapping
 
 STAGE_LABEL_PREFIX = "stage:"
 
@@ -24,6 +27,94 @@ KNOWN_STAGE_LABELS = {
 }
 
 
+class Stage(Enum):
+    """Known stage labels; the value is the GitHub label name."""
+
+    BACKLOG = STAGE_BACKLOG
+    QUEUED = STAGE_QUEUED
+    NEEDS_CLARIFICATION = STAGE_NEEDS_CLARIFICATION
+    READY_TO_IMPLEMENT = STAGE_READY_TO_IMPLEMENT
+    IN_PROGRESS = STAGE_IN_PROGRESS
+    IN_REVIEW = STAGE_IN_REVIEW
+    BLOCKED = STAGE_BLOCKED
+
+
+# Stages eligible for picking, highest priority first.
+PICK_PRIORITY: tuple[Stage, ...] = (
+    Stage.IN_PROGRESS,
+    Stage.QUEUED,
+    Stage.READY_TO_IMPLEMENT,
+)
+_PICKABLE_STAGES = frozenset(PICK_PRIORITY)
+
+# When an issue carries several stage labels, the first match here wins. The
+# head of the tuple mirrors the pick priority so bucketing stays unchanged.
+_STAGE_PRECEDENCE: tuple[Stage, ...] = (
+    Stage.IN_PROGRESS,
+    Stage.QUEUED,
+    Stage.READY_TO_IMPLEMENT,
+    Stage.NEEDS_CLARIFICATION,
+    Stage.IN_REVIEW,
+    Stage.BLOCKED,
+    Stage.BACKLOG,
+)
+
+
+def parse_timestamp(value: str) -> int:
+    """Parse a GitHub ISO-8601 timestamp into epoch seconds."""
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+_STAGE_RANK: dict[str, tuple[int, Stage]] = {
+    stage.value: (rank, stage) for rank, stage in enumerate(_STAGE_PRECEDENCE)
+}
+
+
+def stage_from_labels(labels: Iterable[str]) -> Stage | None:
+    best: tuple[int, Stage] | None = None
+    for label in labels:
+        ranked = _STAGE_RANK.get(label)
+        if ranked is not None and (best is None or ranked[0] < best[0]):
+            best = ranked
+    return best[1] if best is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class Issue:
+    """Compact open-issue record used by picking and transitions."""
+
+    number: int
+    created_ts: int
+    labels: tuple[str, ...]
+    stage: Stage | None
+
+    @classmethod
+    def from_api(cls, row: Mapping[str, Any]) -> Issue | None:
+        """Build from a REST issue row (or a test dict with plain label names).
+
+        Returns None for pull requests and rows missing number/created_at.
+        """
+        if row.get("pull_request"):
+            return None
+        number = row.get("number")
+        created_at = row.get("created_at")
+        if not isinstance(number, int) or not isinstance(created_at, str):
+            return None
+
+        names: list[str] = []
+        for label in row.get("labels", []) or []:
+            name = label.get("name") if isinstance(label, dict) else label
+            if isinstance(name, str):
+                names.append(sys.intern(name))
+        labels = tuple(names)
+        return cls(
+            number=number,
+            created_ts=parse_timestamp(created_at),
+            labels=labels,
+            stage=stage_from_labels(labels),
+        )
+
+
 @dataclass(frozen=True)
 class PickedIssue:
     number: int
@@ -42,46 +133,43 @@ def apply_stage_label(existing_labels: Iterable[str], new_stage_label: str) -> s
     return kept
 
 
+def _as_issues(issues: Iterable[Issue | Mapping[str, Any]]) -> Iterable[Issue]:
+    for issue in issues:
+        if isinstance(issue, Issue):
+            yield issue
+            continue
+        parsed = Issue.from_api(issue)
+        if parsed is not None:
+            yield parsed
+
+
 def pick_next_issue(
-    issues: list[dict[str, object]],
+    issues: Iterable[Issue | Mapping[str, Any]],
     *,
     authorized_ready_issue_numbers: set[int],
 ) -> PickedIssue | None:
-    """Pick next issue deterministically by priority + oldest creation time."""
-
-    def sorted_oldest(items: list[dict[str, object]]) -> list[dict[str, object]]:
-        return sorted(items, key=lambda i: str(i.get("created_at", "")))
-
-    in_progress = []
-    queued = []
-    ready = []
-
-    for issue in issues:
-        labels = set(issue.get("labels", []))
-        if STAGE_IN_PROGRESS in labels:
-            in_progress.append(issue)
-            continue
-        if STAGE_QUEUED in labels:
-            queued.append(issue)
+    """Pick next issue deterministically by priority + oldest creation time.
+
+    Single pass: keeps the oldest issue per priority bucket (first seen wins
+    on ties) instead of sorting whole buckets.
+    """
+    oldest: dict[Stage, Issue] = {}
+    for issue in _as_issues(issues):
+        stage = issue.stage
+        if stage not in _PICKABLE_STAGES:
             continue
         if (
-            STAGE_READY_TO_IMPLEMENT in labels
-            and int(issue["number"]) in authorized_ready_issue_numbers
+            stage is Stage.READY_TO_IMPLEMENT
+            and issue.number not in authorized_ready_issue_numbers
         ):
-            ready.append(issue)
-
-    if in_progress:
-        first = sorted_oldest(in_progress)[0]
-        return PickedIssue(
-            number=int(first["number"]), picked_from_stage=STAGE_IN_PROGRESS
-        )
-    if queued:
-        first = sorted_oldest(queued)[0]
-        return PickedIssue(number=int(first["number"]), picked_from_stage=STAGE_QUEUED)
-    if ready:
-        first = sorted_oldest(ready)[0]
-        return PickedIssue(
-            number=int(first["number"]), picked_from_stage=STAGE_READY_TO_IMPLEMENT
-        )
+            continue
+        current = oldest.get(stage)
+        if current is None or issue.created_ts < current.created_ts:
+            oldest[stage] = issue
+
+    for stage in PICK_PRIORITY:
+        first = oldest.get(stage)
+        if first is not None:
+            return PickedIssue(number=first.number, picked_from_stage=stage.value)
 
     return None
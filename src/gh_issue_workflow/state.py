@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+# Namespaces kept as one file per key: their values are large and written one
+# key at a time, so rewriting a shared file would cost every key's size per put.
+_PER_KEY_NAMESPACES: set[str] = set()
+
+
+def per_key_namespace(namespace: str) -> str:
+    """Store `namespace` as `<root>/<namespace>/<key>.json`; returns the name."""
+    _PER_KEY_NAMESPACES.add(namespace)
+    return namespace
+
+
+class StateStore:
+    """Small persisted key/value state, one JSON file per namespace.
+
+    With `root=None` the store is memory-only, so callers can always rely on
+    having a store and simply lose caching across processes.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root
+        self._namespaces: dict[str, dict[str, Any]] = {}
+        self._legacy_namespaces: dict[str, dict[str, Any]] = {}
+
+    def _load(self, namespace: str) -> dict[str, Any]:
+        data = self._namespaces.get(namespace)
+        if data is not None:
+            return data
+
+        data = {}
+        if self.root is not None:
+            path = self.root / f"{namespace}.json"
+            if path.exists():
+                loaded = json.loads(path.read_text(encoding="utf-8"))
+                if isinstance(loaded, dict):
+                    data = loaded
+        self._namespaces[namespace] = data
+        return data
+
+    def _load_key(self, namespace: str, key: str) -> Any | None:
+        data = self._namespaces.setdefault(namespace, {})
+        if key not in data:
+            path = self._key_path(namespace, key)
+            if path is not None and path.exists():
+                data[key] = json.loads(path.read_text(encoding="utf-8"))
+            else:
+                # Stores written before the namespace went per-key.
+                data[key] = self._legacy(namespace).get(key)
+        return data[key]
+
+    def _legacy(self, namespace: str) -> dict[str, Any]:
+        legacy = self._legacy_namespaces.get(namespace)
+        if legacy is None:
+            legacy = {}
+            path = None if self.root is None else self.root / f"{namespace}.json"
+            if path is not None and path.exists():
+                loaded = json.loads(path.read_text(encoding="utf-8"))
+                if isinstance(loaded, dict):
+                    legacy = loaded
+            self._legacy_namespaces[namespace] = legacy
+        return legacy
+
+    def _key_path(self, namespace: str, key: str) -> Path | None:
+        if self.root is None:
+            return None
+        return self.root / namespace / f"{quote(key, safe='')}.json"
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        if namespace in _PER_KEY_NAMESPACES:
+            return self._load_key(namespace, key)
+        return self._load(namespace).get(key)
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        if namespace in _PER_KEY_NAMESPACES:
+            self._namespaces.setdefault(namespace, {})[key] = value
+            path = self._key_path(namespace, key)
+            if path is not None:
+                _write_json(path, value)
+            return
+        data = self._load(namespace)
+        data[key] = value
+        self._write(namespace, data)
+
+    def delete(self, namespace: str, key: str) -> None:
+        if namespace in _PER_KEY_NAMESPACES:
+            self._namespaces.setdefault(namespace, {})[key] = None
+            path = self._key_path(namespace, key)
+            if path is not None:
+                path.unlink(missing_ok=True)
+            return
+        data = self._load(namespace)
+        if data.pop(key, None) is not None:
+            self._write(namespace, data)
+
+    def _write(self, namespace: str, data: dict[str, Any]) -> None:
+        if self.root is None:
+            return
+        _write_json(self.root / f"{namespace}.json", data)
+
+
+def _write_json(path: Path, value: Any) -> None:
+    """Atomically replace `path` with `value` as compact JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(value, handle, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class StateOverlay(StateStore):
+    """Read-through view of a store that buffers every write.
+
+    Reads fall back to deep copies of `base`, so nothing done through the
+    overlay can leak into it. `changes()` lists the buffered puts and
+    deletes (value None), last write per key wins, for a later `commit`.
+    """
+
+    def __init__(self, base: StateStore) -> None:
+        super().__init__(None)
+        self.base = base
+        self._changes: dict[tuple[str, str], Any | None] = {}
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        if (namespace, key) in self._changes:
+            return self._changes[(namespace, key)]
+        data = self._load(namespace)
+        if key not in data:
+            data[key] = copy.deepcopy(self.base.get(namespace, key))
+        return data[key]
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        self._changes[(namespace, key)] = value
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._changes[(namespace, key)] = None
+
+    def changes(self) -> list[dict[str, Any]]:
+        return [
+            {"namespace": namespace, "key": key, "value": value}
+            for (namespace, key), value in self._changes.items()
+        ]
+
+
+def commit_changes(store: StateStore, changes: list[dict[str, Any]]) -> None:
+    """Apply `StateOverlay.changes()` output to a real store."""
+    for change in changes:
+        if change["value"] is None:
+            store.delete(change["namespace"], change["key"])
+        else:
+            store.put(change["namespace"], change["key"], change["value"])
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from gh_issue_workflow.gh_client import ConditionalResponse, GhApiError, GhClient
+from gh_issue_workflow.state import StateStore
+
+TEAM_MEMBERS_NAMESPACE = "team_members"
+TEAM_MEMBERSHIP_TTL_SECONDS = 3600.0
+TEAM_PAGE_SIZE = 100
+
+
+def parse_team_ref(entry: str) -> tuple[str, str] | None:
+    """Split an `@org/team-slug` owner entry; None for plain logins."""
+    if not entry.startswith("@"):
+        return None
+    org, _, slug = entry[1:].partition("/")
+    if not org or not slug or "/" in slug:
+        return None
+    return org, slug
+
+
+def team_members_path(org: str, slug: str) -> str:
+    return f"orgs/{org}/teams/{slug}/members"
+
+
+def team_page_entry(
+    previous: dict[str, Any] | None, response: ConditionalResponse
+) -> dict[str, Any]:
+    """Cache entry for one members page: the previous one on a 304, else parsed."""
+    if response.not_modified and previous is not None:
+        return previous
+    rows = response.payload if isinstance(response.payload, list) else []
+    return {
+        "etag": response.etag,
+        "count": len(rows),
+        "logins": [
+            row["login"]
+            for row in rows
+            if isinstance(row, dict) and isinstance(row.get("login"), str)
+        ],
+    }
+
+
+def team_refresh_due(
+    cached: dict[str, Any] | None, *, now: float, ttl_seconds: float
+) -> bool:
+    return cached is None or now - float(cached.get("fetched_at", 0)) >= ttl_seconds
+
+
+def team_logins(cached: dict[str, Any]) -> frozenset[str]:
+    return frozenset(login for page in cached["pages"] for login in page["logins"])
+
+
+def refresh_team_members(
+    client: GhClient, store: StateStore, org: str, slug: str, *, now: float
+) -> dict[str, Any]:
+    """Revalidate every cached page of `orgs/{org}/teams/{slug}/members`.
+
+    Unchanged pages come back as 304 and reuse the cached logins.
+    """
+    key = f"{org}/{slug}"
+    cached = store.get(TEAM_MEMBERS_NAMESPACE, key) or {}
+    cached_pages: list[dict[str, Any]] = cached.get("pages", [])
+
+    pages: list[dict[str, Any]] = []
+    page = 1
+    while True:
+        previous = cached_pages[page - 1] if page <= len(cached_pages) else None
+        response = client.api_conditional(
+            team_members_path(org, slug),
+            fields={"per_page": TEAM_PAGE_SIZE, "page": page},
+            etag=previous.get("etag") if previous else None,
+        )
+        entry = team_page_entry(previous, response)
+        pages.append(entry)
+        if int(entry.get("count", 0)) < TEAM_PAGE_SIZE:
+            break
+        page += 1
+
+    members = {"fetched_at": now, "pages": pages}
+    store.put(TEAM_MEMBERS_NAMESPACE, key, members)
+    return members
+
+
+def team_members(
+    client: GhClient,
+    store: StateStore,
+    org: str,
+    slug: str,
+    *,
+    now: float,
+    ttl_seconds: float = TEAM_MEMBERSHIP_TTL_SECONDS,
+) -> frozenset[str]:
+    """Team logins from the cache, revalidated once `ttl_seconds` have passed."""
+    cached = store.get(TEAM_MEMBERS_NAMESPACE, f"{org}/{slug}")
+    if team_refresh_due(cached, now=now, ttl_seconds=ttl_seconds):
+        cached = refresh_team_members(client, store, org, slug, now=now)
+    return team_logins(cached)
+
+
+def resolve_owner_logins(
+    client: GhClient,
+    store: StateStore,
+    owner_logins: Iterable[str],
+    *,
+    now: float,
+    ttl_seconds: float = TEAM_MEMBERSHIP_TTL_SECONDS,
+    unresolved: dict[str, str] | None = None,
+) -> frozenset[str]:
+    """Expand `@org/team` entries into member logins; plain logins pass through.
+
+    A team whose members cannot be fetched (e.g. a 404 without `read:org`)
+    contributes no logins; its error is recorded in `unresolved` by entry.
+    """
+    logins: set[str] = set()
+    for entry in owner_logins:
+        team = parse_team_ref(entry)
+        if team is None:
+            logins.add(entry)
+            continue
+        try:
+            logins |= team_members(client, store, *team, now=now, ttl_seconds=ttl_seconds)
+        except GhApiError as error:
+            if unresolved is not None:
+                unresolved[entry] = str(error)
+    return frozenset(logins)
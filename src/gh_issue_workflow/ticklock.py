@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.state import StateStore
+
+TICK_PROGRESS_NAMESPACE = "tick_progress"
+# The cron job kills a tick after 3600s (see autopilot.build_cron_job), so no
+# live tick holds the lock longer than that.
+DEFAULT_STALE_LOCK_SECONDS = 3600.0
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class TickLock:
+    """Exclusive tick lock: a file created with O_EXCL holding pid/host/started_at.
+
+    A lock is stale when its holder ran on this host and the pid is gone, or
+    when it is older than `stale_seconds`; stale locks are taken over.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        stale_seconds: float = DEFAULT_STALE_LOCK_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.stale_seconds = stale_seconds
+        self.clock = clock
+        self.held = False
+
+    def _read(self, path: Path) -> dict[str, Any]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _is_stale(self, holder: dict[str, Any]) -> bool:
+        started_at = holder.get("started_at")
+        if not isinstance(started_at, (int, float)):
+            # Unreadable: possibly created but not yet written; age by mtime.
+            try:
+                started_at = self.path.stat().st_mtime
+            except FileNotFoundError:
+                return True
+        if self.clock() - started_at >= self.stale_seconds:
+            return True
+        pid = holder.get("pid")
+        return (
+            holder.get("host") == socket.gethostname()
+            and isinstance(pid, int)
+            and not _pid_alive(pid)
+        )
+
+    def acquire(self) -> dict[str, Any] | None:
+        """Take the lock; return None on success or the live holder's record."""
+        record = {
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "started_at": self.clock(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                holder = self._read(self.path)
+                if not self._is_stale(holder):
+                    return holder
+                # Move the stale lock aside atomically; if another process
+                # replaced it meanwhile, put theirs back and report overlap.
+                aside = self.path.with_name(f"{self.path.name}.stale.{os.getpid()}")
+                try:
+                    os.rename(self.path, aside)
+                except FileNotFoundError:
+                    continue
+                if self._read(aside) != holder:
+                    os.rename(aside, self.path)
+                    return self._read(self.path)
+                aside.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(record, handle)
+            self.held = True
+            return None
+        return self._read(self.path)
+
+    def release(self) -> None:
+        if self.held:
+            self.path.unlink(missing_ok=True)
+            self.held = False
+
+
+def prioritize_unfinished(
+    store: StateStore, repos: Iterable[RepoConfig]
+) -> list[RepoConfig]:
+    """Order repos the previous run left unfinished first, keeping config order."""
+    pending = store.get(TICK_PROGRESS_NAMESPACE, "pending") or []
+    rank = {name: index for index, name in enumerate(pending)}
+    return sorted(repos, key=lambda repo: rank.get(repo.name, len(rank)))
+
+
+def record_pending(store: StateStore, names: Iterable[str]) -> None:
+    store.put(TICK_PROGRESS_NAMESPACE, "pending", list(names))
+
+
+def tick_finished(result: dict[str, Any]) -> bool:
+    """A repo is finished unless phases were cut short by the deadline."""
+    return "deadline" not in result.get("skipped_phases", {}).values()
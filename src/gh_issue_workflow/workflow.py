@@ -1,20 +1,45 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import json
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import asdict
-from typing import Any, Iterable
+from functools import partial
+from typing import Any, Callable, Collection, Iterable, Iterator
+from urllib.parse import quote
 
+from gh_issue_workflow.board import cache_open_issues, record_authorized_ready
 from gh_issue_workflow.config import RepoConfig
-from gh_issue_workflow.gh_client import GhApiError, GhClient
+from gh_issue_workflow.gh_client import (
+    GhApiError,
+    GhClient,
+    GhTransientError,
+    RequestKey,
+    request_key,
+)
+from gh_issue_workflow.metrics import FlowMetrics
+from gh_issue_workflow.resilience import CircuitBreaker
 from gh_issue_workflow.stages import (
     KNOWN_STAGE_LABELS,
+    PICK_PRIORITY,
     STAGE_IN_PROGRESS,
     STAGE_NEEDS_CLARIFICATION,
     STAGE_QUEUED,
     STAGE_READY_TO_IMPLEMENT,
+    Issue,
+    PickedIssue,
+    Stage,
     apply_stage_label,
+    parse_timestamp,
     pick_next_issue,
 )
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.teams import TEAM_MEMBERSHIP_TTL_SECONDS, resolve_owner_logins
 
 STAGE_COLORS = {
     "stage:backlog": "cfd3d7",
@@ -49,36 +74,491 @@ SEVERITY_COLORS: dict[str, str] = {
 ALERT_URL_RE = re.compile(
     r"https://github\.com/(?P<owner>[^/]+)/(?P<repo>[^/]+)/security/code-scanning/(?P<alert_number>\d+)"
 )
+# Host-agnostic variant used for dedupe, so GHES alert URLs are matched too.
+TRACKED_ALERT_URL_RE = re.compile(
+    r"https?://[^\s/]+/[^\s/]+/[^\s/]+/security/code-scanning/\d+"
+)
+
+
+LABELS_NAMESPACE = "labels"
+LABEL_CONVERGENCE_TTL_SECONDS = 24 * 3600.0
+_LABEL_BATCH_WORKERS = 8
+# Listings stop after this many pages even if the server keeps returning full
+# ones (100k rows at `per_page=100`).
+MAX_LIST_PAGES = 1000
+
+# A listing prefetched at the start of a tick: path, fields, row projection.
+TickRead = tuple[str, dict[str, Any], Callable[[Any], Any]]
+# Reads the current tick prefetched, keyed like the client memo.
+_PREFETCHED: ContextVar[dict[RequestKey, Callable[[Any], Any]]] = ContextVar(
+    "prefetched_tick_reads", default={}
+)
+
+ALERT_CURSORS_NAMESPACE = "alert_cursors"
+ALERT_FULL_RECONCILE_SECONDS = 6 * 3600.0
+# Alert URLs whose issue POST failed transiently and was not visible right
+# after; the next sync looks for the issue again before creating it.
+PENDING_ALERT_ISSUES_NAMESPACE = "pending_alert_issues"
+_ALERT_PAGE_SIZE = 100
+
+# Per-repo ETag of the newest-updated issue, used to skip ticks of idle repos.
+CHANGE_GATE_NAMESPACE = "change_gate"
+# Alerts, label definitions and team membership do not touch issue
+# `updated_at`; a full tick at least this often catches them up.
+CHANGE_GATE_FULL_TICK_SECONDS = 3600.0
+
+
+def desired_labels() -> dict[str, tuple[str, str]]:
+    """Return every label the workflow manages as name -> (color, description)."""
+    spec = {
+        label: (STAGE_COLORS[label], "automation stage label")
+        for label in KNOWN_STAGE_LABELS
+    }
+    spec[SECURITY_LABEL] = SECURITY_LABEL_DEFAULTS[SECURITY_LABEL]
+    for severity, color in SEVERITY_COLORS.items():
+        spec[f"{SEVERITY_PREFIX}{severity}"] = (color, f"security severity: {severity}")
+    return spec
+
+
+def label_fingerprint(spec: dict[str, tuple[str, str]]) -> str:
+    encoded = json.dumps(sorted(spec.items()), separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def label_defaults(label: str) -> tuple[str, str]:
+    """Color and description used when a label has to be created on demand."""
+    if label in SECURITY_LABEL_DEFAULTS:
+        return SECURITY_LABEL_DEFAULTS[label]
+    if label.startswith(SEVERITY_PREFIX):
+        severity = label[len(SEVERITY_PREFIX) :].strip().lower() or "unknown"
+        color = SEVERITY_COLORS.get(severity, SEVERITY_COLORS["unknown"])
+        return color, f"security severity: {severity}"
+    return "cfd3d7", "automation label"
+
+
+def existing_label_spec(rows: Iterable[dict[str, Any]]) -> dict[str, tuple[str, str]]:
+    """Listed repo labels as name -> (lower-cased color, description)."""
+    return {
+        str(row["name"]): (
+            str(row.get("color") or "").lower(),
+            str(row.get("description") or ""),
+        )
+        for row in rows
+        if isinstance(row.get("name"), str)
+    }
+
+
+def diff_labels(
+    spec: dict[str, tuple[str, str]], current: dict[str, tuple[str, str]]
+) -> tuple[list[tuple[str, str, str]], list[tuple[str, str, str]]]:
+    """Split the spec into labels to create and labels to update."""
+    create: list[tuple[str, str, str]] = []
+    update: list[tuple[str, str, str]] = []
+    for name, (color, description) in sorted(spec.items()):
+        existing = current.get(name)
+        if existing is None:
+            create.append((name, color, description))
+        elif existing != (color, description):
+            update.append((name, color, description))
+    return create, update
+
+
+def status_labels(existing: Iterable[str], new_status: str | None) -> list[str]:
+    """Labels after replacing the stage label (or dropping all of them if None)."""
+    if new_status is None:
+        return sorted(label for label in existing if not label.startswith("stage:"))
+    return sorted(apply_stage_label(existing, new_status))
+
+
+def closed_issue_stage_labels(row: dict[str, Any]) -> list[str] | None:
+    """Label names of a closed issue that still carries a stage label, else None."""
+    if row.get("pull_request") or not isinstance(row.get("number"), int):
+        return None
+    labels = [
+        label.get("name") for label in row.get("labels", []) if isinstance(label, dict)
+    ]
+    names = [label for label in labels if isinstance(label, str)]
+    if not any(label.startswith("stage:") for label in names):
+        return None
+    return names
+
+
+def collect_open_issues(
+    rows: Iterable[dict[str, Any]],
+) -> tuple[list[Issue], list[tuple[int, list[Issue]]]]:
+    """Parse listed rows into issues plus `(raw_row_count, issues)` API pages."""
+    issues: list[Issue] = []
+    pages: list[tuple[int, list[Issue]]] = []
+    for index, row in enumerate(rows):
+        if index % 100 == 0:
+            pages.append((0, []))
+        count, page_issues = pages[-1]
+        pages[-1] = (count + 1, page_issues)
+        issue = Issue.from_api(row)
+        if issue is not None:
+            issues.append(issue)
+            page_issues.append(issue)
+    return issues, pages
+
+
+def transition_for(pick: PickedIssue) -> tuple[str | None, dict[str, Any]]:
+    """Return the stage to move the picked issue to (if any) and the tick action."""
+    if pick.picked_from_stage == STAGE_QUEUED:
+        return STAGE_NEEDS_CLARIFICATION, {
+            "action": "moved-to-needs-clarification",
+            "issue": pick.number,
+        }
+    if pick.picked_from_stage == STAGE_READY_TO_IMPLEMENT:
+        return STAGE_IN_PROGRESS, {"action": "moved-to-in-progress", "issue": pick.number}
+    return None, {"action": "continue-in-progress", "issue": pick.number}
+
+
+def ready_label_actor(events: Iterable[Any]) -> str | None:
+    """Login of whoever most recently applied the ready-to-implement label."""
+    for event in reversed(list(events)):
+        if not isinstance(event, dict) or event.get("event") != "labeled":
+            continue
+        label = (event.get("label") or {}).get("name")
+        if label != STAGE_READY_TO_IMPLEMENT:
+            continue
+        return (event.get("actor") or {}).get("login")
+    return None
+
+
+def tracked_alert_urls(rows: Iterable[dict[str, Any]]) -> set[str]:
+    """Alert URLs referenced by the bodies of issue rows (PRs are ignored)."""
+    urls: set[str] = set()
+    for issue in rows:
+        if issue.get("pull_request"):
+            continue
+        body = issue.get("body")
+        if isinstance(body, str) and body:
+            urls.update(TRACKED_ALERT_URL_RE.findall(body))
+    return urls
+
+
+def project_alert(alert: dict[str, Any]) -> dict[str, Any]:
+    """Keep only the alert fields used for issue creation."""
+    rule = alert.get("rule") if isinstance(alert.get("rule"), dict) else {}
+    instance = alert.get("most_recent_instance")
+    location = instance.get("location") if isinstance(instance, dict) else None
+    projected: dict[str, Any] = {
+        key: alert.get(key)
+        for key in ("number", "html_url", "state", "created_at", "updated_at")
+        if key in alert
+    }
+    projected["rule"] = {
+        key: rule.get(key)
+        for key in ("id", "description", "security_severity_level", "severity")
+        if key in rule
+    }
+    if isinstance(location, dict):
+        projected["most_recent_instance"] = {"location": location}
+    return projected
+
+
+def project_label_row(row: Any) -> Any:
+    """Keep only the label fields reconciliation compares."""
+    if not isinstance(row, dict):
+        return row
+    return {key: row[key] for key in ("name", "color", "description") if key in row}
+
+
+def project_issue_row(row: Any, *, body: bool = False) -> Any:
+    """Keep only the issue fields the tick phases read (and `body` if asked).
+
+    Label objects are reduced to their names; pull requests stay in the list,
+    marked, so page sizes still match the server's.
+    """
+    if not isinstance(row, dict):
+        return row
+    projected = {
+        key: row[key] for key in ("number", "state", "created_at", "updated_at") if key in row
+    }
+    if row.get("pull_request"):
+        projected["pull_request"] = True
+    projected["labels"] = [
+        {"name": label.get("name")} if isinstance(label, dict) else label
+        for label in row.get("labels") or []
+    ]
+    if body and "body" in row:
+        projected["body"] = row["body"]
+    return projected
+
+
+def severity_from_alert(alert: dict[str, Any]) -> str:
+    rule = alert.get("rule") if isinstance(alert.get("rule"), dict) else {}
+    severity_raw = rule.get("security_severity_level") or rule.get("severity") or "unknown"
+    severity = str(severity_raw).strip().lower() or "unknown"
+    return severity
+
+
+def alert_title(alert: dict[str, Any]) -> str:
+    rule = alert.get("rule") if isinstance(alert.get("rule"), dict) else {}
+    rule_id = str(rule.get("id") or "").strip()
+    description = str(rule.get("description") or "").strip()
+
+    headline = (
+        rule_id or description or f"code-scanning-alert-{alert.get('number', 'unknown')}"
+    )
+    return f"security: {headline}"
+
+
+def alert_location(alert: dict[str, Any]) -> str:
+    most_recent_instance = alert.get("most_recent_instance")
+    if not isinstance(most_recent_instance, dict):
+        return "n/a"
+
+    location = most_recent_instance.get("location")
+    if not isinstance(location, dict):
+        return "n/a"
+
+    path = str(location.get("path") or "").strip()
+    if not path:
+        return "n/a"
+
+    start_line = location.get("start_line") or location.get("line")
+    end_line = location.get("end_line")
+
+    if isinstance(start_line, int):
+        if isinstance(end_line, int) and end_line > start_line:
+            return f"{path}:{start_line}-{end_line}"
+        return f"{path}:{start_line}"
+
+    return path
+
+
+def build_alert_issue_body(alert: dict[str, Any]) -> str:
+    rule = alert.get("rule") if isinstance(alert.get("rule"), dict) else {}
+    rule_id = str(rule.get("id") or "unknown")
+    severity = severity_from_alert(alert)
+    state = str(alert.get("state") or "unknown")
+    created_at = str(alert.get("created_at") or "unknown")
+    alert_url = str(alert.get("html_url") or "")
+    location = alert_location(alert)
+
+    return (
+        "Auto-created from GitHub Advanced Security code scanning alert.\n\n"
+        f"- Alert URL: {alert_url}\n"
+        f"- Rule ID: {rule_id}\n"
+        f"- Severity: {severity}\n"
+        f"- State: {state}\n"
+        f"- Created at: {created_at}\n"
+        f"- Affected file(s): {location}\n"
+    )
+
+
+def alert_issue_payload(alert: dict[str, Any]) -> dict[str, Any]:
+    """Title, body and labels of the tracking issue for an alert."""
+    return {
+        "title": alert_title(alert),
+        "body": build_alert_issue_body(alert),
+        "labels": [
+            SECURITY_STAGE_QUEUED,
+            SECURITY_LABEL,
+            f"{SEVERITY_PREFIX}{severity_from_alert(alert)}",
+        ],
+    }
+
+
+def extract_alert_number_from_body(body: str, *, owner: str, repo_name: str) -> int | None:
+    for match in ALERT_URL_RE.finditer(body):
+        if match.group("owner") != owner or match.group("repo") != repo_name:
+            continue
+        return int(match.group("alert_number"))
+    return None
+
+
+def dismissal_payload(issue_number: int) -> dict[str, Any]:
+    return {
+        "state": "dismissed",
+        "dismissed_reason": "false positive",
+        "dismissed_comment": f"Auto-dismissed: linked tracking issue #{issue_number} was closed.",
+    }
+
+
+def is_not_found(error: GhApiError) -> bool:
+    message = str(error).lower()
+    return "404" in message or "not found" in message
+
+
+def is_validation_failure(error: GhApiError) -> bool:
+    """422, e.g. creating a label that already exists."""
+    message = str(error).lower()
+    return "422" in message or "validation failed" in message
+
+
+TICK_PHASES: tuple[str, ...] = (
+    "labels",
+    "pick",
+    "cleanup_closed",
+    "security_closed",
+    "security_alerts",
+)
+
+
+def new_tick_result(repo: str) -> dict[str, Any]:
+    return {
+        "repo": repo,
+        "cleaned_closed": 0,
+        "security_created": 0,
+        "security_skipped_existing": 0,
+        "security_closed_dismissed": 0,
+        "security_closed_already_resolved": 0,
+        "security_closed_missing_link": 0,
+    }
+
+
+def record_phase_result(result: dict[str, Any], phase: str, value: Any) -> None:
+    """Fold a successful phase's return value into the tick result."""
+    if phase == "cleanup_closed":
+        result["cleaned_closed"] = value
+    elif phase == "security_closed":
+        result["security_closed_dismissed"] = value["dismissed"]
+        result["security_closed_already_resolved"] = value["already_resolved"]
+        result["security_closed_missing_link"] = value["missing_link"]
+    elif phase == "security_alerts":
+        result["security_created"] = value["created"]
+        result["security_skipped_existing"] = value["skipped_existing"]
+
+
+def with_unresolved_teams(action: dict[str, Any], unresolved: dict[str, str]) -> dict[str, Any]:
+    """Report owner teams a pick could not resolve alongside its action."""
+    if not unresolved:
+        return action
+    return {**action, "unresolved_owner_teams": unresolved}
+
+
+def phase_error_message(error: Exception) -> str:
+    """How a failed phase is reported under `phase_errors`."""
+    if isinstance(error, GhApiError):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def finish_tick_result(
+    result: dict[str, Any],
+    action: dict[str, Any],
+    *,
+    skipped: dict[str, str],
+    errors: dict[str, str],
+    flow: dict[str, Any],
+) -> dict[str, Any]:
+    if "pick" in errors:
+        action = {"action": "error"}
+    result.update(action)
+    if flow:
+        result["flow"] = flow
+    if skipped:
+        result["skipped_phases"] = skipped
+    if errors:
+        result["phase_errors"] = errors
+    return result
 
 
 class Workflow:
-    def __init__(self, client: GhClient) -> None:
+    def __init__(
+        self,
+        client: GhClient,
+        *,
+        server_side_pick: bool = False,
+        change_gate: bool = False,
+        state: StateStore | None = None,
+        breaker: CircuitBreaker | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         self.client = client
+        self.server_side_pick = server_side_pick
+        self.change_gate = change_gate
+        self.change_gate_full_tick_seconds = CHANGE_GATE_FULL_TICK_SECONDS
+        self.state = state if state is not None else StateStore()
+        self.clock = clock
+        self.label_ttl_seconds = LABEL_CONVERGENCE_TTL_SECONDS
+        self.alert_full_reconcile_seconds = ALERT_FULL_RECONCILE_SECONDS
+        self.team_ttl_seconds = TEAM_MEMBERSHIP_TTL_SECONDS
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.metrics = FlowMetrics(self.state, clock=clock)
+        self._phase_estimates: dict[str, float] = {}
 
     @staticmethod
     def _split_repo(repo: str) -> tuple[str, str]:
         return repo.split("/", 1)
 
+    def _iter_rows(
+        self, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Yield the dict rows of a GET list endpoint, following full pages.
+
+        Requests `page=2, 3, ...` while a page comes back with `per_page` rows,
+        up to `MAX_LIST_PAGES` pages. Each page streams through
+        `client.api_iter` when the client supports it so callers can project
+        each row and drop it before the next is decoded. Reads this tick
+        prefetched join the memoized GET, already projected.
+        """
+        api_iter = getattr(self.client, "api_iter", None)
+        prefetched = _PREFETCHED.get()
+        per_page = int((fields or {}).get("per_page", 30))
+        for page in range(1, MAX_LIST_PAGES + 1):
+            page_fields = fields if page == 1 else {**(fields or {}), "page": page}
+            project = prefetched.get(request_key(path, page_fields))
+            if project is not None:
+                payload = self.client.api_projected(path, fields=page_fields, project=project)
+                rows: Iterable[Any] = payload if isinstance(payload, list) else []
+            elif api_iter is not None:
+                rows = api_iter("GET", path, fields=page_fields)
+            else:
+                payload = self.client.api("GET", path, fields=page_fields)
+                rows = payload if isinstance(payload, list) else []
+
+            count = 0
+            for row in rows:
+                count += 1
+                if isinstance(row, dict):
+                    yield row
+            if count < per_page:
+                return
+
     def _list_repo_labels(self, repo: str) -> set[str]:
         owner, repo_name = self._split_repo(repo)
-        rows = self.client.api(
-            "GET", f"repos/{owner}/{repo_name}/labels", fields={"per_page": 100}
-        )
-        if not isinstance(rows, list):
-            return set()
-
         names: set[str] = set()
-        for row in rows:
-            if isinstance(row, dict) and isinstance(row.get("name"), str):
+        for row in self._iter_rows(
+            f"repos/{owner}/{repo_name}/labels", fields={"per_page": 100}
+        ):
+            if isinstance(row.get("name"), str):
                 names.add(str(row["name"]))
         return names
 
     def _create_label(self, repo: str, name: str, color: str, description: str) -> None:
+        """POST a label; a 422 for a label that already exists counts as success."""
+        owner, repo_name = self._split_repo(repo)
+        try:
+            self.client.api(
+                "POST",
+                f"repos/{owner}/{repo_name}/labels",
+                fields={"name": name, "color": color, "description": description},
+            )
+        except GhApiError as error:
+            if not is_validation_failure(error) or not self._label_exists(repo, name):
+                raise
+
+    def _label_exists(self, repo: str, name: str) -> bool:
+        owner, repo_name = self._split_repo(repo)
+        try:
+            self.client.api(
+                "GET", f"repos/{owner}/{repo_name}/labels/{quote(name, safe='')}"
+            )
+        except GhApiError as error:
+            if is_not_found(error):
+                return False
+            raise
+        return True
+
+    def _update_label(self, repo: str, name: str, color: str, description: str) -> None:
         owner, repo_name = self._split_repo(repo)
         self.client.api(
-            "POST",
-            f"repos/{owner}/{repo_name}/labels",
-            fields={"name": name, "color": color, "description": description},
+            "PATCH",
+            f"repos/{owner}/{repo_name}/labels/{quote(name, safe='')}",
+            fields={"color": color, "description": description},
         )
 
     def _ensure_labels_exist(
@@ -87,146 +567,300 @@ class Workflow:
         for label in labels:
             if label in existing:
                 continue
-
-            if label in SECURITY_LABEL_DEFAULTS:
-                color, description = SECURITY_LABEL_DEFAULTS[label]
-            elif label.startswith(SEVERITY_PREFIX):
-                severity = label[len(SEVERITY_PREFIX) :].strip().lower() or "unknown"
-                color = SEVERITY_COLORS.get(severity, SEVERITY_COLORS["unknown"])
-                description = f"security severity: {severity}"
-            else:
-                color = "cfd3d7"
-                description = "automation label"
-
+            color, description = label_defaults(label)
             self._create_label(repo, label, color, description)
             existing.add(label)
 
-    def ensure_stage_labels(self, repo: str) -> None:
-        existing = self._list_repo_labels(repo)
-        for label in sorted(KNOWN_STAGE_LABELS):
-            if label in existing:
-                continue
-            self._create_label(
-                repo, label, STAGE_COLORS[label], "automation stage label"
-            )
-
-    def cleanup_closed_issue_stage_labels(self, repo: str) -> int:
-        owner, repo_name = self._split_repo(repo)
-        issues = self.client.api(
-            "GET",
-            f"repos/{owner}/{repo_name}/issues",
-            fields={"state": "closed", "per_page": 100},
+    def _labels_converged(self, repo: str, fingerprint: str) -> bool:
+        converged = self.state.get(LABELS_NAMESPACE, repo)
+        return (
+            isinstance(converged, dict)
+            and converged.get("fingerprint") == fingerprint
+            and self.clock() - float(converged.get("converged_at", 0))
+            < self.label_ttl_seconds
         )
 
-        if not isinstance(issues, list):
-            return 0
-
-        cleaned = 0
-        for issue in issues:
-            if not isinstance(issue, dict) or issue.get("pull_request"):
-                continue
+    def _run_label_batch(self, ops: list[Callable[[], None]]) -> None:
+        if not ops:
+            return
+        with ThreadPoolExecutor(max_workers=min(_LABEL_BATCH_WORKERS, len(ops))) as pool:
+            futures = [pool.submit(op) for op in ops]
+        for future in futures:
+            future.result()
+
+    def reconcile_labels(self, repo: str, *, force: bool = False) -> dict[str, int]:
+        """Converge managed labels (existence, color, description) for `repo`.
+
+        Once converged, the spec fingerprint is persisted and later calls skip
+        the label listing until the spec changes or the TTL expires.
+        """
+        spec = desired_labels()
+        fingerprint = label_fingerprint(spec)
+        if not force and self._labels_converged(repo, fingerprint):
+            return {"created": 0, "updated": 0, "skipped": 1}
 
-            labels_raw = issue.get("labels", [])
-            labels = [
-                label.get("name") for label in labels_raw if isinstance(label, dict)
-            ]
-            if not any(
-                isinstance(label, str) and label.startswith("stage:")
-                for label in labels
-            ):
-                continue
-
-            number = issue.get("number")
-            if isinstance(number, int):
-                self.set_status(repo, number, None)
-                cleaned += 1
-
-        return cleaned
-
-    def list_open_issues(self, repo: str) -> list[dict[str, Any]]:
         owner, repo_name = self._split_repo(repo)
-        issues = self.client.api(
-            "GET",
-            f"repos/{owner}/{repo_name}/issues",
-            fields={"state": "open", "per_page": 100},
+        current = existing_label_spec(
+            self._iter_rows(f"repos/{owner}/{repo_name}/labels", fields={"per_page": 100})
+        )
+        create, update = diff_labels(spec, current)
+        self._run_label_batch(
+            [partial(self._create_label, repo, *label) for label in create]
+            + [partial(self._update_label, repo, *label) for label in update]
+        )
+        self.state.put(
+            LABELS_NAMESPACE,
+            repo,
+            {"fingerprint": fingerprint, "converged_at": self.clock()},
         )
+        return {"created": len(create), "updated": len(update), "skipped": 0}
 
-        if not isinstance(issues, list):
-            return []
+    def ensure_stage_labels(self, repo: str, *, force: bool = False) -> dict[str, int]:
+        return self.reconcile_labels(repo, force=force)
 
-        out: list[dict[str, Any]] = []
-        for issue in issues:
-            if not isinstance(issue, dict) or issue.get("pull_request"):
-                continue
+    def cleanup_closed_issue_stage_labels(self, repo: str) -> int:
+        owner, repo_name = self._split_repo(repo)
+        to_clean: list[tuple[int, list[str]]] = []
+        for issue in self._iter_rows(
+            f"repos/{owner}/{repo_name}/issues",
+            fields={"state": "closed", "per_page": 100},
+        ):
+            labels = closed_issue_stage_labels(issue)
+            if labels is not None:
+                to_clean.append((int(issue["number"]), labels))
 
-            number = issue.get("number")
-            created_at = issue.get("created_at")
-            labels = issue.get("labels", [])
-            if not isinstance(number, int) or not isinstance(created_at, str):
-                continue
+        for number, labels in to_clean:
+            self.set_status(repo, number, None, current_labels=labels)
+        return len(to_clean)
 
-            out.append(
-                {
-                    "number": number,
-                    "created_at": created_at,
-                    "labels": [
-                        lab.get("name")
-                        for lab in labels
-                        if isinstance(lab, dict) and isinstance(lab.get("name"), str)
-                    ],
-                }
+    def list_open_issues(self, repo: str) -> list[Issue]:
+        """List open issues and refresh the local cache the `board` reads."""
+        owner, repo_name = self._split_repo(repo)
+        issues, pages = collect_open_issues(
+            self._iter_rows(
+                f"repos/{owner}/{repo_name}/issues",
+                fields={"state": "open", "per_page": 100},
             )
-        return out
+        )
+        cache_open_issues(self.state, repo, pages, now=self.clock())
+        return issues
+
+    def authorized_logins(
+        self, repo_cfg: RepoConfig, *, unresolved: dict[str, str] | None = None
+    ) -> frozenset[str]:
+        """Owner logins with `@org/team` entries expanded via the membership cache.
+
+        Teams that fail to resolve add no logins and are reported in `unresolved`.
+        """
+        return resolve_owner_logins(
+            self.client,
+            self.state,
+            repo_cfg.owner_logins,
+            now=self.clock(),
+            ttl_seconds=self.team_ttl_seconds,
+            unresolved=unresolved,
+        )
 
-    def is_ready_authorized(
-        self, repo: str, issue_number: int, owner_logins: list[str]
-    ) -> bool:
+    def _observe_events(self, repo: str, issue_number: int) -> Any:
         owner, repo_name = self._split_repo(repo)
         events = self.client.api(
             "GET",
             f"repos/{owner}/{repo_name}/issues/{issue_number}/events",
             fields={"per_page": 100},
         )
-        for event in reversed(events):
-            if event.get("event") != "labeled":
-                continue
-            label = (event.get("label") or {}).get("name")
-            if label != STAGE_READY_TO_IMPLEMENT:
+        self.metrics.observe(repo, issue_number, events)
+        return events
+
+    def is_ready_authorized(
+        self, repo: str, issue_number: int, owner_logins: Collection[str]
+    ) -> bool:
+        actor = ready_label_actor(self._observe_events(repo, issue_number))
+        return actor is not None and actor in owner_logins
+
+    def _list_stage_page(
+        self, repo: str, stage: Stage, *, per_page: int, page: int = 1
+    ) -> tuple[int, list[Issue]]:
+        """Fetch one oldest-first page of open issues carrying `stage`.
+
+        Returns the raw row count (for end-of-listing detection) and the
+        parsed issues whose precomputed stage is `stage`.
+        """
+        owner, repo_name = self._split_repo(repo)
+        fields: dict[str, Any] = {
+            "state": "open",
+            "labels": stage.value,
+            "sort": "created",
+            "direction": "asc",
+            "per_page": per_page,
+        }
+        if page > 1:
+            fields["page"] = page
+        rows = self.client.api(
+            "GET", f"repos/{owner}/{repo_name}/issues", fields=fields
+        )
+        if not isinstance(rows, list):
+            return 0, []
+
+        out: list[Issue] = []
+        for row in rows:
+            if not isinstance(row, dict):
                 continue
-            actor = (event.get("actor") or {}).get("login")
-            return actor in owner_logins
-        return False
+            issue = Issue.from_api(row)
+            if issue is not None and issue.stage is stage:
+                out.append(issue)
+        return len(rows), out
+
+    def _iter_stage_issues(
+        self, repo: str, stage: Stage, *, first_page_size: int = 1
+    ) -> Iterator[Issue]:
+        """Yield open issues in `stage` oldest-first, fetching pages lazily.
+
+        The first request is deliberately tiny; full pages are only fetched
+        when the caller keeps consuming (PRs, unauthorized ready issues).
+        """
+        raw_count, issues = self._list_stage_page(
+            repo, stage, per_page=first_page_size
+        )
+        seen: set[int] = set()
+        for issue in issues:
+            seen.add(issue.number)
+            yield issue
+        if raw_count < first_page_size:
+            return
+
+        page = 1
+        while True:
+            raw_count, issues = self._list_stage_page(
+                repo, stage, per_page=100, page=page
+            )
+            for issue in issues:
+                if issue.number not in seen:
+                    yield issue
+            if raw_count < 100:
+                return
+            page += 1
+
+    def _pick_next_server_side(
+        self, repo_cfg: RepoConfig, *, unresolved: dict[str, str] | None = None
+    ) -> tuple[PickedIssue, Issue] | None:
+        owners: frozenset[str] | None = None
+        for stage in PICK_PRIORITY:
+            for issue in self._iter_stage_issues(repo_cfg.name, stage):
+                if stage is Stage.READY_TO_IMPLEMENT:
+                    if owners is None:
+                        owners = self.authorized_logins(repo_cfg, unresolved=unresolved)
+                    if not self.is_ready_authorized(repo_cfg.name, issue.number, owners):
+                        continue
+                pick = PickedIssue(number=issue.number, picked_from_stage=stage.value)
+                return pick, issue
+        return None
+
+    def _pick_issue(
+        self, repo_cfg: RepoConfig, *, unresolved: dict[str, str] | None = None
+    ) -> tuple[PickedIssue, Issue] | None:
+        """Return the pick together with the listed issue it came from.
+
+        Owner teams that could not be resolved are recorded in `unresolved`.
+        """
+        if self.server_side_pick:
+            return self._pick_next_server_side(repo_cfg, unresolved=unresolved)
 
-    def pick_next(self, repo_cfg: RepoConfig) -> dict[str, Any] | None:
         issues = self.list_open_issues(repo_cfg.name)
+        self.metrics.retain(repo_cfg.name, (i.number for i in issues))
+        ready = [i.number for i in issues if i.stage is Stage.READY_TO_IMPLEMENT]
+        # Ready issues have their events folded by the authorization check.
+        for number in self.metrics.stage_changed(
+            repo_cfg.name, (i for i in issues if i.stage is not Stage.READY_TO_IMPLEMENT)
+        ):
+            self._observe_events(repo_cfg.name, number)
+        owners = (
+            self.authorized_logins(repo_cfg, unresolved=unresolved)
+            if ready
+            else frozenset()
+        )
         authorized_ready = {
-            int(i["number"])
-            for i in issues
-            if STAGE_READY_TO_IMPLEMENT in set(i.get("labels", []))
-            and self.is_ready_authorized(
-                repo_cfg.name, int(i["number"]), repo_cfg.owner_logins
-            )
+            number
+            for number in ready
+            if self.is_ready_authorized(repo_cfg.name, number, owners)
         }
+        record_authorized_ready(self.state, repo_cfg.name, authorized_ready)
         pick = pick_next_issue(issues, authorized_ready_issue_numbers=authorized_ready)
         if pick is None:
             return None
-        return asdict(pick)
+        return pick, next(i for i in issues if i.number == pick.number)
 
-    def set_status(self, repo: str, issue_number: int, new_status: str | None) -> None:
+    def pick_next(self, repo_cfg: RepoConfig) -> dict[str, Any] | None:
+        picked = self._pick_issue(repo_cfg)
+        if picked is None:
+            return None
+        return asdict(picked[0])
+
+    def _ranked_stage_issues(
+        self, index: int, repo: str, stage: Stage, first_page_size: int
+    ) -> Iterator[tuple[float, int, Issue]]:
+        for issue in self._iter_stage_issues(repo, stage, first_page_size=first_page_size):
+            yield issue.created_ts, index, issue
+
+    def pick_next_global(
+        self, repos: Iterable[RepoConfig], *, top: int = 1
+    ) -> list[dict[str, Any]]:
+        """Return the `top` most urgent issues across all repos.
+
+        Same ordering as `pick_next_issue` (stage priority, then oldest), with
+        ties broken by repo order. Each stage merges the repos' oldest-first
+        streams with a heap, and lower-priority stages are never queried once
+        `top` picks are settled; readiness is authorized lazily as candidates
+        surface.
+        """
+        repo_cfgs = list(repos)
+        picks: list[dict[str, Any]] = []
+        if top < 1:
+            return picks
+        first_page_size = min(top, 100)
+        owners: dict[int, frozenset[str]] = {}
+        for stage in PICK_PRIORITY:
+            streams = [
+                self._ranked_stage_issues(index, repo_cfg.name, stage, first_page_size)
+                for index, repo_cfg in enumerate(repo_cfgs)
+            ]
+            for _, index, issue in heapq.merge(*streams, key=lambda item: item[:2]):
+                repo_cfg = repo_cfgs[index]
+                if stage is Stage.READY_TO_IMPLEMENT:
+                    if index not in owners:
+                        owners[index] = self.authorized_logins(repo_cfg)
+                    if not self.is_ready_authorized(
+                        repo_cfg.name, issue.number, owners[index]
+                    ):
+                        continue
+                pick = PickedIssue(number=issue.number, picked_from_stage=stage.value)
+                picks.append({"repo": repo_cfg.name, "pick": asdict(pick)})
+                if len(picks) >= top:
+                    return picks
+        return picks
+
+    def set_status(
+        self,
+        repo: str,
+        issue_number: int,
+        new_status: str | None,
+        *,
+        current_labels: Iterable[str] | None = None,
+    ) -> None:
+        """Replace the issue's stage label (or drop all stage labels if None).
+
+        `current_labels` skips the issue GET when the caller has just listed it.
+        """
         owner, repo_name = self._split_repo(repo)
-        issue = self.client.api(
-            "GET", f"repos/{owner}/{repo_name}/issues/{issue_number}"
-        )
-        existing = [label["name"] for label in issue.get("labels", [])]
-        if new_status is None:
-            target_labels = sorted(
-                [label for label in existing if not label.startswith("stage:")]
+        if current_labels is None:
+            issue = self.client.api(
+                "GET", f"repos/{owner}/{repo_name}/issues/{issue_number}"
             )
+            existing = [label["name"] for label in issue.get("labels", [])]
         else:
-            target_labels = sorted(apply_stage_label(existing, new_status))
+            existing = list(current_labels)
         self.client.api_patch_json(
             f"repos/{owner}/{repo_name}/issues/{issue_number}",
-            {"labels": target_labels},
+            {"labels": status_labels(existing, new_status)},
         )
 
     def post_comment(self, repo: str, issue_number: int, body: str) -> None:
@@ -237,125 +871,24 @@ class Workflow:
             fields={"body": body},
         )
 
-    def _list_issue_bodies(self, repo: str) -> list[str]:
+    def _list_tracked_alert_urls(self, repo: str) -> set[str]:
+        """Return alert URLs referenced by issue bodies; bodies are dropped."""
         owner, repo_name = self._split_repo(repo)
-        issues = self.client.api(
-            "GET",
-            f"repos/{owner}/{repo_name}/issues",
-            fields={"state": "all", "per_page": 100},
-        )
-        if not isinstance(issues, list):
-            return []
-
-        bodies: list[str] = []
-        for issue in issues:
-            if not isinstance(issue, dict):
-                continue
-            if issue.get("pull_request"):
-                continue
-            body = issue.get("body")
-            if isinstance(body, str) and body:
-                bodies.append(body)
-        return bodies
-
-    @staticmethod
-    def _severity_from_alert(alert: dict[str, Any]) -> str:
-        rule = alert.get("rule") if isinstance(alert.get("rule"), dict) else {}
-        severity_raw = (
-            rule.get("security_severity_level") or rule.get("severity") or "unknown"
-        )
-        severity = str(severity_raw).strip().lower() or "unknown"
-        return severity
-
-    @staticmethod
-    def _alert_title(alert: dict[str, Any]) -> str:
-        rule = alert.get("rule") if isinstance(alert.get("rule"), dict) else {}
-        rule_id = str(rule.get("id") or "").strip()
-        description = str(rule.get("description") or "").strip()
-
-        headline = (
-            rule_id
-            or description
-            or f"code-scanning-alert-{alert.get('number', 'unknown')}"
-        )
-        return f"security: {headline}"
-
-    @staticmethod
-    def _alert_location(alert: dict[str, Any]) -> str:
-        most_recent_instance = alert.get("most_recent_instance")
-        if not isinstance(most_recent_instance, dict):
-            return "n/a"
-
-        location = most_recent_instance.get("location")
-        if not isinstance(location, dict):
-            return "n/a"
-
-        path = str(location.get("path") or "").strip()
-        if not path:
-            return "n/a"
-
-        start_line = location.get("start_line") or location.get("line")
-        end_line = location.get("end_line")
-
-        if isinstance(start_line, int):
-            if isinstance(end_line, int) and end_line > start_line:
-                return f"{path}:{start_line}-{end_line}"
-            return f"{path}:{start_line}"
-
-        return path
-
-    def _build_alert_issue_body(self, alert: dict[str, Any]) -> str:
-        rule = alert.get("rule") if isinstance(alert.get("rule"), dict) else {}
-        rule_id = str(rule.get("id") or "unknown")
-        severity = self._severity_from_alert(alert)
-        state = str(alert.get("state") or "unknown")
-        created_at = str(alert.get("created_at") or "unknown")
-        alert_url = str(alert.get("html_url") or "")
-        location = self._alert_location(alert)
-
-        return (
-            "Auto-created from GitHub Advanced Security code scanning alert.\n\n"
-            f"- Alert URL: {alert_url}\n"
-            f"- Rule ID: {rule_id}\n"
-            f"- Severity: {severity}\n"
-            f"- State: {state}\n"
-            f"- Created at: {created_at}\n"
-            f"- Affected file(s): {location}\n"
+        return tracked_alert_urls(
+            self._iter_rows(
+                f"repos/{owner}/{repo_name}/issues",
+                fields={"state": "all", "per_page": 100},
+            )
         )
 
-    @staticmethod
-    def _extract_alert_number_from_body(
-        body: str, *, owner: str, repo_name: str
-    ) -> int | None:
-        for match in ALERT_URL_RE.finditer(body):
-            if match.group("owner") != owner or match.group("repo") != repo_name:
-                continue
-            return int(match.group("alert_number"))
-        return None
-
-    @staticmethod
-    def _is_not_found(error: GhApiError) -> bool:
-        message = str(error).lower()
-        return "404" in message or "not found" in message
-
     def sync_closed_security_issues(self, repo: str) -> dict[str, int]:
         owner, repo_name = self._split_repo(repo)
-        issues_payload = self.client.api(
-            "GET",
+        linked: list[tuple[int, int]] = []
+        missing_link = 0
+        for issue in self._iter_rows(
             f"repos/{owner}/{repo_name}/issues",
             fields={"state": "closed", "labels": SECURITY_LABEL, "per_page": 100},
-        )
-        issues = (
-            [item for item in issues_payload if isinstance(item, dict)]
-            if isinstance(issues_payload, list)
-            else []
-        )
-
-        dismissed = 0
-        already_resolved = 0
-        missing_link = 0
-
-        for issue in issues:
+        ):
             if issue.get("pull_request"):
                 continue
 
@@ -364,20 +897,25 @@ class Workflow:
                 missing_link += 1
                 continue
 
-            alert_number = self._extract_alert_number_from_body(
+            alert_number = extract_alert_number_from_body(
                 body, owner=owner, repo_name=repo_name
             )
             if alert_number is None:
                 missing_link += 1
                 continue
+            linked.append((int(issue.get("number", 0)), alert_number))
 
+        dismissed = 0
+        already_resolved = 0
+
+        for issue_number, alert_number in linked:
             alert_path = (
                 f"repos/{owner}/{repo_name}/code-scanning/alerts/{alert_number}"
             )
             try:
                 alert = self.client.api("GET", alert_path)
             except GhApiError as error:
-                if self._is_not_found(error):
+                if is_not_found(error):
                     already_resolved += 1
                     continue
                 raise
@@ -387,15 +925,7 @@ class Workflow:
                 already_resolved += 1
                 continue
 
-            issue_number = int(issue.get("number", 0))
-            self.client.api_patch_json(
-                alert_path,
-                {
-                    "state": "dismissed",
-                    "dismissed_reason": "false positive",
-                    "dismissed_comment": f"Auto-dismissed: linked tracking issue #{issue_number} was closed.",
-                },
-            )
+            self.client.api_patch_json(alert_path, dismissal_payload(issue_number))
             dismissed += 1
 
         return {
@@ -404,79 +934,426 @@ class Workflow:
             "missing_link": missing_link,
         }
 
-    def sync_code_scanning_alerts(self, repo: str) -> dict[str, int]:
+    def _recent_alert_issue_exists(self, repo: str, alert_url: str) -> bool:
         owner, repo_name = self._split_repo(repo)
-        alerts_payload = self.client.api(
+        recent = self.client.api(
             "GET",
-            f"repos/{owner}/{repo_name}/code-scanning/alerts",
-            fields={"state": "open", "per_page": 100},
+            f"repos/{owner}/{repo_name}/issues",
+            fields={
+                "state": "all",
+                "sort": "created",
+                "direction": "desc",
+                "per_page": 30,
+            },
         )
-        alerts = (
-            [alert for alert in alerts_payload if isinstance(alert, dict)]
-            if isinstance(alerts_payload, list)
-            else []
+        return isinstance(recent, list) and any(
+            isinstance(issue, dict)
+            and alert_url in TRACKED_ALERT_URL_RE.findall(str(issue.get("body") or ""))
+            for issue in recent
+        )
+
+    def create_alert_issue(
+        self, repo: str, payload: dict[str, Any], alert_url: str
+    ) -> None:
+        """Create the tracking issue; never duplicate it on a transient failure.
+
+        POSTs are not retried by the client, and not here either. If one fails
+        transiently and the issue is not visible yet, the alert is recorded as
+        pending and the error raised; the next sync settles it.
+        """
+        owner, repo_name = self._split_repo(repo)
+        try:
+            self.client.api_post_json(f"repos/{owner}/{repo_name}/issues", payload)
+        except GhTransientError:
+            if alert_url and self._recent_alert_issue_exists(repo, alert_url):
+                return
+            if alert_url:
+                pending = self.state.get(PENDING_ALERT_ISSUES_NAMESPACE, repo) or []
+                self.state.put(
+                    PENDING_ALERT_ISSUES_NAMESPACE, repo, sorted({*pending, alert_url})
+                )
+            raise
+
+    @staticmethod
+    def _alert_cursor(alerts: list[dict[str, Any]], previous: str | None) -> str | None:
+        stamps = [str(alert["updated_at"]) for alert in alerts if alert.get("updated_at")]
+        if previous:
+            stamps.append(previous)
+        return max(stamps, key=parse_timestamp) if stamps else None
+
+    def _alert_cursor_current(self, cursor: Any) -> bool:
+        return (
+            isinstance(cursor, dict)
+            and bool(cursor.get("updated_at"))
+            and self.clock() - float(cursor.get("full_at", 0))
+            < self.alert_full_reconcile_seconds
         )
 
-        existing_bodies = self._list_issue_bodies(repo)
-        existing_labels = self._list_repo_labels(repo)
+    def _changed_alerts(
+        self, repo: str
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]] | None:
+        """Return alerts updated since the stored cursor, or None for a full reconcile.
+
+        The newest page is fetched with `sort=updated` and the stored ETag, so
+        an unchanged alert list costs a single 304. A full reconcile is forced
+        when there is no cursor, when it is due, or when the whole page is newer
+        than the cursor (more changes than one page can show).
+        """
+        api_conditional = getattr(self.client, "api_conditional", None)
+        cursor = self.state.get(ALERT_CURSORS_NAMESPACE, repo)
+        if api_conditional is None or not self._alert_cursor_current(cursor):
+            return None
+
+        owner, repo_name = self._split_repo(repo)
+        response = api_conditional(
+            f"repos/{owner}/{repo_name}/code-scanning/alerts",
+            fields={
+                "state": "open",
+                "sort": "updated",
+                "direction": "desc",
+                "per_page": _ALERT_PAGE_SIZE,
+            },
+            etag=cursor.get("etag"),
+        )
+        if response.not_modified:
+            return [], cursor
+
+        rows = [row for row in response.payload or [] if isinstance(row, dict)]
+        # `>=`: an alert updated in the cursor's own second may not have been
+        # seen yet; re-checking it is cheap because dedupe skips tracked URLs.
+        since = parse_timestamp(str(cursor["updated_at"]))
+        changed = [
+            project_alert(row)
+            for row in rows
+            if row.get("updated_at") and parse_timestamp(str(row["updated_at"])) >= since
+        ]
+        if len(rows) >= _ALERT_PAGE_SIZE and len(changed) == len(rows):
+            return None
+        return changed, {
+            **cursor,
+            "etag": response.etag,
+            "updated_at": self._alert_cursor(changed, str(cursor["updated_at"])),
+        }
+
+    def sync_code_scanning_alerts(self, repo: str) -> dict[str, int]:
+        """Open a queued security issue for every untracked open alert.
+
+        Runs incrementally from a persisted `updated_at` cursor when possible
+        and falls back to listing every open alert otherwise.
+        """
+        incremental = self._changed_alerts(repo)
+        if incremental is not None:
+            alerts, cursor = incremental
+        else:
+            owner, repo_name = self._split_repo(repo)
+            alerts = [
+                project_alert(alert)
+                for alert in self._iter_rows(
+                    f"repos/{owner}/{repo_name}/code-scanning/alerts",
+                    fields={"state": "open", "per_page": _ALERT_PAGE_SIZE},
+                )
+            ]
+            cursor = {
+                "updated_at": self._alert_cursor(alerts, None),
+                "etag": None,
+                "full_at": self.clock(),
+            }
 
         created = 0
         skipped_existing = 0
+        if not alerts:
+            self.state.put(ALERT_CURSORS_NAMESPACE, repo, cursor)
+            return {"created": created, "skipped_existing": skipped_existing}
+
+        tracked_urls = self._list_tracked_alert_urls(repo)
+        pending = set(self.state.get(PENDING_ALERT_ISSUES_NAMESPACE, repo) or [])
+        spec = desired_labels()
+        if self._labels_converged(repo, label_fingerprint(spec)):
+            existing_labels = set(spec)
+        else:
+            existing_labels = self._list_repo_labels(repo)
 
         for alert in alerts:
             alert_url = str(alert.get("html_url") or "").strip()
-            if alert_url and any(alert_url in body for body in existing_bodies):
+            if alert_url and (
+                alert_url in tracked_urls
+                or (
+                    alert_url in pending
+                    and self._recent_alert_issue_exists(repo, alert_url)
+                )
+            ):
                 skipped_existing += 1
                 continue
 
-            severity_label = f"{SEVERITY_PREFIX}{self._severity_from_alert(alert)}"
-            issue_labels = [SECURITY_STAGE_QUEUED, SECURITY_LABEL, severity_label]
-            self._ensure_labels_exist(repo, existing_labels, issue_labels)
-
-            issue_payload = {
-                "title": self._alert_title(alert),
-                "body": self._build_alert_issue_body(alert),
-                "labels": issue_labels,
-            }
-            self.client.api_post_json(
-                f"repos/{owner}/{repo_name}/issues", issue_payload
-            )
-            existing_bodies.append(issue_payload["body"])
+            issue_payload = alert_issue_payload(alert)
+            self._ensure_labels_exist(repo, existing_labels, issue_payload["labels"])
+            self.create_alert_issue(repo, issue_payload, alert_url)
+            if alert_url:
+                tracked_urls.add(alert_url)
             created += 1
 
+        if pending:
+            self.state.delete(PENDING_ALERT_ISSUES_NAMESPACE, repo)
+        self.state.put(ALERT_CURSORS_NAMESPACE, repo, cursor)
         return {"created": created, "skipped_existing": skipped_existing}
 
-    def run_tick(self, repo_cfg: RepoConfig) -> dict[str, Any]:
-        self.ensure_stage_labels(repo_cfg.name)
-        security_sync = self.sync_code_scanning_alerts(repo_cfg.name)
-        closed_security_sync = self.sync_closed_security_issues(repo_cfg.name)
-        cleaned = self.cleanup_closed_issue_stage_labels(repo_cfg.name)
-        pick = self.pick_next(repo_cfg)
-
-        base = {
-            "repo": repo_cfg.name,
-            "cleaned_closed": cleaned,
-            "security_created": security_sync["created"],
-            "security_skipped_existing": security_sync["skipped_existing"],
-            "security_closed_dismissed": closed_security_sync["dismissed"],
-            "security_closed_already_resolved": closed_security_sync[
-                "already_resolved"
-            ],
-            "security_closed_missing_link": closed_security_sync["missing_link"],
-        }
-
-        if not pick:
-            return {**base, "action": "no-work"}
-
-        number = int(pick["number"])
-        stage = str(pick["picked_from_stage"])
+    def _run_phase(
+        self,
+        repo: str,
+        phase: str,
+        run: Callable[[], Any],
+        deadline: float | None,
+    ) -> tuple[str, Any]:
+        """Run one tick phase under the deadline and the repo's circuit breaker.
+
+        Returns ("ok", value), ("error", message) or (skip reason, None).
+        """
+        key = f"{repo}:{phase}"
+        if not self.breaker.allow(key):
+            return "circuit-open", None
+        started = self.clock()
+        estimate = self._phase_estimates.get(phase, 0.0)
+        if deadline is not None and started + estimate > deadline:
+            return "deadline", None
+
+        try:
+            value = run()
+        except Exception as error:
+            self.breaker.record_failure(key)
+            return "error", phase_error_message(error)
+        finally:
+            elapsed = self.clock() - started
+            self._phase_estimates[phase] = (
+                elapsed
+                if phase not in self._phase_estimates
+                else 0.7 * estimate + 0.3 * elapsed
+            )
+        self.breaker.record_success(key)
+        return "ok", value
+
+    def _transition(self, repo_cfg: RepoConfig) -> dict[str, Any]:
+        unresolved: dict[str, str] = {}
+        picked = self._pick_issue(repo_cfg, unresolved=unresolved)
+        if picked is None:
+            return with_unresolved_teams({"action": "no-work"}, unresolved)
+
+        pick, issue = picked
+        new_status, action = transition_for(pick)
+        if new_status is not None:
+            self.set_status(
+                repo_cfg.name, pick.number, new_status, current_labels=issue.labels
+            )
+        return with_unresolved_teams(action, unresolved)
 
-        if stage == STAGE_QUEUED:
-            self.set_status(repo_cfg.name, number, STAGE_NEEDS_CLARIFICATION)
-            return {**base, "action": "moved-to-needs-clarification", "issue": number}
+    def _tick_reads(self, repo_cfg: RepoConfig) -> list[TickRead]:
+        """The listings this tick's phases will start with, given current state.
 
-        if stage == STAGE_READY_TO_IMPLEMENT:
-            self.set_status(repo_cfg.name, number, STAGE_IN_PROGRESS)
-            return {**base, "action": "moved-to-in-progress", "issue": number}
+        Phases whose circuit is open, and reads a phase will skip (converged
+        labels, server-side picks, incremental alert sync), are left out. Each
+        read carries the row projection its memoized result is stored under.
+        """
+        repo = repo_cfg.name
+        owner, repo_name = self._split_repo(repo)
+        issues_path = f"repos/{owner}/{repo_name}/issues"
+        reads: dict[str, TickRead | None] = {
+            "labels": (
+                None
+                if self._labels_converged(repo, label_fingerprint(desired_labels()))
+                else (
+                    f"repos/{owner}/{repo_name}/labels",
+                    {"per_page": 100},
+                    project_label_row,
+                )
+            ),
+            "pick": (
+                None
+                if self.server_side_pick
+                else (issues_path, {"state": "open", "per_page": 100}, project_issue_row)
+            ),
+            "cleanup_closed": (
+                issues_path,
+                {"state": "closed", "per_page": 100},
+                project_issue_row,
+            ),
+            "security_closed": (
+                issues_path,
+                {"state": "closed", "labels": SECURITY_LABEL, "per_page": 100},
+                partial(project_issue_row, body=True),
+            ),
+            "security_alerts": (
+                None
+                if getattr(self.client, "api_conditional", None) is not None
+                and self._alert_cursor_current(
+                    self.state.get(ALERT_CURSORS_NAMESPACE, repo)
+                )
+                else (
+                    f"repos/{owner}/{repo_name}/code-scanning/alerts",
+                    {"state": "open", "per_page": _ALERT_PAGE_SIZE},
+                    project_alert,
+                )
+            ),
+        }
+        return [
+            read
+            for phase, read in reads.items()
+            if read is not None and not self.breaker.is_open(f"{repo}:{phase}")
+        ]
+
+    def _prefetch(
+        self, path: str, fields: dict[str, Any], project: Callable[[Any], Any]
+    ) -> None:
+        try:
+            self.client.api_projected(path, fields=fields, project=project)
+        except GhApiError:
+            pass  # the phase repeats the read and reports the failure itself
+
+    @contextmanager
+    def _prefetch_tick_reads(self, repo_cfg: RepoConfig) -> Iterator[None]:
+        """Start the tick's independent listings concurrently.
+
+        Needs a client with `tick_scope` and `api_projected`: phases then join
+        the in-flight GET or hit its memoized, projected result, and writes
+        invalidate the reads they can affect, so phase order and outcomes are
+        unchanged. The prefetched keys live in a context variable, so
+        concurrent ticks on one workflow do not see each other's.
+        """
+        tick_scope = getattr(self.client, "tick_scope", None)
+        projected = getattr(self.client, "api_projected", None)
+        reads = (
+            self._tick_reads(repo_cfg)
+            if tick_scope is not None and projected is not None
+            else []
+        )
+        if len(reads) < 2:
+            yield
+            return
 
-        return {**base, "action": "continue-in-progress", "issue": number}
+        token = _PREFETCHED.set(
+            {request_key(path, fields): project for path, fields, project in reads}
+        )
+        try:
+            with tick_scope(), ThreadPoolExecutor(max_workers=len(reads)) as pool:
+                for path, fields, project in reads:
+                    pool.submit(self._prefetch, path, fields, project)
+                yield
+        finally:
+            _PREFETCHED.reset(token)
+
+    def _check_change_gate(
+        self, repo_cfg: RepoConfig
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """Return (last gate entry if the repo is unchanged, current ETag).
+
+        One conditional request for the most recently updated issue or PR;
+        labels, comments and state changes all bump `updated_at`. The stored
+        entry is ignored when a full tick is due or the repo's owners changed.
+
+        New or changed code-scanning alerts, edited label definitions and
+        `@org/team` membership changes leave the ETag alone. They wait for the
+        next full tick, up to `change_gate_full_tick_seconds`. So a ready issue
+        labeled by someone who only later joins an owner team is not picked
+        before then.
+        """
+        api_conditional = getattr(self.client, "api_conditional", None)
+        if api_conditional is None:
+            return None, None
+        entry = self.state.get(CHANGE_GATE_NAMESPACE, repo_cfg.name)
+        if (
+            not isinstance(entry, dict)
+            or entry.get("owners") != sorted(repo_cfg.owner_logins)
+            or self.clock() - float(entry.get("full_at", 0))
+            >= self.change_gate_full_tick_seconds
+        ):
+            entry = None
+
+        owner, repo_name = self._split_repo(repo_cfg.name)
+        try:
+            response = api_conditional(
+                f"repos/{owner}/{repo_name}/issues",
+                fields={
+                    "state": "all",
+                    "sort": "updated",
+                    "direction": "desc",
+                    "per_page": 1,
+                },
+                etag=entry.get("etag") if entry else None,
+            )
+        except GhApiError:
+            return None, None
+        if entry is not None and response.not_modified:
+            return entry, response.etag
+        return None, response.etag
+
+    def run_tick(
+        self, repo_cfg: RepoConfig, *, deadline: float | None = None
+    ) -> dict[str, Any]:
+        """Run one tick for a repo, most important phases first.
+
+        Picking/transition runs right after label reconciliation and the
+        security syncs run last. Phases that would overrun `deadline` (same
+        clock as `self.clock`) or whose circuit is open are skipped; API
+        failures are reported per phase instead of aborting the tick.
+
+        With `change_gate`, a repo whose issues did not change since its last
+        complete tick costs one 304 and reports `action: unchanged`.
+        """
+        repo = repo_cfg.name
+        result = new_tick_result(repo)
+        gate_etag: str | None = None
+        if self.change_gate:
+            unchanged, gate_etag = self._check_change_gate(repo_cfg)
+            if unchanged is not None:
+                last = unchanged["action"]
+                return finish_tick_result(
+                    result,
+                    {**last, "action": "unchanged", "last_action": last["action"]},
+                    skipped={},
+                    errors={},
+                    flow=self.metrics.snapshot(repo),
+                )
+        skipped: dict[str, str] = {}
+        errors: dict[str, str] = {}
+        action: dict[str, Any] = {"action": "skipped"}
+
+        runners: dict[str, Callable[[], Any]] = {
+            "labels": lambda: self.ensure_stage_labels(repo),
+            "pick": lambda: self._transition(repo_cfg),
+            "cleanup_closed": lambda: self.cleanup_closed_issue_stage_labels(repo),
+            "security_closed": lambda: self.sync_closed_security_issues(repo),
+            "security_alerts": lambda: self.sync_code_scanning_alerts(repo),
+        }
+        with self._prefetch_tick_reads(repo_cfg):
+            for phase in TICK_PHASES:
+                status, value = self._run_phase(repo, phase, runners[phase], deadline)
+                if status == "error":
+                    errors[phase] = value
+                elif status != "ok":
+                    skipped[phase] = status
+                elif phase == "pick":
+                    action = value
+                else:
+                    record_phase_result(result, phase, value)
+
+        self.metrics.flush(repo)
+        if gate_etag is not None and not skipped and not errors:
+            # The ETag predates this tick's own writes, so the next tick sees
+            # them as a change once and settles after that.
+            self.state.put(
+                CHANGE_GATE_NAMESPACE,
+                repo,
+                {
+                    "etag": gate_etag,
+                    "owners": sorted(repo_cfg.owner_logins),
+                    "full_at": self.clock(),
+                    "action": action,
+                },
+            )
+        elif self.change_gate:
+            self.state.delete(CHANGE_GATE_NAMESPACE, repo)
+        return finish_tick_result(
+            result,
+            action,
+            skipped=skipped,
+            errors=errors,
+            flow=self.metrics.snapshot(repo),
+        )
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Collection
+
+from gh_issue_workflow.aio import AsyncGhClient, AsyncWorkflow, run_ticks
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.gh_client import ConditionalResponse, GhApiError
+from gh_issue_workflow.workflow import Workflow
+
+# `gh api` stand-in: logs each invocation, then answers slowly with the path.
+FAKE_GH = """#!{python}
+import json, sys, time
+with open({log!r}, "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+time.sleep(0.3)
+print(json.dumps({{"path": sys.argv[4]}}))
+"""
+
+
+def test_async_client_runs_gets_concurrently_and_shares_identical_ones(
+    tmp_path: Path,
+) -> None:
+    log = tmp_path / "calls.log"
+    gh = tmp_path / "gh"
+    gh.write_text(FAKE_GH.format(python=sys.executable, log=str(log)))
+    gh.chmod(0o755)
+    client = AsyncGhClient(gh_bin=str(gh), dry_run=True)
+
+    async def main() -> list[Any]:
+        distinct = [client.api("GET", f"repos/acme/r{n}/issues") for n in range(10)]
+        shared = [client.api("GET", "repos/acme/hot/issues") for _ in range(5)]
+        write = client.api_post_json("repos/acme/r0/issues", {"title": "x"})
+        return await asyncio.gather(*distinct, *shared, write)
+
+    started = time.monotonic()
+    results = asyncio.run(main())
+
+    assert time.monotonic() - started < 2.5  # sequential would take ~3.3s
+    assert results[0] == {"path": "repos/acme/r0/issues"}
+    assert results[10:15] == [{"path": "repos/acme/hot/issues"}] * 5
+    assert results[15]["dry_run"] is True
+    assert len(log.read_text().splitlines()) == 11
+
+
+class FakeAsyncClient:
+    """Async twin of the sync fake below; tracks how many repos are in flight."""
+
+    def __init__(self, sync: Any) -> None:
+        self.sync = sync
+        self.active: dict[str, int] = {}
+        self.peak_repos = 0
+
+    async def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        repo = "/".join(path.split("/")[1:3])
+        self.active[repo] = self.active.get(repo, 0) + 1
+        self.peak_repos = max(self.peak_repos, len(self.active))
+        try:
+            await asyncio.sleep(0.001)
+            return self.sync.api(method, path, fields=fields)
+        finally:
+            self.active[repo] -= 1
+            if not self.active[repo]:
+                del self.active[repo]
+
+    async def api_conditional(
+        self,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        etag: str | None = None,
+    ) -> ConditionalResponse:
+        return self.sync.api_conditional(path, fields=fields, etag=etag)
+
+    async def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
+        return self.sync.api_patch_json(path, body)
+
+    async def api_post_json(self, path: str, body: dict[str, Any]) -> Any:
+        return self.sync.api_post_json(path, body)
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.writes: list[tuple[str, str, Any]] = []
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if method != "GET":
+            self.writes.append((method, path, fields))
+            return {}
+        if path.endswith("/events"):
+            return [
+                {
+                    "event": "labeled",
+                    "label": {"name": "stage:ready-to-implement"},
+                    "actor": {"login": "alice"},
+                }
+            ]
+        if path.endswith("/issues") and (fields or {}).get("state") == "open":
+            return [
+                {
+                    "number": 3,
+                    "created_at": "2026-02-03T00:00:00Z",
+                    "labels": [{"name": "stage:ready-to-implement"}],
+                },
+                {
+                    "number": 4,
+                    "created_at": "2026-02-01T00:00:00Z",
+                    "labels": [{"name": "stage:backlog"}],
+                },
+            ]
+        return []
+
+    def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
+        self.writes.append(("PATCH", path, body))
+        return {}
+
+    def api_post_json(self, path: str, body: dict[str, Any]) -> Any:
+        self.writes.append(("POST", path, body))
+        return {}
+
+
+def test_async_workflow_matches_sync_tick_and_bounds_concurrency() -> None:
+    repos = [RepoConfig(name=f"acme/r{n}", owner_logins=["alice"]) for n in range(40)]
+    sync_fake = FakeClient()
+    expected = [Workflow(sync_fake).run_tick(repo) for repo in repos]  # type: ignore[arg-type]
+
+    async_sync_fake = FakeClient()
+    client = FakeAsyncClient(async_sync_fake)
+    workflow = AsyncWorkflow(client)  # type: ignore[arg-type]
+    results = asyncio.run(run_ticks(workflow, repos, concurrency=8))
+
+    assert results == expected
+    assert results[0]["action"] == "moved-to-in-progress"
+    assert sorted(map(repr, async_sync_fake.writes)) == sorted(map(repr, sync_fake.writes))
+    assert 1 < client.peak_repos <= 8
+
+
+class FakeTeamClient(FakeClient):
+    """The ready label comes from `bob`, who is only an owner via a team."""
+
+    def __init__(self, *, hidden: Collection[str] = ()) -> None:
+        super().__init__()
+        self.member_fetches = 0
+        self.hidden = hidden
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if path.endswith("/events"):
+            return [
+                {
+                    "event": "labeled",
+                    "label": {"name": "stage:ready-to-implement"},
+                    "actor": {"login": "bob"},
+                }
+            ]
+        return super().api(method, path, fields=fields)
+
+    def api_conditional(
+        self,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        etag: str | None = None,
+    ) -> ConditionalResponse:
+        if path in self.hidden:
+            raise GhApiError(f"gh api GET {path} failed: HTTP 404: Not Found")
+        assert path == "orgs/acme/teams/maintainers/members"
+        self.member_fetches += 1
+        return ConditionalResponse(status=200, etag='"m1"', payload=[{"login": "bob"}])
+
+
+def test_async_tick_matches_sync_tick_with_team_owners() -> None:
+    repos = [
+        RepoConfig(name=f"acme/r{n}", owner_logins=["alice", "@acme/maintainers"])
+        for n in range(3)
+    ]
+    sync_fake = FakeTeamClient()
+    sync_workflow = Workflow(sync_fake)  # type: ignore[arg-type]
+    expected = [sync_workflow.run_tick(repo) for repo in repos]
+
+    async_fake = FakeTeamClient()
+    workflow = AsyncWorkflow(FakeAsyncClient(async_fake))  # type: ignore[arg-type]
+    results = asyncio.run(run_ticks(workflow, repos, concurrency=1))
+
+    assert results == expected
+    assert results[0]["action"] == "moved-to-in-progress"
+    assert sorted(map(repr, async_fake.writes)) == sorted(map(repr, sync_fake.writes))
+    assert async_fake.member_fetches == sync_fake.member_fetches == 1
+
+
+def test_async_tick_reports_unresolved_owner_teams_like_sync() -> None:
+    repo = RepoConfig(name="acme/r0", owner_logins=["@acme/hidden", "@acme/maintainers"])
+    hidden = {"orgs/acme/teams/hidden/members"}
+    expected = Workflow(FakeTeamClient(hidden=hidden)).run_tick(repo)  # type: ignore[arg-type]
+
+    async_fake = FakeTeamClient(hidden=hidden)
+    workflow = AsyncWorkflow(FakeAsyncClient(async_fake))  # type: ignore[arg-type]
+    result = asyncio.run(workflow.run_tick(repo))
+
+    assert result == expected
+    assert result["action"] == "moved-to-in-progress"
+    assert list(result["unresolved_owner_teams"]) == ["@acme/hidden"]
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from gh_issue_workflow.board import build_board, refresh_open_issues
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.gh_client import ConditionalResponse
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.workflow import Workflow
+
+
+def _issue_row(number: int, day: int, label: str) -> dict[str, Any]:
+    return {
+        "number": number,
+        "created_at": f"2026-02-{day:02d}T00:00:00Z",
+        "labels": [{"name": label}, {"name": "bug"}],
+    }
+
+
+class FakeIssuesClient:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.version = 1
+        self.conditional_calls: list[tuple[int, str | None]] = []
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if path.endswith("/events"):
+            return [
+                {
+                    "event": "labeled",
+                    "label": {"name": "stage:ready-to-implement"},
+                    "actor": {"login": "alice"},
+                }
+            ]
+        if path.endswith("/issues") and method == "GET":
+            page = int((fields or {}).get("page", 1))
+            per_page = int((fields or {}).get("per_page", 30))
+            return self.rows[(page - 1) * per_page : page * per_page]
+        raise AssertionError(f"Unexpected API call: {method} {path} {fields}")
+
+    def api_conditional(
+        self,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        etag: str | None = None,
+    ) -> ConditionalResponse:
+        page = int((fields or {}).get("page", 1))
+        self.conditional_calls.append((page, etag))
+        page_etag = f'"{page}-v{self.version}"'
+        if etag == page_etag:
+            return ConditionalResponse(status=304, etag=etag, payload=None)
+        rows = self.rows[(page - 1) * 100 : page * 100]
+        return ConditionalResponse(status=200, etag=page_etag, payload=rows)
+
+
+def test_board_is_served_from_state_written_by_a_tick(tmp_path: Path) -> None:
+    rows = [
+        _issue_row(1, 3, "stage:backlog"),
+        _issue_row(2, 5, "stage:ready-to-implement"),
+        _issue_row(3, 4, "stage:ready-to-implement"),
+        _issue_row(4, 1, "stage:blocked"),
+        {**_issue_row(5, 2, "stage:queued"), "pull_request": {"url": "x"}},
+    ]
+    wf = Workflow(FakeIssuesClient(rows), state=StateStore(tmp_path))  # type: ignore[arg-type]
+    pick = wf.pick_next(RepoConfig(name="acme/repo", owner_logins=["alice"]))
+
+    # A fresh store proves the board needs nothing but the files on disk.
+    report = build_board(StateStore(tmp_path), ["acme/repo", "acme/other"])
+
+    assert report["missing"] == ["acme/other"]
+    (board,) = report["repos"]
+    assert board["counts"]["stage:ready-to-implement"] == 2
+    assert board["counts"]["stage:queued"] == 0
+    assert board["oldest"]["stage:ready-to-implement"] == {
+        "number": 3,
+        "created_at": "2026-02-04T00:00:00Z",
+    }
+    assert list(board["oldest"]) == [
+        "stage:backlog",
+        "stage:ready-to-implement",
+        "stage:blocked",
+    ]
+    assert board["next_pick"] == pick == {
+        "number": 3,
+        "picked_from_stage": "stage:ready-to-implement",
+    }
+    assert report["totals"]["stage:blocked"] == 1
+
+
+def test_board_refresh_only_uses_conditional_requests(tmp_path: Path) -> None:
+    rows = [_issue_row(n, 1 + n % 27, "stage:backlog") for n in range(1, 151)]
+    client = FakeIssuesClient(rows)
+    store = StateStore(tmp_path)
+    Workflow(client, state=store).list_open_issues("acme/repo")  # type: ignore[arg-type]
+
+    refresh_open_issues(client, store, "acme/repo", now=2000.0)  # type: ignore[arg-type]
+    assert client.conditional_calls == [(1, None), (2, None)]
+
+    client.conditional_calls.clear()
+    refresh_open_issues(client, store, "acme/repo", now=3000.0)  # type: ignore[arg-type]
+    assert client.conditional_calls == [(1, '"1-v1"'), (2, '"2-v1"')]
+    assert build_board(store, ["acme/repo"])["totals"]["stage:backlog"] == 150
+
+    rows[120] = _issue_row(121, 9, "stage:queued")
+    client.version = 2
+    refresh_open_issues(client, store, "acme/repo", now=4000.0)  # type: ignore[arg-type]
+    (board,) = build_board(store, ["acme/repo"])["repos"]
+    assert board["counts"]["stage:queued"] == 1
+    assert board["next_pick"] == {"number": 121, "picked_from_stage": "stage:queued"}
+    assert board["fetched_at"] == "1970-01-01T01:06:40Z"
+
+
+def test_listing_a_repo_rewrites_only_its_own_cache_file(tmp_path: Path) -> None:
+    rows = [_issue_row(n, 1 + n % 27, "stage:backlog") for n in range(1, 41)]
+    wf = Workflow(FakeIssuesClient(rows), state=StateStore(tmp_path))  # type: ignore[arg-type]
+    wf.list_open_issues("acme/one")
+    one = tmp_path / "open_issues" / "acme%2Fone.json"
+    written = (one.stat().st_ino, one.stat().st_mtime_ns)
+
+    for _ in range(3):
+        wf.list_open_issues("acme/two")
+
+    assert (one.stat().st_ino, one.stat().st_mtime_ns) == written
+    assert sorted(path.name for path in (tmp_path / "open_issues").iterdir()) == [
+        "acme%2Fone.json",
+        "acme%2Ftwo.json",
+    ]
+    assert build_board(StateStore(tmp_path), ["acme/one", "acme/two"])["missing"] == []
+
+
+def test_board_reads_a_cache_written_before_per_repo_files(tmp_path: Path) -> None:
+    rows = [_issue_row(1, 3, "stage:queued")]
+    legacy = StateStore(tmp_path / "legacy")
+    Workflow(FakeIssuesClient(rows), state=legacy).list_open_issues("acme/repo")  # type: ignore[arg-type]
+    cached = legacy.get("open_issues", "acme/repo")
+    (tmp_path / "open_issues.json").write_text(json.dumps({"acme/repo": cached}))
+
+    (board,) = build_board(StateStore(tmp_path), ["acme/repo"])["repos"]
+    assert board["counts"]["stage:queued"] == 1
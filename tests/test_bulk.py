@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any
+
+from gh_issue_workflow.bulk import WriteThrottle, parse_operations, run_bulk
+from gh_issue_workflow.gh_client import GhApiError
+from gh_issue_workflow.workflow import Workflow
+
+
+class FakeIssueClient:
+    def __init__(self, *, failing_issue: int | None = None) -> None:
+        self.failing_issue = failing_issue
+        self.lock = threading.Lock()
+        self.writes: list[tuple[str, Any]] = []
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if self.failing_issue is not None and path.endswith(f"/issues/{self.failing_issue}"):
+            raise GhApiError("HTTP 404: Not Found")
+        if method == "GET":
+            return {"labels": [{"name": "bug"}, {"name": "stage:queued"}]}
+        with self.lock:
+            self.writes.append((path, fields))
+        return {}
+
+    def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
+        with self.lock:
+            self.writes.append((path, body))
+        return {}
+
+
+def _lines(*rows: dict[str, Any]) -> list[str]:
+    return [json.dumps(row) for row in rows]
+
+
+def test_parse_operations_reports_invalid_lines() -> None:
+    lines = _lines(
+        {"repo": "acme/a", "issue": 1, "status": "stage:in-progress"},
+        {"repo": "acme/a", "issue": 2, "status": "stage:unknown"},
+        {"repo": "acme/a", "status": "stage:queued"},
+    ) + ["", "not json"]
+
+    ops, errors = parse_operations(lines, kind="set-status")
+
+    assert [op.issue for op in ops] == [1]
+    assert [error["line"] for error in errors] == [2, 3, 5]
+    assert all(error["ok"] is False for error in errors)
+
+
+def test_run_bulk_groups_by_repo_and_reports_partial_failures() -> None:
+    fake = FakeIssueClient(failing_issue=3)
+    ops, _ = parse_operations(
+        _lines(
+            {"repo": "acme/a", "issue": 1, "status": "stage:in-progress"},
+            {"repo": "acme/b", "issue": 3, "status": "stage:blocked"},
+            {"repo": "acme/a", "issue": 2, "status": "stage:in-review"},
+        ),
+        kind="set-status",
+    )
+
+    results = list(
+        run_bulk(Workflow(fake), ops, kind="set-status", concurrency=2)  # type: ignore[arg-type]
+    )
+
+    by_line = {result["line"]: result for result in results}
+    assert len(results) == 3
+    assert by_line[1]["ok"] and by_line[3]["ok"]
+    assert by_line[2]["ok"] is False and "404" in by_line[2]["error"]
+    a_writes = [path for path, _ in fake.writes if "/acme/a/" in path]
+    assert a_writes == ["repos/acme/a/issues/1", "repos/acme/a/issues/2"]
+
+
+def test_run_bulk_posts_comments() -> None:
+    fake = FakeIssueClient()
+    ops, _ = parse_operations(
+        _lines({"repo": "acme/a", "issue": 7, "body": "Which version?"}), kind="comment"
+    )
+
+    results = list(run_bulk(Workflow(fake), ops, kind="comment"))  # type: ignore[arg-type]
+
+    assert results == [
+        {"event": "comment", "line": 1, "repo": "acme/a", "issue": 7, "ok": True}
+    ]
+    assert fake.writes == [("repos/acme/a/issues/7/comments", {"body": "Which version?"})]
+
+
+def test_write_throttle_spaces_slots() -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    throttle = WriteThrottle(60, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        throttle.wait()
+
+    assert sleeps == [1.0, 2.0]
@@ -29,3 +29,44 @@ def test_load_config_yaml(tmp_path: Path) -> None:
     assert len(parsed.repos) == 1
     assert parsed.repos[0].name == "acme/repo2"
     assert parsed.repos[0].owner_logins == ["bob"]
+
+
+def test_load_config_orgs_with_globs_and_defaults(tmp_path: Path) -> None:
+    cfg = tmp_path / "config.yaml"
+    cfg.write_text(
+        "inventory_refresh_seconds: 600\n"
+        "orgs:\n"
+        "  - name: acme\n"
+        "    include: ['svc-*']\n"
+        "    exclude: ['svc-legacy*']\n"
+        "    owner_logins: [carol]\n"
+        "  - name: other\n",
+        encoding="utf-8",
+    )
+
+    parsed = load_config(cfg)
+    assert parsed.repos == []
+    assert parsed.inventory_refresh_seconds == 600
+    assert parsed.orgs[0].include == ["svc-*"]
+    assert parsed.orgs[0].exclude == ["svc-legacy*"]
+    assert parsed.orgs[0].owner_logins == ["carol"]
+    assert parsed.orgs[1].include == ["*"]
+
+
+def test_load_config_credentials_default_to_pooled_when_unscoped(tmp_path: Path) -> None:
+    cfg = tmp_path / "config.yaml"
+    cfg.write_text(
+        "credentials:\n"
+        "  - name: bot-1\n"
+        "    token_env: GH_TOKEN_BOT_1\n"
+        "  - name: bigcorp-app\n"
+        "    token_env: GH_TOKEN_BIGCORP\n"
+        "    orgs: [bigcorp]\n",
+        encoding="utf-8",
+    )
+
+    parsed = load_config(cfg)
+    assert [c.name for c in parsed.credentials] == ["bot-1", "bigcorp-app"]
+    assert parsed.credentials[0].pooled is True
+    assert parsed.credentials[1].pooled is False
+    assert parsed.credentials[1].orgs == ["bigcorp"]
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from gh_issue_workflow.config import CredentialConfig
+from gh_issue_workflow.credentials import Credential, CredentialPool
+from gh_issue_workflow.gh_client import GhApiError, GhClient
+
+# Minimal `gh api` stand-in: forwards the request to the local quota server
+# under $GH_TOKEN and prints the response like gh does (with --include).
+FAKE_GH = """
+import json, os, sys, urllib.error, urllib.request
+argv = sys.argv[2:]
+method, path, include = "GET", None, False
+while argv:
+    arg = argv.pop(0)
+    if arg == "--method":
+        method = argv.pop(0)
+    elif arg == "--include":
+        include = True
+    elif arg in ("-f", "-H"):
+        argv.pop(0)
+    else:
+        path = arg
+request = urllib.request.Request(
+    os.environ["FAKE_GH_SERVER"] + "/" + path,
+    method=method,
+    headers={"Authorization": "token " + os.environ.get("GH_TOKEN", "")},
+)
+try:
+    response = urllib.request.urlopen(request)
+    status, headers, body, code = response.status, response.headers, response.read(), 0
+except urllib.error.HTTPError as error:
+    status, headers, body, code = error.code, error.headers, error.read(), 1
+if include:
+    print(f"HTTP/1.1 {status}")
+    for key, value in headers.items():
+        print(f"{key}: {value}")
+    print()
+print(body.decode())
+if code:
+    sys.stderr.write(f"gh: {json.loads(body)['message']} (HTTP {status})")
+sys.exit(code)
+"""
+
+
+class QuotaServer(ThreadingHTTPServer):
+    def __init__(self, quotas: dict[str, int]) -> None:
+        super().__init__(("127.0.0.1", 0), QuotaHandler)
+        self.quotas = quotas
+        self.served: dict[str, int] = {token: 0 for token in quotas}
+        self.lock = threading.Lock()
+
+
+class QuotaHandler(BaseHTTPRequestHandler):
+    server: QuotaServer
+
+    def do_GET(self) -> None:
+        token = self.headers.get("Authorization", "").removeprefix("token ")
+        with self.server.lock:
+            limit = self.server.quotas.get(token)
+            used = self.server.served.get(token, 0)
+            allowed = limit is not None and used < limit
+            if allowed:
+                self.server.served[token] = used + 1
+                used += 1
+        if limit is None:
+            self._reply(401, {"message": "Bad credentials"}, 0, 0)
+        elif not allowed:
+            self._reply(403, {"message": "API rate limit exceeded"}, limit, 0)
+        elif self.path.endswith("/issues"):
+            self._reply(200, [{"path": self.path}], limit, limit - used)
+        else:
+            self._reply(200, {"path": self.path}, limit, limit - used)
+
+    def _reply(self, status: int, body: Any, limit: int, remaining: int) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("X-RateLimit-Limit", str(limit))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def quota_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[QuotaServer]:
+    server = QuotaServer({"token-a": 4, "token-b": 4, "token-c": 100})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("FAKE_GH_SERVER", f"http://127.0.0.1:{server.server_port}")
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def fake_gh(tmp_path: Path) -> str:
+    script = tmp_path / "gh"
+    script.write_text(f"#!{sys.executable}\n{FAKE_GH}", encoding="utf-8")
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_pool_spreads_requests_and_stops_at_per_token_quotas(
+    quota_server: QuotaServer, fake_gh: str
+) -> None:
+    pool = CredentialPool(
+        [Credential(name="a", token="token-a"), Credential(name="b", token="token-b")]
+    )
+    client = GhClient(credentials=pool, gh_bin=fake_gh, max_retries=0)
+
+    for number in range(8):
+        assert client.api("GET", f"repos/acme/repo/issues/{number}") == {
+            "path": f"/repos/acme/repo/issues/{number}"
+        }
+
+    assert quota_server.served == {"token-a": 4, "token-b": 4, "token-c": 0}
+    assert pool.snapshot() == {"a": 0, "b": 0}
+    with pytest.raises(GhApiError, match="rate limit"):
+        client.api("GET", "repos/acme/repo/issues/99")
+
+
+def test_scoped_credentials_serve_their_repos_only(
+    quota_server: QuotaServer, fake_gh: str
+) -> None:
+    pool = CredentialPool(
+        [
+            Credential(name="a", token="token-a"),
+            Credential(name="c", token="token-c", orgs=("bigcorp",), pooled=False),
+        ]
+    )
+    client = GhClient(credentials=pool, gh_bin=fake_gh, max_retries=0)
+
+    for number in range(3):
+        client.api("GET", f"repos/bigcorp/api/issues/{number}")
+    client.api("GET", "orgs/bigcorp/repos")
+    client.api("GET", "repos/acme/repo/labels")
+
+    assert quota_server.served == {"token-a": 1, "token-b": 0, "token-c": 4}
+
+
+def test_streamed_listings_record_headers_without_leaking_them(
+    quota_server: QuotaServer, fake_gh: str
+) -> None:
+    pool = CredentialPool(
+        [Credential(name="a", token="token-a"), Credential(name="b", token="token-b")]
+    )
+    client = GhClient(credentials=pool, gh_bin=fake_gh, max_retries=0)
+
+    for _ in range(6):
+        assert list(client.api_iter("GET", "repos/acme/repo/issues")) == [
+            {"path": "/repos/acme/repo/issues"}
+        ]
+
+    assert quota_server.served == {"token-a": 3, "token-b": 3, "token-c": 0}
+    assert pool.snapshot() == {"a": 1, "b": 1}
+
+
+def test_hedged_reads_run_under_the_pool_and_record_headers(
+    quota_server: QuotaServer, fake_gh: str
+) -> None:
+    pool = CredentialPool([Credential(name="a", token="token-a")])
+    client = GhClient(credentials=pool, gh_bin=fake_gh, max_retries=0)
+    args = [fake_gh, "api", "--method", "GET", "repos/acme/repo/issues/1"]
+
+    proc = client._execute_hedged(args, hedge_after=30)
+
+    assert proc.returncode == 0
+    assert json.loads(proc.stdout) == {"path": "/repos/acme/repo/issues/1"}
+    assert quota_server.served["token-a"] == 1
+    assert pool.snapshot() == {"a": 3}
+
+
+def test_pool_from_config_reads_tokens_from_environment() -> None:
+    configs = [CredentialConfig(name="a", token_env="TOKEN_A", pooled=True)]
+
+    pool = CredentialPool.from_config(configs, environ={"TOKEN_A": "secret"})
+    assert pool.credentials[0].token == "secret"
+
+    with pytest.raises(ValueError, match="TOKEN_A"):
+        CredentialPool.from_config(configs, environ={})
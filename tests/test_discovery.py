@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from gh_issue_workflow.config import AppConfig, OrgConfig, RepoConfig
+from gh_issue_workflow.discovery import discover_repos
+from gh_issue_workflow.gh_client import ConditionalResponse
+from gh_issue_workflow.state import StateStore
+
+
+class FakeInventoryClient:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.calls: list[tuple[str, dict[str, Any] | None, str | None]] = []
+
+    def api_conditional(
+        self,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        etag: str | None = None,
+    ) -> ConditionalResponse:
+        self.calls.append((path, fields, etag))
+        page = int((fields or {}).get("page", 1))
+        rows = self.rows[(page - 1) * 100 : page * 100]
+        page_etag = f'"{page}-{len(self.rows)}"'
+        if etag == page_etag:
+            return ConditionalResponse(status=304, etag=etag, payload=None)
+        return ConditionalResponse(status=200, etag=page_etag, payload=rows)
+
+
+def _row(name: str, **extra: Any) -> dict[str, Any]:
+    return {"full_name": f"acme/{name}", "archived": False, "has_issues": True, **extra}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cfg() -> AppConfig:
+    return AppConfig(
+        repos=[RepoConfig(name="acme/svc-api", owner_logins=["alice"])],
+        orgs=[
+            OrgConfig(
+                name="acme",
+                include=["svc-*"],
+                exclude=["svc-legacy*"],
+                owner_logins=["carol"],
+            )
+        ],
+        inventory_refresh_seconds=600,
+    )
+
+
+def test_discover_repos_filters_globs_archived_and_issue_disabled() -> None:
+    client = FakeInventoryClient(
+        [
+            _row("svc-api"),
+            _row("svc-web"),
+            _row("svc-legacy-1"),
+            _row("svc-old", archived=True),
+            _row("svc-wiki", has_issues=False),
+            _row("docs"),
+        ]
+    )
+
+    repos = discover_repos(_cfg(), client, StateStore(), clock=Clock())  # type: ignore[arg-type]
+
+    assert repos == [
+        RepoConfig(name="acme/svc-api", owner_logins=["alice"]),
+        RepoConfig(name="acme/svc-web", owner_logins=["carol"]),
+    ]
+
+
+def test_discover_repos_uses_cache_then_revalidates_pages_with_etags(tmp_path: Path) -> None:
+    client = FakeInventoryClient([_row(f"svc-{i}") for i in range(150)])
+    clock = Clock()
+
+    first = discover_repos(_cfg(), client, StateStore(tmp_path), clock=clock)  # type: ignore[arg-type]
+    assert len(client.calls) == 2
+    assert [etag for _, _, etag in client.calls] == [None, None]
+
+    clock.now += 60
+    cached = discover_repos(_cfg(), client, StateStore(tmp_path), clock=clock)  # type: ignore[arg-type]
+    assert cached == first
+    assert len(client.calls) == 2
+
+    clock.now += 600
+    revalidated = discover_repos(_cfg(), client, StateStore(tmp_path), clock=clock)  # type: ignore[arg-type]
+    assert revalidated == first
+    assert [etag for _, _, etag in client.calls[2:]] == ['"1-150"', '"2-150"']
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "differential_harness.py"
+_SPEC = importlib.util.spec_from_file_location("differential_harness", _SCRIPT)
+harness = importlib.util.module_from_spec(_SPEC)
+sys.modules[_SPEC.name] = harness
+_SPEC.loader.exec_module(harness)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_engines_match_reference_tick(seed: int) -> None:
+    report = harness.run_harness(seed=seed, repos=4, issues=80, alerts=25, rounds=3)
+
+    assert report["mismatches"] == []
+    assert report["intentional_dedupe_differences"] > 0
+    assert set(report["engines"]) == {"tick", "server-side", "change-gate", "plan", "async", "global"}
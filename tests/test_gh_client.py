@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from gh_issue_workflow.gh_client import (
+    GhApiError,
+    GhClient,
+    GhTransientError,
+    iter_json_array_items,
+    parse_include_output,
+    strip_include_head,
+)
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def test_iter_json_array_items_decodes_across_chunk_boundaries() -> None:
+    rows = [{"number": n, "body": "x" * n, "labels": [{"name": "bug"}]} for n in range(40)]
+    text = json.dumps(rows)
+
+    for size in (1, 7, 64, len(text)):
+        assert list(iter_json_array_items(_chunks(text, size))) == rows
+
+
+def test_iter_json_array_items_handles_concatenated_pages_and_scalars() -> None:
+    text = "[1, 23, 456]\n[7890]\n[]"
+
+    assert list(iter_json_array_items(_chunks(text, 2))) == [1, 23, 456, 7890]
+
+
+def test_iter_json_array_items_skips_top_level_objects() -> None:
+    assert list(iter_json_array_items(['{"message": "Not Found"}'])) == []
+
+
+def test_iter_json_array_items_rejects_truncated_array() -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_array_items(['[{"number": 1}, {"num']))
+
+
+def test_api_iter_decodes_split_multi_page_gh_output(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pages = [
+        [{"number": n, "body": "line\n" * n, "labels": [{"name": "bug"}]} for n in range(1, 4)],
+        [{"number": 4, "body": "\"quoted\" ]["}],
+    ]
+    output = "".join(json.dumps(page) for page in pages)
+    # A fake gh that flushes its output in small pieces, as `--paginate` does.
+    gh = tmp_path / "gh"
+    gh.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, time\n"
+        f"out = {output!r}\n"
+        "for i in range(0, len(out), 5):\n"
+        "    sys.stdout.write(out[i : i + 5])\n"
+        "    sys.stdout.flush()\n"
+        "    time.sleep(0.001)\n"
+    )
+    gh.chmod(0o755)
+    monkeypatch.setattr("gh_issue_workflow.gh_client._STREAM_CHUNK_CHARS", 3)
+    client = GhClient(gh_bin=str(gh))
+
+    rows = list(client.api_iter("GET", "repos/a/b/issues", fields={"per_page": 100}))
+
+    assert rows == [row for page in pages for row in page]
+
+
+def test_parse_include_output_splits_status_headers_and_body() -> None:
+    output = 'HTTP/2.0 200 OK\r\nEtag: W/"abc"\r\nX-Ratelimit-Remaining: 42\r\n\r\n[{"id": 1}]'
+
+    status, headers, body = parse_include_output(output)
+
+    assert status == 200
+    assert headers["etag"] == 'W/"abc"'
+    assert headers["x-ratelimit-remaining"] == "42"
+    assert json.loads(body) == [{"id": 1}]
+
+
+def test_strip_include_head_passes_the_body_through_any_chunking() -> None:
+    output = "HTTP/2.0 200 OK\r\nX-Ratelimit-Remaining: 41\r\n\r\n[1, 2, 3]"
+
+    for size in (1, 3, len(output)):
+        seen: list[dict[str, str]] = []
+        body = "".join(strip_include_head(_chunks(output, size), seen.append))
+        assert json.loads(body) == [1, 2, 3]
+        assert seen == [{"x-ratelimit-remaining": "41"}]
+
+
+def test_parse_include_output_not_modified_has_empty_body() -> None:
+    status, _, body = parse_include_output('HTTP/2.0 304 Not Modified\nEtag: "x"\n\n')
+
+    assert status == 304
+    assert body == ""
+
+
+class CountingClient(GhClient):
+    def __init__(self, *, delay: float = 0.0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.runs: list[list[str]] = []
+        self.lock = threading.Lock()
+
+    def _run_json(self, args: list[str], *, stdin_json: dict[str, Any] | None = None) -> Any:
+        with self.lock:
+            self.runs.append(args)
+        time.sleep(self.delay)
+        path = args[4]
+        if path.endswith("/issues"):
+            if "state=closed" in args:
+                return [{"number": 3, "labels": [{"name": "security"}]}]
+            return [{"number": 10, "labels": [{"name": "stage:queued"}]}]
+        return {"path": path}
+
+
+def test_concurrent_identical_gets_share_one_request() -> None:
+    client = CountingClient(delay=0.05)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: client.api("GET", "repos/a/b/labels"), range(8)))
+
+    assert len(client.runs) == 1
+    assert all(result == {"path": "repos/a/b/labels"} for result in results)
+
+
+def test_tick_scope_memoizes_gets_and_seeds_issues_from_listing() -> None:
+    client = CountingClient()
+
+    with client.tick_scope():
+        client.api("GET", "repos/a/b/labels", fields={"per_page": 100})
+        client.api("GET", "repos/a/b/labels", fields={"per_page": 100})
+        client.api("GET", "repos/a/b/issues", fields={"state": "open"})
+        issue = client.api("GET", "repos/a/b/issues/10")
+    assert len(client.runs) == 2
+    assert issue["labels"] == [{"name": "stage:queued"}]
+
+    client.api("GET", "repos/a/b/labels", fields={"per_page": 100})
+    assert len(client.runs) == 3
+
+
+def test_writes_invalidate_memoized_reads_of_the_resource() -> None:
+    client = CountingClient()
+
+    with client.tick_scope():
+        client.api("GET", "repos/a/b/issues", fields={"state": "open"})
+        client.api("GET", "repos/a/b/labels")
+        client.api_patch_json("repos/a/b/issues/10", {"labels": []})
+        client.api("GET", "repos/a/b/issues/10")
+        client.api("GET", "repos/a/b/issues", fields={"state": "open"})
+        client.api("GET", "repos/a/b/labels")
+
+    gets = [args[4] for args in client.runs if args[3] == "GET"]
+    assert gets == [
+        "repos/a/b/issues",
+        "repos/a/b/labels",
+        "repos/a/b/issues/10",
+        "repos/a/b/issues",
+    ]
+
+
+def test_label_patch_keeps_listings_it_cannot_change() -> None:
+    client = CountingClient()
+    closed = {"state": "closed", "per_page": 100}
+    closed_security = {"state": "closed", "labels": "security", "per_page": 100}
+    recent = {"state": "all", "sort": "updated", "per_page": 1}
+
+    with client.tick_scope():
+        for fields in (closed, closed_security, recent):
+            client.api("GET", "repos/a/b/issues", fields=fields)
+        client.api_patch_json("repos/a/b/issues/10", {"labels": ["stage:in-progress"]})
+        for fields in (closed, closed_security, recent):
+            client.api("GET", "repos/a/b/issues", fields=fields)
+        client.api_patch_json("repos/a/b/issues/10", {"labels": ["security"]})
+        for fields in (closed, closed_security):
+            client.api("GET", "repos/a/b/issues", fields=fields)
+
+    listings = [args for args in client.runs if args[3] == "GET"]
+    # The first PATCH only re-reads the updated-order listing; the second
+    # adds `security`, which the filtered listing may now include.
+    assert len(listings) == 3 + 1 + 1
+    assert "labels=security" in listings[-1]
+
+
+def test_label_patch_during_a_listing_that_contains_the_issue_is_not_reused() -> None:
+    client = CountingClient(delay=0.1)
+
+    with client.tick_scope(), ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(client.api, "GET", "repos/a/b/issues", fields={"state": "open"})
+        time.sleep(0.05)
+        client.api_patch_json("repos/a/b/issues/10", {"labels": []})
+        pending.result()
+        client.api("GET", "repos/a/b/issues", fields={"state": "open"})
+
+    assert [args[4] for args in client.runs if args[3] == "GET"] == [
+        "repos/a/b/issues",
+        "repos/a/b/issues",
+    ]
+
+
+class ScriptedClient(GhClient):
+    """Replays canned (returncode, stdout, stderr) attempts instead of running gh."""
+
+    def __init__(self, attempts: list[tuple[int, str, str]]) -> None:
+        super().__init__(backoff_seconds=1.0)
+        self.attempts = attempts
+        self.executed: list[list[str]] = []
+        self.sleeps: list[float] = []
+        self.sleep = self.sleeps.append
+
+    def _execute(
+        self, args: list[str], stdin_json: dict[str, Any] | None
+    ) -> subprocess.CompletedProcess[str]:
+        self.executed.append(args)
+        code, out, err = self.attempts.pop(0)
+        return subprocess.CompletedProcess(args, code, out, err)
+
+
+def test_gets_retry_5xx_and_timeouts_with_jittered_backoff() -> None:
+    client = ScriptedClient(
+        [
+            (1, "", "HTTP 502: Bad Gateway"),
+            (-9, "", "gh api timed out after 60.0s"),
+            (0, '{"ok": true}', ""),
+        ]
+    )
+
+    assert client.api("GET", "repos/a/b/issues/1") == {"ok": True}
+    assert len(client.executed) == 3
+    assert 0 <= client.sleeps[0] <= 1.0 and 0 <= client.sleeps[1] <= 2.0
+
+
+def test_posts_are_not_retried_on_transient_failures() -> None:
+    client = ScriptedClient([(1, "", "HTTP 503: Service Unavailable")])
+
+    with pytest.raises(GhTransientError):
+        client.api_post_json("repos/a/b/issues", {"title": "x"})
+    assert len(client.executed) == 1
+
+
+def test_permanent_errors_are_not_retried() -> None:
+    client = ScriptedClient([(1, "", "HTTP 404: Not Found")])
+
+    with pytest.raises(GhApiError) as error:
+        client.api("GET", "repos/a/b/issues/1")
+    assert not isinstance(error.value, GhTransientError)
+    assert len(client.executed) == 1
+
+
+def test_hedged_read_returns_faster_second_attempt(tmp_path: Path) -> None:
+    marker = tmp_path / "first-started"
+    script = (
+        "import pathlib, sys, time\n"
+        f"marker = pathlib.Path({str(marker)!r})\n"
+        "if not marker.exists():\n"
+        "    marker.write_text('x')\n"
+        "    time.sleep(10)\n"
+        "print('[1]')\n"
+    )
+    client = GhClient(timeout_seconds=20)
+
+    started = time.monotonic()
+    proc = client._execute_hedged([sys.executable, "-c", script], hedge_after=0.2)
+
+    assert proc.returncode == 0
+    assert proc.stdout.strip() == "[1]"
+    assert time.monotonic() - started < 5
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import gc
+import io
+import json
+import subprocess
+import tracemalloc
+from typing import Any
+
+import pytest
+
+from gh_issue_workflow import gh_client
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.gh_client import GhClient
+from gh_issue_workflow.resilience import CircuitBreaker
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.workflow import _PREFETCHED, TICK_PHASES, Workflow
+
+# Ready issues carry a few label events; closed issues keep a stage label.
+_STAGES = ["stage:backlog", "stage:ready-to-implement", "stage:queued", "stage:blocked"]
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SyntheticProcess:
+    """Stands in for a finished `gh` process whose stdout is `output`."""
+
+    def __init__(self, args: list[str], output: str) -> None:
+        self.args = args
+        self.stdout = io.StringIO(output)
+        self.returncode = 0
+
+    def poll(self) -> int:
+        return self.returncode
+
+    def wait(self) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        pass
+
+
+class SyntheticGhClient(GhClient):
+    """Real client (memo, single-flight, latencies, streaming) over a generated API.
+
+    Every tick half of each repo's open issues and all of its alerts are
+    new, so anything keyed by issue, event or alert that is never pruned
+    shows up as growth. Buffered calls go through `_execute` and streamed
+    ones through `popen`, which the tests install as `subprocess.Popen`.
+    """
+
+    def __init__(self, size: int) -> None:
+        super().__init__(max_retries=1)
+        self.sleep = lambda _: None
+        self.size = size
+        self.tick = 0
+        self.streamed = 0
+
+    def _open_issues(self) -> list[dict[str, Any]]:
+        stable = self.size // 2
+        rolling = [100_000 + self.tick * self.size + n for n in range(self.size - stable)]
+        return [
+            {
+                "number": number,
+                "created_at": f"2026-01-01T00:{number % 60:02d}:00Z",
+                "labels": [{"name": _STAGES[number % len(_STAGES)]}],
+            }
+            for number in [*range(1, stable + 1), *rolling]
+        ]
+
+    def _alerts(self, owner: str, repo: str) -> list[dict[str, Any]]:
+        return [
+            {
+                "number": number,
+                "html_url": f"https://github.com/{owner}/{repo}/security/code-scanning/{number}",
+                "state": "open",
+                "updated_at": f"2026-02-{1 + self.tick % 28:02d}T00:00:00Z",
+                "rule": {"id": f"rule-{number % 7}", "security_severity_level": "low"},
+            }
+            for number in range(self.tick * 3, self.tick * 3 + 3)
+        ]
+
+    def _respond(self, method: str, path: str, fields: dict[str, str]) -> Any:
+        parts = path.split("/")
+        owner, repo = parts[1], parts[2]
+        if method != "GET":
+            return {}
+        if path.endswith("/events"):
+            number = int(parts[-2])
+            return [
+                {
+                    "id": number * 10,
+                    "event": "labeled",
+                    "created_at": "2026-01-01T00:00:00Z",
+                    "label": {"name": "stage:queued"},
+                    "actor": {"login": "alice"},
+                },
+                {
+                    "id": number * 10 + 1,
+                    "event": "labeled",
+                    "created_at": "2026-01-02T00:00:00Z",
+                    "label": {"name": "stage:ready-to-implement"},
+                    "actor": {"login": "alice"},
+                },
+            ]
+        if parts[3:] == ["labels"]:
+            return []
+        if parts[3:5] == ["code-scanning", "alerts"]:
+            if len(parts) == 6:
+                return {"state": "fixed"}
+            return self._alerts(owner, repo)
+        if parts[3:] == ["issues"]:
+            state = fields.get("state")
+            if state == "open":
+                return self._open_issues()
+            if state == "closed" and fields.get("labels") == "security":
+                return [
+                    {
+                        "number": 900 + n,
+                        "body": f"https://github.com/{owner}/{repo}/security/code-scanning/{n}",
+                        "labels": [{"name": "security"}],
+                    }
+                    for n in range(3)
+                ]
+            if state == "closed":
+                return [
+                    {"number": 800 + n, "labels": [{"name": "stage:in-review"}]}
+                    for n in range(5)
+                ]
+            # state=all: last tick's alert issues are tracked, this tick's new.
+            previous = self._alerts(owner, repo) if self.tick else []
+            return [
+                {"number": 700 + n, "body": f"Alert: {alert['html_url']}"}
+                for n, alert in enumerate(previous[:2])
+            ]
+        return {}
+
+    def _output(self, args: list[str]) -> tuple[int, str]:
+        method, path = args[3], args[4]
+        fields = {
+            key: value
+            for flag, pair in zip(args[5:], args[6:])
+            if flag == "-f"
+            for key, _, value in [pair.partition("=")]
+        }
+        payload = self._respond(method, path, fields)
+        if isinstance(payload, list) and "per_page" in fields:
+            page, per_page = int(fields.get("page", 1)), int(fields["per_page"])
+            payload = payload[(page - 1) * per_page : page * per_page]
+        body = json.dumps(payload)
+        if "--include" in args:
+            etag = f'"{path}-{self.tick}"'
+            if f"If-None-Match: {etag}" in args:
+                return 1, "HTTP/2.0 304 Not Modified\r\n\r\n"
+            body = f"HTTP/2.0 200 OK\r\nEtag: {etag}\r\n\r\n{body}"
+        return 0, body
+
+    def _execute(
+        self, args: list[str], stdin_json: dict[str, Any] | None
+    ) -> subprocess.CompletedProcess[str]:
+        returncode, output = self._output(args)
+        return subprocess.CompletedProcess(args, returncode, output, "")
+
+    def popen(self, args: list[str], **_: Any) -> SyntheticProcess:
+        self.streamed += 1
+        return SyntheticProcess(args, self._output(args)[1])
+
+
+def _build(
+    monkeypatch: pytest.MonkeyPatch, size: int, repos: int
+) -> tuple[SyntheticGhClient, Workflow, list[RepoConfig], Clock]:
+    client = SyntheticGhClient(size)
+    monkeypatch.setattr(gh_client.subprocess, "Popen", client.popen)
+    # Small chunks so streamed rows straddle chunk boundaries.
+    monkeypatch.setattr(gh_client, "_STREAM_CHUNK_CHARS", 512)
+    clock = Clock()
+    state = StateStore()
+    workflow = Workflow(
+        client,
+        state=state,
+        breaker=CircuitBreaker(store=state, clock=clock),
+        clock=clock,
+    )
+    cfgs = [RepoConfig(name=f"acme/r{n}", owner_logins=["alice"]) for n in range(repos)]
+    return client, workflow, cfgs, clock
+
+
+def _tick(
+    client: SyntheticGhClient, workflow: Workflow, repos: list[RepoConfig], clock: Clock
+) -> None:
+    client.tick += 1
+    clock.now += 600.0
+    for repo in repos:
+        with client.tick_scope():
+            result = workflow.run_tick(repo)
+        assert "phase_errors" not in result, result
+
+
+def _live_blocks() -> int:
+    """Live traced allocations; counted rather than summed so a one-off
+    interpreter table resize (one large block) does not read as a leak."""
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+    return len(snapshot.traces)
+
+
+def _traced_ticks(
+    client: SyntheticGhClient,
+    workflow: Workflow,
+    repos: list[RepoConfig],
+    clock: Clock,
+    ticks: int,
+) -> tuple[int, list[int]]:
+    """Run `ticks` ticks; return the growth in live blocks and each tick's peak."""
+    baseline = _live_blocks()
+    peaks: list[int] = []
+    for _ in range(ticks):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        _tick(client, workflow, repos, clock)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    return _live_blocks() - baseline, peaks
+
+
+def _assert_bounded(
+    client: SyntheticGhClient, workflow: Workflow, repos: list[RepoConfig]
+) -> None:
+    assert client._memo is None and not client._in_flight
+    assert len(client._latencies) <= client._latencies.maxlen  # type: ignore[operator]
+    assert not _PREFETCHED.get()
+    assert set(workflow._phase_estimates) <= set(TICK_PHASES)
+    assert workflow.breaker._states == {}
+    for repo in repos:
+        flow = workflow.metrics._repos[repo.name]
+        assert len(flow.issues) <= client.size
+        for label, heap in flow.heaps.items():
+            assert len(heap) <= 2 * flow.in_stage.get(label, 0) + 16
+    for namespace, entries in workflow.state._namespaces.items():
+        assert len(entries) <= len(repos), namespace
+
+
+def test_hundreds_of_ticks_keep_retained_and_peak_memory_flat(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client, workflow, repos, clock = _build(monkeypatch, size=24, repos=2)
+    tracemalloc.start()
+    try:
+        # Warm-up: fill caches, lazy imports, interned strings, histograms.
+        _traced_ticks(client, workflow, repos, clock, 60)
+        retained, peaks = _traced_ticks(client, workflow, repos, clock, 240)
+    finally:
+        tracemalloc.stop()
+
+    # Listings stream through `api_iter`, prefetched ones projected row by row.
+    assert client.streamed > 0
+    # 480 repo ticks over ~5800 new issues and 1440 new alerts: anything kept
+    # per issue, event or alert would show up many times over. Below two
+    # blocks per repo tick is metric heaps saw-toothing between compactions
+    # plus interpreter noise.
+    assert retained < 2 * 240 * len(repos), retained
+    early = sorted(peaks[:60])[30]
+    late = sorted(peaks[-60:])[30]
+    assert late <= early * 1.25 + 16 * 1024, (early, late)
+    _assert_bounded(client, workflow, repos)
+
+
+def test_memory_follows_repo_size_and_is_released_when_it_shrinks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client, workflow, repos, clock = _build(monkeypatch, size=25, repos=2)
+    tracemalloc.start()
+    try:
+        _traced_ticks(client, workflow, repos, clock, 20)
+        small_growth, small_peaks = _traced_ticks(client, workflow, repos, clock, 20)
+
+        client.size = 400
+        large_growth, large_peaks = _traced_ticks(client, workflow, repos, clock, 20)
+
+        client.size = 25
+        shrink_growth, _ = _traced_ticks(client, workflow, repos, clock, 20)
+    finally:
+        tracemalloc.stop()
+
+    # Per-tick peak scales at most linearly with the listing size (16x here).
+    small_peak = sorted(small_peaks)[10]
+    large_peak = sorted(large_peaks)[10]
+    assert large_peak <= 16 * small_peak * 1.5, (small_peak, large_peak)
+    # Caches sized by the large listing are dropped once it shrinks again.
+    retained = small_growth + large_growth + shrink_growth
+    assert retained < large_growth / 4, (small_growth, large_growth, shrink_growth)
+    _assert_bounded(client, workflow, repos)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.metrics import FlowMetrics
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.workflow import Workflow
+
+DAY = 86400
+
+
+def _event(event_id: int, kind: str, label: str, day: int, actor: str = "alice") -> dict[str, Any]:
+    return {
+        "id": event_id,
+        "event": kind,
+        "label": {"name": label},
+        "actor": {"login": actor},
+        "created_at": f"2026-03-{day:02d}T00:00:00Z",
+    }
+
+
+def _clock(day: int) -> float:
+    return 1772323200.0 + (day - 1) * DAY  # 2026-03-{day} 00:00 UTC
+
+
+def test_flow_metrics_fold_events_once_and_report_stage_aggregates(tmp_path: Path) -> None:
+    metrics = FlowMetrics(StateStore(tmp_path), clock=lambda: _clock(20))
+    first = [
+        _event(1, "labeled", "stage:queued", 1),
+        _event(2, "unlabeled", "stage:queued", 3),
+        _event(3, "labeled", "stage:needs-clarification", 3),
+        _event(4, "labeled", "bug", 4),
+    ]
+    metrics.observe("acme/repo", 7, first)
+    metrics.observe("acme/repo", 7, first)  # already folded: no double count
+    metrics.observe(
+        "acme/repo",
+        8,
+        [
+            _event(10, "labeled", "stage:queued", 2),
+            _event(11, "unlabeled", "stage:queued", 10),
+        ],
+    )
+    metrics.observe("acme/repo", 9, [_event(20, "labeled", "stage:needs-clarification", 5)])
+
+    snapshot = metrics.snapshot("acme/repo")
+    queued = snapshot["stage:queued"]
+    assert queued["completed"] == 2
+    assert queued["in_stage"] == 0
+    assert queued["mean_seconds"] == 5 * DAY
+    # Log buckets are ~19% wide: p50 lands near 2 days, p90 near 8 days.
+    assert 2 * DAY * 0.85 <= queued["p50_seconds"] <= 2 * DAY * 1.2
+    assert 8 * DAY * 0.85 <= queued["p90_seconds"] <= 8 * DAY * 1.2
+
+    waiting = snapshot["stage:needs-clarification"]
+    assert waiting["in_stage"] == 2
+    assert waiting["oldest_issue"] == 7
+    assert waiting["oldest_seconds"] == 17 * DAY
+    assert "bug" not in snapshot
+
+    # Issue 7 moves on; the heap drops its stale entry lazily.
+    metrics.observe(
+        "acme/repo", 7, [*first, _event(5, "unlabeled", "stage:needs-clarification", 6)]
+    )
+    metrics.flush("acme/repo")
+
+    reloaded = FlowMetrics(StateStore(tmp_path), clock=lambda: _clock(20)).snapshot(
+        "acme/repo"
+    )
+    assert reloaded["stage:needs-clarification"]["oldest_issue"] == 9
+    assert reloaded["stage:needs-clarification"]["completed"] == 1
+    assert reloaded["stage:queued"]["completed"] == 2
+
+
+def test_flow_metrics_retain_discards_closed_issues() -> None:
+    metrics = FlowMetrics(clock=lambda: _clock(10))
+    metrics.observe("acme/repo", 1, [_event(1, "labeled", "stage:queued", 1)])
+    metrics.observe("acme/repo", 2, [_event(2, "labeled", "stage:queued", 2)])
+
+    metrics.retain("acme/repo", [2])
+
+    queued = metrics.snapshot("acme/repo")["stage:queued"]
+    assert queued["in_stage"] == 1
+    assert queued["oldest_issue"] == 2
+    assert "completed" not in queued
+
+
+class FakeEventsClient:
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if path.endswith("/issues/4/events"):
+            return [
+                _event(1, "labeled", "stage:queued", 1),
+                _event(2, "unlabeled", "stage:queued", 2),
+                _event(3, "labeled", "stage:ready-to-implement", 2),
+            ]
+        if path.endswith("/issues") and method == "GET":
+            if (fields or {}).get("state") == "closed":
+                return []
+            return [
+                {
+                    "number": 4,
+                    "created_at": "2026-03-01T00:00:00Z",
+                    "labels": [{"name": "stage:ready-to-implement"}],
+                }
+            ]
+        if path.endswith("/labels") or path.endswith("/code-scanning/alerts"):
+            return []
+        raise AssertionError(f"Unexpected API call: {method} {path} {fields}")
+
+    def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
+        return {}
+
+    def api_post_json(self, path: str, body: dict[str, Any]) -> Any:
+        return {}
+
+
+def test_run_tick_reports_flow_metrics_from_authorization_events() -> None:
+    wf = Workflow(FakeEventsClient(), clock=lambda: _clock(5))  # type: ignore[arg-type]
+
+    result = wf.run_tick(RepoConfig(name="acme/repo", owner_logins=["alice"]))
+
+    assert result["flow"]["stage:queued"]["completed"] == 1
+    assert result["flow"]["stage:ready-to-implement"]["oldest_issue"] == 4
+
+
+class FakeMovingIssueClient:
+    """One queued issue; PATCHing its labels appends the matching events."""
+
+    def __init__(self) -> None:
+        self.labels = ["stage:queued"]
+        self.events = [_event(1, "labeled", "stage:queued", 1)]
+        self.event_fetches = 0
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if path.endswith("/issues/6/events"):
+            self.event_fetches += 1
+            return list(self.events)
+        if path.endswith("/issues") and method == "GET":
+            if (fields or {}).get("state") == "closed":
+                return []
+            return [
+                {
+                    "number": 6,
+                    "created_at": "2026-03-01T00:00:00Z",
+                    "labels": [{"name": name} for name in self.labels],
+                }
+            ]
+        if path.endswith("/labels") or path.endswith("/code-scanning/alerts"):
+            return []
+        raise AssertionError(f"Unexpected API call: {method} {path} {fields}")
+
+    def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
+        next_id = len(self.events) + 1
+        for offset, name in enumerate(sorted(set(self.labels) - set(body["labels"]))):
+            self.events.append(_event(next_id + offset, "unlabeled", name, 3))
+        next_id = len(self.events) + 1
+        for offset, name in enumerate(sorted(set(body["labels"]) - set(self.labels))):
+            self.events.append(_event(next_id + offset, "labeled", name, 3))
+        self.labels = list(body["labels"])
+        return {}
+
+    def api_post_json(self, path: str, body: dict[str, Any]) -> Any:
+        return {}
+
+
+def test_stage_changes_outside_the_ready_stage_are_timed() -> None:
+    fake = FakeMovingIssueClient()
+    wf = Workflow(fake, clock=lambda: _clock(5))  # type: ignore[arg-type]
+    repo_cfg = RepoConfig(name="acme/repo", owner_logins=["alice"])
+
+    assert wf.run_tick(repo_cfg)["action"] == "moved-to-needs-clarification"
+    flow = wf.run_tick(repo_cfg)["flow"]
+
+    assert flow["stage:queued"]["completed"] == 1
+    assert flow["stage:queued"]["mean_seconds"] == 2 * DAY
+    assert flow["stage:needs-clarification"]["oldest_issue"] == 6
+    assert fake.event_fetches == 2
+
+    wf.run_tick(repo_cfg)
+    assert fake.event_fetches == 2
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.plan import PlannedWrite, apply_plan, build_plan, merge_writes
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.workflow import LABELS_NAMESPACE, Workflow, desired_labels
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.writes: list[tuple[str, str, dict[str, Any] | None]] = []
+        self.labels = ["stage:queued", "bug"]
+
+    def _issue(self) -> dict[str, Any]:
+        return {
+            "number": 10,
+            "created_at": "2026-02-10T00:00:00Z",
+            "labels": [{"name": name} for name in self.labels],
+        }
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if method != "GET":
+            self.writes.append((method, path, fields))
+            return {}
+        if path.endswith("/issues") and (fields or {}).get("state") == "open":
+            return [self._issue()]
+        if path.endswith("/issues/10"):
+            return self._issue()
+        return []
+
+    def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
+        self.writes.append(("PATCH", path, body))
+        return {}
+
+    def api_post_json(self, path: str, body: dict[str, Any]) -> Any:
+        self.writes.append(("POST", path, body))
+        return {}
+
+
+def test_plan_records_writes_and_state_without_touching_either(tmp_path: Path) -> None:
+    fake = FakeClient()
+    store = StateStore(tmp_path)
+    repos = [
+        RepoConfig(name="acme/a", owner_logins=["alice"]),
+        RepoConfig(name="acme/b", owner_logins=["alice"]),
+    ]
+
+    planned = build_plan(fake, store, repos, concurrency=2)  # type: ignore[arg-type]
+    plan = json.loads(json.dumps(planned))
+
+    assert fake.writes == []
+    assert list(tmp_path.iterdir()) == []
+    entry = plan["repos"][0]
+    assert entry["preview"]["action"] == "moved-to-needs-clarification"
+    kinds = [write["kind"] for write in entry["writes"]]
+    assert kinds == ["label"] * len(desired_labels()) + ["issue"]
+    assert entry["writes"][-1]["body"] == {"labels": ["bug", "stage:needs-clarification"]}
+    assert {change["namespace"] for change in entry["state"]} >= {LABELS_NAMESPACE}
+
+    results = list(
+        apply_plan(Workflow(fake), plan, store=store, concurrency=2)  # type: ignore[arg-type]
+    )
+
+    assert [result["ok"] for result in results] == [True, True]
+    assert (
+        "PATCH",
+        "repos/acme/b/issues/10",
+        {"labels": ["bug", "stage:needs-clarification"]},
+    ) in fake.writes
+    assert len(fake.writes) == 2 * (len(desired_labels()) + 1)
+    assert StateStore(tmp_path).get(LABELS_NAMESPACE, "acme/a") is not None
+
+
+class LinkedAlertClient(FakeClient):
+    """Two closed security issues link the same open alert."""
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if method == "GET" and (fields or {}).get("labels") == "security":
+            return [
+                {
+                    "number": number,
+                    "state": "closed",
+                    "body": "Alert: https://github.com/acme/a/security/code-scanning/7",
+                    "labels": [{"name": "security"}],
+                }
+                for number in (3, 4)
+            ]
+        if method == "GET" and path.endswith("/code-scanning/alerts/7"):
+            dismissed = any(write[1] == path for write in self.writes)
+            return {"number": 7, "state": "dismissed" if dismissed else "open"}
+        return super().api(method, path, fields=fields)
+
+
+def test_plan_dismisses_an_alert_linked_twice_once(tmp_path: Path) -> None:
+    repo = RepoConfig(name="acme/a", owner_logins=["alice"])
+    live = LinkedAlertClient()
+    expected = Workflow(live).run_tick(repo)  # type: ignore[arg-type]
+
+    plan = build_plan(LinkedAlertClient(), StateStore(tmp_path), [repo])  # type: ignore[arg-type]
+
+    entry = plan["repos"][0]
+    assert entry["preview"]["security_closed_dismissed"] == 1
+    assert entry["preview"]["security_closed_already_resolved"] == 1
+    dismissals = [w for w in entry["writes"] if w["path"].endswith("/alerts/7")]
+    live_dismissals = [w for w in live.writes if w[1].endswith("/alerts/7")]
+    assert len(live_dismissals) == 1
+    assert [w["body"] for w in dismissals] == [w[2] for w in live_dismissals]
+    assert expected["security_closed_dismissed"] == 1
+
+
+def test_merge_writes_folds_patches_and_drops_duplicate_posts() -> None:
+    writes = [
+        PlannedWrite("issue", "PATCH", "repos/o/r/issues/1", body={"labels": ["a"]}),
+        PlannedWrite("comment", "POST", "repos/o/r/issues/1/comments", fields={"body": "hi"}),
+        PlannedWrite("comment", "POST", "repos/o/r/issues/1/comments", fields={"body": "hi"}),
+        PlannedWrite("issue", "PATCH", "repos/o/r/issues/1", body={"labels": ["b"]}),
+        PlannedWrite("issue", "PATCH", "repos/o/r/issues/2", body={"labels": ["c"]}),
+    ]
+
+    assert merge_writes(writes) == [
+        writes[1],
+        writes[3],
+        writes[4],
+    ]
+
+
+def test_apply_recomputes_transitions_from_the_issue_as_it_is_now(tmp_path: Path) -> None:
+    fake = FakeClient()
+    store = StateStore(tmp_path)
+    repos = [RepoConfig(name="acme/a", owner_logins=["alice"])]
+    plan = json.loads(json.dumps(build_plan(fake, store, repos)))
+    (patch,) = [write for write in plan["repos"][0]["writes"] if write["method"] == "PATCH"]
+    assert patch["transition"] == {"from": "stage:queued", "to": "stage:needs-clarification"}
+
+    fake.labels = ["stage:queued", "bug", "p1"]
+    (result,) = apply_plan(Workflow(fake), plan, store=store)  # type: ignore[arg-type]
+    assert result["skipped"] == 0
+    assert fake.writes[-1] == (
+        "PATCH",
+        "repos/acme/a/issues/10",
+        {"labels": ["bug", "p1", "stage:needs-clarification"]},
+    )
+
+    fake.labels = ["stage:in-progress", "bug"]
+    fake.writes.clear()
+    (result,) = apply_plan(Workflow(fake), plan, store=store)  # type: ignore[arg-type]
+    assert result["ok"] and result["skipped"] == 1
+    assert [write for write in fake.writes if write[0] == "PATCH"] == []
+
+
+def test_apply_rejects_plans_without_transitions() -> None:
+    plan = {"version": 1, "repos": []}
+
+    with pytest.raises(ValueError, match="unsupported plan version"):
+        list(apply_plan(Workflow(FakeClient()), plan, store=StateStore()))  # type: ignore[arg-type]
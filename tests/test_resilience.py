@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from gh_issue_workflow.resilience import CircuitBreaker
+from gh_issue_workflow.state import StateStore
+
+
+def test_circuit_opens_after_threshold_and_half_opens_after_cooldown() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60, clock=lambda: now[0])
+
+    breaker.record_failure("acme/repo:security_alerts")
+    assert breaker.allow("acme/repo:security_alerts")
+    breaker.record_failure("acme/repo:security_alerts")
+    assert not breaker.allow("acme/repo:security_alerts")
+    assert breaker.allow("acme/repo:pick")
+
+    now[0] += 60
+    assert breaker.allow("acme/repo:security_alerts")
+    breaker.record_failure("acme/repo:security_alerts")
+    assert not breaker.allow("acme/repo:security_alerts")
+
+    now[0] += 60
+    assert breaker.allow("acme/repo:security_alerts")
+    breaker.record_success("acme/repo:security_alerts")
+    assert not breaker.is_open("acme/repo:security_alerts")
+
+
+def test_open_circuit_survives_process_restart_with_store(tmp_path: Path) -> None:
+    now = [0.0]
+    first = CircuitBreaker(
+        failure_threshold=1, clock=lambda: now[0], store=StateStore(tmp_path)
+    )
+    first.record_failure("acme/repo:security_alerts")
+
+    restarted = CircuitBreaker(
+        failure_threshold=1, clock=lambda: now[0], store=StateStore(tmp_path)
+    )
+    assert not restarted.allow("acme/repo:security_alerts")
+    restarted.record_success("acme/repo:security_alerts")
+    assert StateStore(tmp_path).get("circuits", "acme/repo:security_alerts") is None
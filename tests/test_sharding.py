@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.sharding import (
+    HashRing,
+    LeaseStore,
+    iter_leased_repos,
+    owned_repos,
+    worker_state_dir,
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _repos(count: int) -> list[RepoConfig]:
+    return [RepoConfig(name=f"acme/repo{i}") for i in range(count)]
+
+
+def test_hash_ring_only_moves_keys_of_departed_worker() -> None:
+    keys = [f"acme/repo{i}" for i in range(500)]
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b"])
+
+    for key in keys:
+        if before.owner(key) != "c":
+            assert after.owner(key) == before.owner(key)
+    assert {before.owner(key) for key in keys} == {"a", "b", "c"}
+
+
+def test_workers_partition_repos_and_rebalance_when_one_stops(tmp_path: Path) -> None:
+    clock = Clock()
+    store = LeaseStore(tmp_path / "leases.db", clock=clock)
+    repos = _repos(50)
+    store.heartbeat("w1")
+    store.heartbeat("w2")
+
+    share1 = {r.name for r in owned_repos(store, "w1", repos, heartbeat_ttl_seconds=60)}
+    share2 = {r.name for r in owned_repos(store, "w2", repos, heartbeat_ttl_seconds=60)}
+    assert share1 and share2
+    assert share1.isdisjoint(share2)
+    assert share1 | share2 == {r.name for r in repos}
+
+    clock.now += 120  # w2 stops heartbeating
+    takeover = owned_repos(store, "w1", repos, heartbeat_ttl_seconds=60)
+    assert {r.name for r in takeover} == {r.name for r in repos}
+
+
+def test_lease_blocks_second_worker_until_expiry(tmp_path: Path) -> None:
+    clock = Clock()
+    store = LeaseStore(tmp_path / "leases.db", clock=clock)
+
+    assert store.try_acquire("acme/repo", "w1", 30)
+    assert not store.try_acquire("acme/repo", "w2", 30)
+    assert store.try_acquire("acme/repo", "w1", 30)
+
+    clock.now += 31  # w1 crashed without releasing
+    assert store.try_acquire("acme/repo", "w2", 30)
+
+
+def test_iter_leased_repos_skips_repos_leased_elsewhere_and_releases(tmp_path: Path) -> None:
+    clock = Clock()
+    store = LeaseStore(tmp_path / "leases.db", clock=clock)
+    repos = _repos(3)
+    assert store.try_acquire("acme/repo1", "old-owner", 300)
+
+    ticked = [r.name for r in iter_leased_repos(store, "w1", repos)]
+
+    assert ticked == ["acme/repo0", "acme/repo2"]
+    assert store.try_acquire("acme/repo0", "w2", 30)
+
+
+def test_long_runs_keep_heartbeating_between_repos(tmp_path: Path) -> None:
+    clock = Clock()
+    store = LeaseStore(tmp_path / "leases.db", clock=clock)
+
+    for _ in iter_leased_repos(store, "w1", _repos(3), heartbeat_ttl_seconds=600):
+        clock.now += 400  # each repo takes a while
+
+    # Last heartbeat was before the third repo, not at the start of the run.
+    assert store.live_workers(600) == ["w1"]
+
+
+def test_workers_sharing_a_state_dir_get_separate_subdirectories(tmp_path: Path) -> None:
+    node_a = worker_state_dir(tmp_path, "node-a")
+    odd = worker_state_dir(tmp_path, "ci/runner 1")
+
+    assert node_a == tmp_path / "workers" / "node-a"
+    assert odd.parent == node_a.parent and odd != node_a
+    assert "/" not in odd.name
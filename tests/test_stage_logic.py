@@ -4,7 +4,10 @@ from gh_issue_workflow.stages import (
     STAGE_IN_PROGRESS,
     STAGE_QUEUED,
     STAGE_READY_TO_IMPLEMENT,
+    Issue,
+    Stage,
     apply_stage_label,
+    parse_timestamp,
     pick_next_issue,
 )
 
@@ -79,3 +82,52 @@ def test_pick_next_ignores_unauthorized_ready_issue() -> None:
     ]
 
     assert pick_next_issue(issues, authorized_ready_issue_numbers=set()) is None
+
+
+def test_issue_from_api_interns_labels_and_precomputes_stage() -> None:
+    row = {
+        "number": 9,
+        "created_at": "2026-02-09T00:00:00Z",
+        "labels": [{"name": "bug"}, {"name": STAGE_QUEUED}],
+    }
+
+    issue = Issue.from_api(row)
+    other = Issue.from_api(dict(row, number=10))
+
+    assert issue is not None and other is not None
+    assert issue.number == 9
+    assert issue.stage is Stage.QUEUED
+    assert issue.created_ts == parse_timestamp("2026-02-09T00:00:00Z")
+    assert issue.labels[0] is other.labels[0]
+    assert not hasattr(issue, "__dict__")
+
+
+def test_issue_from_api_skips_pull_requests_and_incomplete_rows() -> None:
+    pr_row = {"number": 1, "created_at": "2026-02-01T00:00:00Z", "pull_request": {"url": "x"}}
+    assert Issue.from_api(pr_row) is None
+    assert Issue.from_api({"number": 1}) is None
+
+
+def test_issue_stage_prefers_pick_priority_when_multiple_stage_labels() -> None:
+    issue = Issue.from_api(
+        {
+            "number": 3,
+            "created_at": "2026-02-03T00:00:00Z",
+            "labels": [STAGE_READY_TO_IMPLEMENT, STAGE_IN_PROGRESS],
+        }
+    )
+
+    assert issue is not None
+    assert issue.stage is Stage.IN_PROGRESS
+
+
+def test_pick_next_keeps_first_seen_issue_on_equal_creation_time() -> None:
+    issues = [
+        {"number": 8, "created_at": "2026-02-01T00:00:00Z", "labels": [STAGE_QUEUED]},
+        {"number": 6, "created_at": "2026-02-01T00:00:00Z", "labels": [STAGE_QUEUED]},
+        {"number": 9, "created_at": "2026-02-02T00:00:00Z", "labels": [STAGE_QUEUED]},
+    ]
+
+    pick = pick_next_issue(issues, authorized_ready_issue_numbers=set())
+    assert pick is not None
+    assert pick.number == 8
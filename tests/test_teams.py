@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.gh_client import ConditionalResponse, GhApiError
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.teams import (
+    TEAM_MEMBERSHIP_TTL_SECONDS,
+    parse_team_ref,
+    resolve_owner_logins,
+)
+from gh_issue_workflow.workflow import Workflow
+
+
+class FakeTeamClient:
+    def __init__(self, members: dict[str, list[str]]) -> None:
+        self.members = members
+        self.conditional_calls: list[tuple[str, int, str | None]] = []
+        self.event_calls = 0
+        self.patches: list[tuple[str, dict[str, Any]]] = []
+
+    def api_conditional(
+        self,
+        path: str,
+        *,
+        fields: dict[str, Any] | None = None,
+        etag: str | None = None,
+    ) -> ConditionalResponse:
+        page = int((fields or {}).get("page", 1))
+        self.conditional_calls.append((path, page, etag))
+        _, org, _, slug, _ = path.split("/")
+        if f"{org}/{slug}" not in self.members:
+            raise GhApiError(f"gh api GET {path} failed: HTTP 404: Not Found")
+        logins = self.members[f"{org}/{slug}"]
+        rows = [{"login": login} for login in logins[(page - 1) * 100 : page * 100]]
+        page_etag = f'"{page}-{len(logins)}"'
+        if etag == page_etag:
+            return ConditionalResponse(status=304, etag=etag, payload=None)
+        return ConditionalResponse(status=200, etag=page_etag, payload=rows)
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if path.endswith("/events"):
+            self.event_calls += 1
+            return [
+                {
+                    "event": "labeled",
+                    "label": {"name": "stage:ready-to-implement"},
+                    "actor": {"login": "dana"},
+                }
+            ]
+        if path.endswith("/issues"):
+            return [
+                {
+                    "number": 5,
+                    "created_at": "2026-02-05T00:00:00Z",
+                    "labels": [{"name": "stage:ready-to-implement"}],
+                }
+            ]
+        return []
+
+    def api_patch_json(self, path: str, body: dict[str, Any]) -> Any:
+        self.patches.append((path, body))
+        return {}
+
+
+def test_parse_team_ref() -> None:
+    assert parse_team_ref("@acme/maintainers") == ("acme", "maintainers")
+    assert parse_team_ref("alice") is None
+    assert parse_team_ref("@acme") is None
+    assert parse_team_ref("@acme/a/b") is None
+
+
+def test_team_membership_is_cached_and_revalidated_with_etags(tmp_path: Path) -> None:
+    client = FakeTeamClient({"acme/core": [f"user{n}" for n in range(150)]})
+    store = StateStore(tmp_path)
+    owners = ["alice", "@acme/core"]
+
+    logins = resolve_owner_logins(client, store, owners, now=1000.0)  # type: ignore[arg-type]
+    assert isinstance(logins, frozenset)
+    assert len(logins) == 151 and "user149" in logins and "alice" in logins
+    assert [call[1:] for call in client.conditional_calls] == [(1, None), (2, None)]
+
+    # Within the TTL the persisted cache answers without any request.
+    client.conditional_calls.clear()
+    assert resolve_owner_logins(client, StateStore(tmp_path), owners, now=2000.0) == logins  # type: ignore[arg-type]
+    assert client.conditional_calls == []
+
+    client.members["acme/core"].append("late-joiner")
+    later = 1000.0 + TEAM_MEMBERSHIP_TTL_SECONDS
+    refreshed = resolve_owner_logins(client, store, owners, now=later)  # type: ignore[arg-type]
+    assert "late-joiner" in refreshed
+    assert [call[2] for call in client.conditional_calls] == ['"1-150"', '"2-150"']
+
+
+def test_ready_issue_authorized_through_team_membership(tmp_path: Path) -> None:
+    client = FakeTeamClient({"acme/core": ["dana"]})
+    client.members["acme/other"] = []
+    wf = Workflow(client, state=StateStore(tmp_path), clock=lambda: 1000.0)  # type: ignore[arg-type]
+
+    team_repo = RepoConfig(name="acme/repo", owner_logins=["@acme/core"])
+    assert wf.pick_next(team_repo) == {
+        "number": 5,
+        "picked_from_stage": "stage:ready-to-implement",
+    }
+    assert wf.pick_next(RepoConfig(name="acme/repo", owner_logins=["@acme/other"])) is None
+    assert wf.pick_next(team_repo) is not None
+    assert [call[0] for call in client.conditional_calls] == [
+        "orgs/acme/teams/core/members",
+        "orgs/acme/teams/other/members",
+    ]
+
+
+def test_unresolvable_team_contributes_no_logins(tmp_path: Path) -> None:
+    client = FakeTeamClient({"acme/core": ["dana"]})
+    unresolved: dict[str, str] = {}
+
+    logins = resolve_owner_logins(
+        client,  # type: ignore[arg-type]
+        StateStore(tmp_path),
+        ["alice", "@acme/hidden", "@acme/core"],
+        now=1000.0,
+        unresolved=unresolved,
+    )
+
+    assert logins == {"alice", "dana"}
+    assert list(unresolved) == ["@acme/hidden"]
+    assert "HTTP 404" in unresolved["@acme/hidden"]
+
+
+def test_tick_reports_unresolved_owner_teams(tmp_path: Path) -> None:
+    client = FakeTeamClient({"acme/core": ["dana"]})
+    wf = Workflow(client, state=StateStore(tmp_path), clock=lambda: 1000.0)  # type: ignore[arg-type]
+
+    result = wf.run_tick(RepoConfig(name="acme/repo", owner_logins=["@acme/hidden", "@acme/core"]))
+    assert result["action"] == "moved-to-in-progress"
+    assert list(result["unresolved_owner_teams"]) == ["@acme/hidden"]
+    assert "phase_errors" not in result
+
+    result = wf.run_tick(RepoConfig(name="acme/repo", owner_logins=["@acme/hidden"]))
+    assert result["action"] == "no-work"
+    assert list(result["unresolved_owner_teams"]) == ["@acme/hidden"]
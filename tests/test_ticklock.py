@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+from pathlib import Path
+
+from gh_issue_workflow.config import RepoConfig
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.ticklock import (
+    TickLock,
+    prioritize_unfinished,
+    record_pending,
+    tick_finished,
+)
+
+
+def test_tick_lock_blocks_overlap_and_takes_over_stale_locks(tmp_path: Path) -> None:
+    path = tmp_path / "tick.lock"
+    now = [1000.0]
+    first = TickLock(path, stale_seconds=3600, clock=lambda: now[0])
+    second = TickLock(path, stale_seconds=3600, clock=lambda: now[0])
+
+    assert first.acquire() is None
+    holder = second.acquire()
+    assert holder == {"pid": os.getpid(), "host": socket.gethostname(), "started_at": 1000.0}
+
+    # Too old: taken over even though the holder process is alive.
+    now[0] += 3600
+    assert second.acquire() is None
+    assert json.loads(path.read_text())["started_at"] == 4600.0
+
+    # A dead holder on this host is stale immediately.
+    second.release()
+    assert not path.exists()
+    path.write_text(
+        json.dumps({"pid": 2**22 + 1, "host": socket.gethostname(), "started_at": now[0]})
+    )
+    assert first.acquire() is None
+    first.release()
+
+
+def test_unfinished_repos_from_previous_run_go_first(tmp_path: Path) -> None:
+    store = StateStore(tmp_path)
+    repos = [RepoConfig(name=f"acme/r{n}") for n in range(4)]
+
+    assert prioritize_unfinished(store, repos) == repos
+
+    record_pending(store, ["acme/r3", "acme/r1"])
+    ordered = prioritize_unfinished(StateStore(tmp_path), repos)
+
+    assert [repo.name for repo in ordered] == ["acme/r3", "acme/r1", "acme/r0", "acme/r2"]
+    assert tick_finished({"repo": "acme/r0", "action": "no-work"})
+    assert not tick_finished({"skipped_phases": {"security_alerts": "deadline"}})
+    assert tick_finished({"skipped_phases": {"security_alerts": "circuit-open"}})
@@ -1,9 +1,28 @@
 from __future__ import annotations
 
+import threading
+import time
 from typing import Any
 
+import pytest
+
 from gh_issue_workflow.config import RepoConfig
-from gh_issue_workflow.workflow import Workflow
+from gh_issue_workflow.gh_client import (
+    ConditionalResponse,
+    GhApiError,
+    GhClient,
+    GhTransientError,
+)
+from gh_issue_workflow.resilience import CircuitBreaker
+from gh_issue_workflow.state import StateStore
+from gh_issue_workflow.workflow import (
+    ALERT_FULL_RECONCILE_SECONDS,
+    CHANGE_GATE_FULL_TICK_SECONDS,
+    LABEL_CONVERGENCE_TTL_SECONDS,
+    PENDING_ALERT_ISSUES_NAMESPACE,
+    Workflow,
+    desired_labels,
+)
 
 
 class FakeClient:
@@ -163,6 +182,29 @@ def test_sync_code_scanning_alerts_dedupes_by_alert_url() -> None:
     assert fake.created_issues == []
 
 
+class ExistingLabelCodeScanningClient(FakeCodeScanningClient):
+    """Label POSTs fail with 422 because `severity:high` already exists."""
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if path.endswith("/labels") and method == "POST":
+            self.created_labels.append(fields or {})
+            raise GhApiError("gh: Validation Failed (HTTP 422)")
+        if path.endswith("/labels/severity%3Ahigh") and method == "GET":
+            return {"name": "severity:high"}
+        return super().api(method, path, fields=fields)
+
+
+def test_creating_an_existing_label_is_not_an_error() -> None:
+    fake = ExistingLabelCodeScanningClient()
+    wf = Workflow(fake)  # type: ignore[arg-type]
+
+    assert wf.sync_code_scanning_alerts("acme/repo") == {"created": 1, "skipped_existing": 0}
+    assert [label["name"] for label in fake.created_labels] == ["severity:high"]
+    assert len(fake.created_issues) == 1
+
+
 class FakeClosedSecurityIssueClient:
     def __init__(self, *, alert_state: str = "open") -> None:
         self.alert_state = alert_state
@@ -242,3 +284,627 @@ def test_sync_closed_security_issues_skips_already_resolved_alert() -> None:
 
     assert result == {"dismissed": 0, "already_resolved": 1, "missing_link": 0}
     assert fake.dismiss_calls == []
+
+
+class FakeStageQueryClient:
+    """Serves `labels=`/`sort=created`/`per_page=` issue queries from a fixed list."""
+
+    def __init__(self, issues: list[dict[str, Any]], *, ready_actor: str) -> None:
+        self.issues = issues
+        self.ready_actor = ready_actor
+        self.calls: list[tuple[str, str, dict[str, Any] | None]] = []
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        self.calls.append((method, path, fields))
+        fields = fields or {}
+        if path.endswith("/events"):
+            return [
+                {
+                    "event": "labeled",
+                    "label": {"name": "stage:ready-to-implement"},
+                    "actor": {"login": self.ready_actor},
+                }
+            ]
+        if path.endswith("/issues") and method == "GET":
+            rows = [
+                i
+                for i in self.issues
+                if fields.get("labels") is None
+                or fields["labels"] in [lab["name"] for lab in i["labels"]]
+            ]
+            rows.sort(key=lambda i: i["created_at"])
+            per_page = int(fields.get("per_page", 100))
+            page = int(fields.get("page", 1))
+            return rows[(page - 1) * per_page : page * per_page]
+        raise AssertionError(f"Unexpected API call: {method} {path} {fields}")
+
+
+def _issue_row(number: int, day: int, label: str) -> dict[str, Any]:
+    return {
+        "number": number,
+        "created_at": f"2026-02-{day:02d}T00:00:00Z",
+        "labels": [{"name": label}],
+    }
+
+
+def test_server_side_pick_costs_one_request_when_in_progress_exists() -> None:
+    fake = FakeStageQueryClient(
+        [
+            _issue_row(3, 3, "stage:in-progress"),
+            _issue_row(1, 1, "stage:queued"),
+            _issue_row(2, 2, "stage:in-progress"),
+        ],
+        ready_actor="simonvanlaak",
+    )
+    wf = Workflow(fake, server_side_pick=True)  # type: ignore[arg-type]
+
+    pick = wf.pick_next(RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"]))
+
+    assert pick == {"number": 2, "picked_from_stage": "stage:in-progress"}
+    assert fake.calls == [
+        (
+            "GET",
+            "repos/acme/repo/issues",
+            {
+                "state": "open",
+                "labels": "stage:in-progress",
+                "sort": "created",
+                "direction": "asc",
+                "per_page": 1,
+            },
+        )
+    ]
+
+
+def test_single_pass_pick_follows_full_listing_pages() -> None:
+    backlog = [_issue_row(n, 1 + n % 27, "stage:backlog") for n in range(1, 151)]
+    fake = FakeStageQueryClient(
+        [*backlog, _issue_row(200, 28, "stage:queued")], ready_actor="simonvanlaak"
+    )
+    wf = Workflow(fake)  # type: ignore[arg-type]
+
+    pick = wf.pick_next(RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"]))
+
+    assert pick == {"number": 200, "picked_from_stage": "stage:queued"}
+    assert [call[2] for call in fake.calls if call[1].endswith("/issues")] == [
+        {"state": "open", "per_page": 100},
+        {"state": "open", "per_page": 100, "page": 2},
+    ]
+
+
+def test_server_side_pick_falls_through_to_authorized_ready() -> None:
+    fake = FakeStageQueryClient(
+        [_issue_row(5, 5, "stage:ready-to-implement"), _issue_row(4, 4, "stage:backlog")],
+        ready_actor="simonvanlaak",
+    )
+    repo_cfg = RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"])
+
+    assert Workflow(fake, server_side_pick=True).pick_next(repo_cfg) == {  # type: ignore[arg-type]
+        "number": 5,
+        "picked_from_stage": "stage:ready-to-implement",
+    }
+
+    unauthorized = FakeStageQueryClient(fake.issues, ready_actor="mallory")
+    assert Workflow(unauthorized, server_side_pick=True).pick_next(repo_cfg) is None  # type: ignore[arg-type]
+
+
+def test_global_pick_merges_repos_and_stops_at_settled_stage() -> None:
+    per_repo = {
+        "acme/a": FakeStageQueryClient(
+            [_issue_row(1, 5, "stage:in-progress"), _issue_row(2, 1, "stage:queued")],
+            ready_actor="simonvanlaak",
+        ),
+        "acme/b": FakeStageQueryClient(
+            [_issue_row(7, 3, "stage:in-progress"), _issue_row(8, 9, "stage:in-progress")],
+            ready_actor="simonvanlaak",
+        ),
+        "acme/c": FakeStageQueryClient(
+            [_issue_row(4, 2, "stage:ready-to-implement")], ready_actor="mallory"
+        ),
+    }
+
+    class Router:
+        def api(self, method: str, path: str, *, fields: dict[str, Any] | None = None) -> Any:
+            return per_repo["/".join(path.split("/")[1:3])].api(method, path, fields=fields)
+
+    repos = [RepoConfig(name=name, owner_logins=["simonvanlaak"]) for name in per_repo]
+    wf = Workflow(Router())  # type: ignore[arg-type]
+
+    assert wf.pick_next_global(repos, top=2) == [
+        {"repo": "acme/b", "pick": {"number": 7, "picked_from_stage": "stage:in-progress"}},
+        {"repo": "acme/a", "pick": {"number": 1, "picked_from_stage": "stage:in-progress"}},
+    ]
+    stages = {call[2]["labels"] for fake in per_repo.values() for call in fake.calls}
+    assert stages == {"stage:in-progress"}
+
+    top = wf.pick_next_global(repos, top=10)
+    assert [(entry["repo"], entry["pick"]["number"]) for entry in top] == [
+        ("acme/b", 7),
+        ("acme/a", 1),
+        ("acme/b", 8),
+        ("acme/a", 2),
+    ]
+
+
+class FakeStreamingCodeScanningClient(FakeCodeScanningClient):
+    def __init__(self, *, existing_issue_body: str | None = None) -> None:
+        super().__init__(existing_issue_body=existing_issue_body)
+        self.streamed: list[str] = []
+
+    def api_iter(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        self.streamed.append(path)
+        yield from self.api(method, path, fields=fields)
+
+
+def test_sync_code_scanning_alerts_streams_lists_and_matches_exact_alert_url() -> None:
+    fake = FakeStreamingCodeScanningClient(
+        existing_issue_body="Tracked: https://github.com/acme/repo/security/code-scanning/23"
+    )
+    wf = Workflow(fake)  # type: ignore[arg-type]
+
+    result = wf.sync_code_scanning_alerts("acme/repo")
+
+    assert result == {"created": 1, "skipped_existing": 0}
+    assert "repos/acme/repo/code-scanning/alerts" in fake.streamed
+    assert "repos/acme/repo/issues" in fake.streamed
+
+
+class FakeLabelClient:
+    def __init__(self, labels: list[dict[str, Any]]) -> None:
+        self.labels = labels
+        self.calls: list[tuple[str, str, dict[str, Any] | None]] = []
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        self.calls.append((method, path, fields))
+        if path.endswith("/labels") and method == "GET":
+            return self.labels
+        if "/labels" in path and method in {"POST", "PATCH"}:
+            return {}
+        raise AssertionError(f"Unexpected API call: {method} {path} {fields}")
+
+
+def _converged_labels() -> list[dict[str, Any]]:
+    return [
+        {"name": name, "color": color, "description": description}
+        for name, (color, description) in desired_labels().items()
+    ]
+
+
+def test_reconcile_labels_creates_missing_and_fixes_stale_in_one_pass() -> None:
+    labels = [
+        row
+        for row in _converged_labels()
+        if row["name"] not in {"security", "severity:high"}
+    ]
+    for row in labels:
+        if row["name"] == "stage:queued":
+            row["color"] = "000000"
+    fake = FakeLabelClient(labels)
+    wf = Workflow(fake)  # type: ignore[arg-type]
+
+    result = wf.reconcile_labels("acme/repo")
+
+    assert result == {"created": 2, "updated": 1, "skipped": 0}
+    created = {c[2]["name"] for c in fake.calls if c[0] == "POST"}  # type: ignore[index]
+    assert created == {"security", "severity:high"}
+    patches = [c for c in fake.calls if c[0] == "PATCH"]
+    assert patches == [
+        (
+            "PATCH",
+            "repos/acme/repo/labels/stage%3Aqueued",
+            {"color": "bfd4f2", "description": "automation stage label"},
+        )
+    ]
+
+
+def test_reconcile_labels_skips_listing_until_ttl_expires(tmp_path: Any) -> None:
+    clock = [1000.0]
+    fake = FakeLabelClient(_converged_labels())
+    wf = Workflow(fake, state=StateStore(tmp_path), clock=lambda: clock[0])  # type: ignore[arg-type]
+
+    assert wf.reconcile_labels("acme/repo")["skipped"] == 0
+    calls_after_first = len(fake.calls)
+
+    restarted = Workflow(fake, state=StateStore(tmp_path), clock=lambda: clock[0])  # type: ignore[arg-type]
+    assert restarted.reconcile_labels("acme/repo")["skipped"] == 1
+    assert len(fake.calls) == calls_after_first
+
+    clock[0] += LABEL_CONVERGENCE_TTL_SECONDS
+    assert restarted.reconcile_labels("acme/repo")["skipped"] == 0
+    assert len(fake.calls) == calls_after_first + 1
+
+
+class FailingAlertsClient(FakeClient):
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if path.endswith("/code-scanning/alerts"):
+            self.calls.append((method, path, fields))
+            raise GhApiError("HTTP 502: Bad Gateway")
+        return super().api(method, path, fields=fields)
+
+
+def test_run_tick_reports_failing_phase_and_opens_circuit() -> None:
+    fake = FailingAlertsClient()
+    breaker = CircuitBreaker(failure_threshold=2)
+    wf = Workflow(fake, breaker=breaker)  # type: ignore[arg-type]
+    repo_cfg = RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"])
+
+    first = wf.run_tick(repo_cfg)
+    assert first["action"] == "moved-to-needs-clarification"
+    assert first["phase_errors"] == {"security_alerts": "HTTP 502: Bad Gateway"}
+
+    wf.run_tick(repo_cfg)
+    alert_calls = [c for c in fake.calls if c[1].endswith("/code-scanning/alerts")]
+    third = wf.run_tick(repo_cfg)
+    assert third["skipped_phases"] == {"security_alerts": "circuit-open"}
+    assert len([c for c in fake.calls if c[1].endswith("/code-scanning/alerts")]) == len(
+        alert_calls
+    )
+
+
+class MalformedAlertsClient(FakeClient):
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if path.endswith("/code-scanning/alerts"):
+            self.calls.append((method, path, fields))
+            raise ValueError("truncated JSON")
+        return super().api(method, path, fields=fields)
+
+
+def test_run_tick_reports_unexpected_phase_errors() -> None:
+    breaker = CircuitBreaker(failure_threshold=1)
+    wf = Workflow(MalformedAlertsClient(), breaker=breaker)  # type: ignore[arg-type]
+    repo_cfg = RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"])
+
+    result = wf.run_tick(repo_cfg)
+    assert result["action"] == "moved-to-needs-clarification"
+    assert result["phase_errors"] == {"security_alerts": "ValueError: truncated JSON"}
+    assert breaker.is_open("acme/repo:security_alerts")
+
+
+def test_run_tick_skips_phases_that_would_overrun_deadline() -> None:
+    now = [100.0]
+    fake = FakeClient()
+    wf = Workflow(fake, clock=lambda: now[0])  # type: ignore[arg-type]
+    repo_cfg = RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"])
+
+    result = wf.run_tick(repo_cfg, deadline=99.0)
+    assert result["action"] == "skipped"
+    assert set(result["skipped_phases"]) == {
+        "labels",
+        "pick",
+        "cleanup_closed",
+        "security_closed",
+        "security_alerts",
+    }
+    assert fake.calls == []
+
+    wf._phase_estimates["security_alerts"] = 30.0
+    result = wf.run_tick(repo_cfg, deadline=120.0)
+    assert result["action"] == "moved-to-needs-clarification"
+    assert result["skipped_phases"] == {"security_alerts": "deadline"}
+
+
+class FlakyCreateClient(FakeCodeScanningClient):
+    def __init__(self, *, landed: bool) -> None:
+        super().__init__()
+        self.landed = landed
+        self.hidden = False
+        self.post_attempts = 0
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        if path.endswith("/issues") and (fields or {}).get("sort") == "created":
+            if not self.landed or self.hidden:
+                return []
+            return [{"number": 99, "body": self.created_issues[0]["body"]}]
+        return super().api(method, path, fields=fields)
+
+    def api_post_json(self, path: str, body: dict[str, Any]) -> Any:
+        self.post_attempts += 1
+        result = super().api_post_json(path, body)
+        if self.post_attempts == 1:
+            if not self.landed:
+                self.created_issues.pop()
+            raise GhTransientError("HTTP 502: Bad Gateway")
+        return result
+
+
+def test_alert_issue_creation_is_not_duplicated_when_transient_post_landed() -> None:
+    fake = FlakyCreateClient(landed=True)
+
+    result = Workflow(fake).sync_code_scanning_alerts("acme/repo")  # type: ignore[arg-type]
+
+    assert result == {"created": 1, "skipped_existing": 0}
+    assert fake.post_attempts == 1
+    assert len(fake.created_issues) == 1
+
+
+def test_alert_issue_creation_is_not_retried_within_a_sync() -> None:
+    fake = FlakyCreateClient(landed=False)
+    wf = Workflow(fake)  # type: ignore[arg-type]
+
+    with pytest.raises(GhTransientError):
+        wf.sync_code_scanning_alerts("acme/repo")
+    assert fake.post_attempts == 1
+    assert wf.state.get(PENDING_ALERT_ISSUES_NAMESPACE, "acme/repo") == [
+        "https://github.com/acme/repo/security/code-scanning/2"
+    ]
+
+    assert wf.sync_code_scanning_alerts("acme/repo") == {"created": 1, "skipped_existing": 0}
+    assert fake.post_attempts == 2
+    assert len(fake.created_issues) == 1
+    assert wf.state.get(PENDING_ALERT_ISSUES_NAMESPACE, "acme/repo") is None
+
+
+def test_pending_alert_issue_found_late_is_not_created_again() -> None:
+    fake = FlakyCreateClient(landed=True)
+    fake.hidden = True
+    wf = Workflow(fake)  # type: ignore[arg-type]
+
+    with pytest.raises(GhTransientError):
+        wf.sync_code_scanning_alerts("acme/repo")
+
+    fake.hidden = False
+    assert wf.sync_code_scanning_alerts("acme/repo") == {"created": 0, "skipped_existing": 1}
+    assert fake.post_attempts == 1
+    assert len(fake.created_issues) == 1
+
+
+def _alert_row(number: int, updated_at: str) -> dict[str, Any]:
+    return {
+        "number": number,
+        "html_url": f"https://github.com/acme/repo/security/code-scanning/{number}",
+        "state": "open",
+        "created_at": updated_at,
+        "updated_at": updated_at,
+        "rule": {"id": f"rule-{number}", "security_severity_level": "low"},
+    }
+
+
+class FakeIncrementalAlertsClient(FakeCodeScanningClient):
+    def __init__(self, alerts: list[dict[str, Any]]) -> None:
+        super().__init__()
+        self.alerts = alerts
+        self.calls: list[tuple[str, str]] = []
+
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        self.calls.append((method, path))
+        if path.endswith("/code-scanning/alerts"):
+            return list(self.alerts)
+        if path.endswith("/issues") and method == "GET":
+            return [{"body": issue["body"]} for issue in self.created_issues]
+        return super().api(method, path, fields=fields)
+
+    def api_conditional(
+        self, path: str, *, fields: dict[str, Any] | None = None, etag: str | None = None
+    ) -> ConditionalResponse:
+        assert fields is not None and fields["sort"] == "updated"
+        self.calls.append(("CONDITIONAL", path))
+        current = f'"v{len(self.alerts)}"'
+        if etag == current:
+            return ConditionalResponse(status=304, etag=etag, payload=None)
+        rows = sorted(self.alerts, key=lambda row: row["updated_at"], reverse=True)
+        return ConditionalResponse(status=200, etag=current, payload=rows)
+
+
+def test_sync_code_scanning_alerts_only_processes_alerts_changed_since_cursor() -> None:
+    fake = FakeIncrementalAlertsClient([_alert_row(2, "2026-02-15T10:00:00Z")])
+    wf = Workflow(fake, clock=lambda: 1000.0)  # type: ignore[arg-type]
+
+    assert wf.sync_code_scanning_alerts("acme/repo") == {"created": 1, "skipped_existing": 0}
+    assert ("GET", "repos/acme/repo/code-scanning/alerts") in fake.calls
+
+    # First incremental run learns the ETag, the next one is a bare 304.
+    assert wf.sync_code_scanning_alerts("acme/repo") == {"created": 0, "skipped_existing": 1}
+    fake.calls.clear()
+    assert wf.sync_code_scanning_alerts("acme/repo") == {"created": 0, "skipped_existing": 0}
+    assert fake.calls == [("CONDITIONAL", "repos/acme/repo/code-scanning/alerts")]
+
+    fake.alerts.insert(0, _alert_row(3, "2026-02-16T09:00:00Z"))
+    fake.calls.clear()
+    # Alert 2 sits exactly on the cursor, so it is re-checked and skipped.
+    assert wf.sync_code_scanning_alerts("acme/repo") == {"created": 1, "skipped_existing": 1}
+    assert ("GET", "repos/acme/repo/code-scanning/alerts") not in fake.calls
+    assert [issue["title"] for issue in fake.created_issues] == [
+        "security: rule-2",
+        "security: rule-3",
+    ]
+
+
+def test_sync_code_scanning_alerts_runs_periodic_full_reconcile() -> None:
+    now = [1000.0]
+    fake = FakeIncrementalAlertsClient([_alert_row(2, "2026-02-15T10:00:00Z")])
+    wf = Workflow(fake, clock=lambda: now[0])  # type: ignore[arg-type]
+    wf.sync_code_scanning_alerts("acme/repo")
+
+    # An alert older than the cursor (e.g. reopened without an update) is
+    # invisible incrementally but caught by the full reconcile.
+    fake.alerts.append(_alert_row(4, "2026-02-01T00:00:00Z"))
+    assert wf.sync_code_scanning_alerts("acme/repo")["created"] == 0
+
+    now[0] += ALERT_FULL_RECONCILE_SECONDS
+    fake.calls.clear()
+    assert wf.sync_code_scanning_alerts("acme/repo") == {"created": 1, "skipped_existing": 1}
+    assert ("GET", "repos/acme/repo/code-scanning/alerts") in fake.calls
+
+
+class FakeGatedClient(FakeClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.version = 1
+
+    def api_conditional(
+        self, path: str, *, fields: dict[str, Any] | None = None, etag: str | None = None
+    ) -> ConditionalResponse:
+        assert fields == {"state": "all", "sort": "updated", "direction": "desc", "per_page": 1}
+        self.calls.append(("CONDITIONAL", path, etag))
+        current = f'"v{self.version}"'
+        if etag == current:
+            return ConditionalResponse(status=304, etag=etag, payload=None)
+        return ConditionalResponse(status=200, etag=current, payload=[{"number": 10}])
+
+
+def test_change_gate_skips_unchanged_repos_with_a_single_304() -> None:
+    now = [1000.0]
+    fake = FakeGatedClient()
+    wf = Workflow(fake, change_gate=True, clock=lambda: now[0])  # type: ignore[arg-type]
+    repo = RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"])
+
+    first = wf.run_tick(repo)
+    assert first["action"] == "moved-to-needs-clarification"
+
+    fake.calls.clear()
+    second = wf.run_tick(repo)
+    assert fake.calls == [("CONDITIONAL", "repos/acme/repo/issues", '"v1"')]
+    assert second["action"] == "unchanged"
+    assert second["last_action"] == "moved-to-needs-clarification"
+    assert second["issue"] == 10
+    assert second["security_created"] == 0
+
+    fake.version = 2
+    fake.calls.clear()
+    assert wf.run_tick(repo)["action"] == "moved-to-needs-clarification"
+    assert len(fake.calls) > 1
+
+    # Changed owners or a due full tick bypass the gate.
+    other = RepoConfig(name="acme/repo", owner_logins=["someone-else"])
+    assert wf.run_tick(other)["action"] != "unchanged"
+    assert wf.run_tick(other)["action"] == "unchanged"
+    now[0] += CHANGE_GATE_FULL_TICK_SECONDS
+    fake.calls.clear()
+    assert wf.run_tick(other)["action"] == "moved-to-needs-clarification"
+    assert fake.calls[0] == ("CONDITIONAL", "repos/acme/repo/issues", None)
+
+
+class FakeInProgressClient(FakeClient):
+    def api(
+        self, method: str, path: str, *, fields: dict[str, Any] | None = None
+    ) -> Any:
+        result = super().api(method, path, fields=fields)
+        if path.endswith("/issues") and (fields or {}).get("state") == "open":
+            return [{**row, "labels": [{"name": "stage:in-progress"}]} for row in result]
+        return result
+
+
+class SlowGhClient(GhClient):
+    """Real client (memo, single-flight) over a fake with slow GETs."""
+
+    api_iter = None
+
+    def __init__(self, fake: FakeClient | None = None) -> None:
+        super().__init__()
+        self.fake = fake if fake is not None else FakeInProgressClient()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def _run_json(self, args: list[str], *, stdin_json: dict[str, Any] | None = None) -> Any:
+        method, path = args[3], args[4]
+        if stdin_json is not None:
+            return getattr(self.fake, f"api_{method.lower()}_json")(path, stdin_json)
+        fields = dict(arg.split("=", 1) for arg in args[6::2]) or None
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if method == "GET":
+                time.sleep(0.1)
+            return self.fake.api(method, path, fields=fields)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_run_tick_overlaps_independent_reads_without_changing_writes() -> None:
+    repo = RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"])
+    sequential = FakeInProgressClient()
+    expected = Workflow(sequential).run_tick(repo)  # type: ignore[arg-type]
+
+    client = SlowGhClient()
+    started = time.monotonic()
+    result = Workflow(client).run_tick(repo)
+
+    assert result == expected
+    assert result["action"] == "continue-in-progress"
+    assert client.peak >= 5  # labels, open, closed, closed security, alerts
+    assert time.monotonic() - started < 0.35  # sequential reads take >= 0.5s
+
+    def normalized(calls: list[Any], method: str) -> list[str]:
+        return [
+            repr((call[1], {k: str(v) for k, v in (call[2] or {}).items()}))
+            for call in calls
+            if (call[0] == "GET") == (method == "GET")
+        ]
+
+    assert normalized(client.fake.calls, "write") == normalized(sequential.calls, "write")
+    assert sorted(normalized(client.fake.calls, "GET")) == sorted(
+        normalized(sequential.calls, "GET")
+    )
+
+
+def test_prefetched_tick_reads_survive_the_pick_write() -> None:
+    repo = RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"])
+    sequential = FakeClient()
+    expected = Workflow(sequential).run_tick(repo)  # type: ignore[arg-type]
+
+    client = SlowGhClient(FakeClient())
+    result = Workflow(client).run_tick(repo)
+
+    assert result == expected
+    patches = [call for call in client.fake.calls if call[0] == "PATCH"]
+    assert [call[1] for call in patches] == ["repos/acme/repo/issues/10"]
+    # The pick's label PATCH does not touch the closed listings, so the
+    # cleanup phases reuse the prefetched reads: no GET beyond sequential's.
+    gets = [call for call in client.fake.calls if call[0] == "GET"]
+    assert len(gets) == len([call for call in sequential.calls if call[0] == "GET"])
+
+
+def test_prefetched_listings_are_memoized_projected() -> None:
+    class VerboseClient(FakeClient):
+        def api(
+            self, method: str, path: str, *, fields: dict[str, Any] | None = None
+        ) -> Any:
+            result = super().api(method, path, fields=fields)
+            if path.endswith("/issues") and isinstance(result, list):
+                return [{**row, "title": "x" * 1000, "user": {"login": "a"}} for row in result]
+            return result
+
+    repo = RepoConfig(name="acme/repo", owner_logins=["simonvanlaak"])
+    client = SlowGhClient(VerboseClient())
+    workflow = Workflow(client)
+    seen: list[Any] = []
+    original = client._remember
+
+    def remember(key: Any, result: Any) -> None:
+        seen.append((key, result))
+        original(key, result)
+
+    client._remember = remember  # type: ignore[method-assign]
+    workflow.run_tick(repo)
+
+    open_rows = [
+        result
+        for key, result in seen
+        if key[0] == "repos/acme/repo/issues" and ("state", "open") in key[1]
+    ]
+    assert open_rows == [
+        [
+            {
+                "number": 10,
+                "created_at": "2026-02-10T00:00:00Z",
+                "labels": [{"name": "stage:queued"}],
+            }
+        ]
+    ]